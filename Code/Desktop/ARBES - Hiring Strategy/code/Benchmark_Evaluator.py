@@ -0,0 +1,274 @@
+# Copyright (c) 2024 Antonio Quinonez
+# Licensed under the MIT License. See LICENSE in the project root for license information.
+
+# ================================================================================
+# Throughput benchmark for DocumentEvaluator against a local mock LLM endpoint.
+#
+# Starts MockLLMServer in a separate process (so its CPU time is not counted),
+# points the Azure OpenAI client at it, evaluates synthetic resumes and reports
+# documents per minute, calls per document, call and document latency
+# percentiles and CPU time. Results can be appended to a JSONL file to compare
+# runs with different concurrency and batching settings.
+#
+# Example:
+#   python Benchmark_Evaluator.py --documents 20 --workers 4 --latency-median 1.0 --error-rate 0.05
+# ================================================================================
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List
+
+from libs.MockLLMServer import MockLLMServer
+
+RULES_PATH = "candidate_evaluation_rules.json"
+STEPS_PATH = "evaluation_steps.json"
+
+FIRST_NAMES = ["Jane", "John", "Maria", "Wei", "Aisha", "Carlos", "Priya", "Tom", "Olga", "Kenji"]
+LAST_NAMES = ["Doe", "Smith", "Garcia", "Chen", "Khan", "Silva", "Patel", "Brown", "Ivanova", "Sato"]
+SKILLS = ["Python", "SQL", "AWS", "Azure", "Kubernetes", "Docker", "Spark", "React", "Java", "Terraform",
+          "Machine Learning", "Airflow", "Tableau", "Go", "PostgreSQL", "Kafka", "Scrum", "Project Management"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Analytics", "Stark Industries", "Wayne Consulting",
+             "Hooli", "Vandelay Imports", "Soylent Data", "Cyberdyne Systems"]
+TITLES = ["Software Engineer", "Data Engineer", "Data Scientist", "Project Manager", "Cloud Architect",
+          "Analytics Consultant", "DevOps Engineer", "Engineering Manager"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "University of Toronto"]
+
+
+def synthetic_resume(index: int, rng: random.Random) -> str:
+    """Plain text resume with a random but plausible mix of jobs, skills and education"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}{index}@example.com | linkedin.com/in/candidate{index} | github.com/candidate{index}",
+        f"{rng.choice(['Austin, TX', 'Chicago, IL', 'Toronto, ON', 'New York, NY', 'Denver, CO'])}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 20)} years of experience delivering data and software projects.",
+        "",
+        "EXPERIENCE"
+    ]
+
+    year = 2024
+    for _ in range(rng.randint(2, 5)):
+        years = rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({year - years} - {year})")
+        for _ in range(rng.randint(2, 4)):
+            lines.append(f"- Built {rng.choice(['pipelines', 'services', 'dashboards', 'platforms'])} using "
+                         f"{', '.join(rng.sample(SKILLS, 3))}; improved throughput by {rng.randint(10, 80)}%.")
+        year -= years
+
+    lines += [
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, rng.randint(6, 12))),
+        "",
+        "EDUCATION",
+        f"{rng.choice(['B.S.', 'M.S.', 'B.A.', 'Ph.D.'])} {rng.choice(['Computer Science', 'Statistics', 'Economics', 'Physics'])}, "
+        f"{rng.choice(SCHOOLS)} ({year - 4})"
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _serve(server_config: Dict[str, Any], port_queue: multiprocessing.Queue) -> None:
+    """Run the mock server in a child process and report its port"""
+    server = MockLLMServer(**server_config)
+    server.start()
+    port_queue.put(server.port)
+    threading.Event().wait()
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _read_metrics(metrics_path: Path) -> Dict[str, List[float]]:
+    """Call and document latencies from the evaluator's telemetry JSONL"""
+    call_latencies = []
+    document_started: Dict[str, float] = {}
+    document_latencies = []
+
+    with open(metrics_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry['event'] == 'call':
+                call_latencies.append(entry['latency'])
+                started = entry['timestamp'] - entry['latency'] - entry['rate_limit_wait']
+                document_started[entry['document']] = min(started, document_started.get(entry['document'], started))
+            elif entry['event'] == 'document' and entry['document'] in document_started:
+                document_latencies.append(entry['timestamp'] - document_started[entry['document']])
+
+    return {'call_latencies': call_latencies, 'document_latencies': document_latencies}
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one benchmark and return its configuration and results"""
+    server_config = {
+        'evaluation_rules_path': RULES_PATH,
+        'latency_median': args.latency_median,
+        'latency_sigma': args.latency_sigma,
+        'seconds_per_output_token': args.seconds_per_output_token,
+        'rate_limit_error_rate': args.error_rate,
+        'retry_after': args.retry_after,
+        'seed': args.seed
+    }
+
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=_serve, args=(server_config, port_queue), daemon=True)
+    server_process.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=30)}"
+
+    # Point the Azure OpenAI clients at the mock server
+    os.environ['AZUREOPENAI_BASE'] = base_url
+    os.environ['AZUREOPENAI_TOKEN'] = 'mock-key'
+    os.environ.setdefault('AZURE_API_VERSION', '2024-08-01-preview')
+
+    work_dir = Path(tempfile.mkdtemp(prefix='arbes_benchmark_'))
+    try:
+        document_dir = work_dir / 'documents'
+        document_dir.mkdir()
+        rng = random.Random(args.seed)
+        for index in range(args.documents):
+            (document_dir / f"resume_{index:04d}.txt").write_text(synthetic_resume(index, rng), encoding='utf-8')
+
+        metrics_path = work_dir / 'llm_calls.jsonl'
+        evaluator_config = dict(
+            evaluation_rules_path=RULES_PATH,
+            evaluation_steps_path=STEPS_PATH,
+            output_dir=str(work_dir / 'results'),
+            rate_limits={'default': {'requests_per_minute': args.requests_per_minute,
+                                     'tokens_per_minute': args.tokens_per_minute}},
+            stream_responses=args.stream,
+            rulebook_in_prefix=args.rulebook_in_prefix,
+            metrics_path=str(metrics_path)
+        )
+        if args.rule_workers:
+            evaluator_config['max_rule_workers'] = args.rule_workers
+        if args.individual_workers:
+            evaluator_config['max_individual_workers'] = args.individual_workers
+
+        if args.use_async:
+            from libs.AsyncDocumentEvaluator import AsyncDocumentEvaluator
+            evaluator = AsyncDocumentEvaluator(max_concurrent_documents=args.workers,
+                                               max_concurrent_requests=args.max_concurrent_requests,
+                                               **evaluator_config)
+        else:
+            from libs.DocumentEvaluator import DocumentEvaluator
+            evaluator = DocumentEvaluator(max_workers=args.workers, **evaluator_config)
+
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        results = evaluator.evaluate_directory(str(document_dir))
+
+        wall_time = time.perf_counter() - wall_started
+        cpu_time = time.process_time() - cpu_started
+        evaluator.telemetry.close()
+
+        with urllib.request.urlopen(f"{base_url}/stats", timeout=10) as response:
+            server_stats = json.load(response)
+
+        latencies = _read_metrics(metrics_path)
+        totals = evaluator.telemetry.run_totals
+        documents = len(results)
+
+        return {
+            'timestamp': time.time(),
+            'config': {key: value for key, value in vars(args).items() if key != 'results_file'},
+            'documents': documents,
+            'wall_time': round(wall_time, 3),
+            'documents_per_minute': round(documents / wall_time * 60, 2) if wall_time else 0.0,
+            'calls_per_document': round(totals['calls'] / documents, 2) if documents else 0.0,
+            'failed_calls': totals['failures'],
+            'retries': totals['retries'],
+            'call_latency_p50': round(_percentile(latencies['call_latencies'], 50), 3),
+            'call_latency_p95': round(_percentile(latencies['call_latencies'], 95), 3),
+            'document_latency_p50': round(_percentile(latencies['document_latencies'], 50), 3),
+            'document_latency_p95': round(_percentile(latencies['document_latencies'], 95), 3),
+            'cpu_time': round(cpu_time, 3),
+            'cpu_time_per_document': round(cpu_time / documents, 3) if documents else 0.0,
+            'server': server_stats
+        }
+
+    finally:
+        server_process.terminate()
+        server_process.join(timeout=10)
+        if not args.keep_files:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        else:
+            print(f"Benchmark files kept in {work_dir}")
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    server = report['server']
+    cached = server['cached_prompt_tokens'] / server['prompt_tokens'] if server['prompt_tokens'] else 0.0
+    rows = [
+        ("Documents evaluated", report['documents']),
+        ("Wall time (s)", report['wall_time']),
+        ("Documents per minute", report['documents_per_minute']),
+        ("Calls per document", report['calls_per_document']),
+        ("Failed calls / retries", f"{report['failed_calls']} / {report['retries']}"),
+        ("Call latency p50 / p95 (s)", f"{report['call_latency_p50']} / {report['call_latency_p95']}"),
+        ("Document latency p50 / p95 (s)", f"{report['document_latency_p50']} / {report['document_latency_p95']}"),
+        ("CPU time (s)", report['cpu_time']),
+        ("CPU time per document (s)", report['cpu_time_per_document']),
+        ("Server requests / 429s injected", f"{server['requests']} / {server['rate_limited']}"),
+        ("Prompt tokens cached", f"{cached:.1%}")
+    ]
+    print("=" * 60)
+    for label, value in rows:
+        print(f"{label:<35} {value}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DocumentEvaluator throughput against a mock LLM server")
+    parser.add_argument('--documents', type=int, default=10, help="Synthetic resumes to evaluate")
+    parser.add_argument('--workers', type=int, default=4, help="Documents evaluated concurrently")
+    parser.add_argument('--rule-workers', type=int, help="Rules/batches evaluated concurrently per document "
+                                                         "(default: the evaluator's own)")
+    parser.add_argument('--individual-workers', type=int, help="Individually evaluated rules run concurrently per "
+                                                               "document (default: the evaluator's own)")
+    parser.add_argument('--async', dest='use_async', action='store_true', help="Use AsyncDocumentEvaluator")
+    parser.add_argument('--max-concurrent-requests', type=int, default=100, help="Request limit for --async")
+    parser.add_argument('--stream', action='store_true', help="Stream batch responses")
+    parser.add_argument('--rulebook-in-prefix', action='store_true', help="Put rule definitions in the system prompt")
+    parser.add_argument('--latency-median', type=float, default=1.0, help="Median mock response latency (s)")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="Log-normal sigma of mock latency")
+    parser.add_argument('--seconds-per-output-token', type=float, default=0.0, help="Mock generation time per output token")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="Retry-After of injected 429s (s)")
+    parser.add_argument('--requests-per-minute', type=int, default=100000, help="Evaluator rate limit per model")
+    parser.add_argument('--tokens-per-minute', type=int, default=100000000, help="Evaluator token limit per model")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for resumes, latencies and errors")
+    parser.add_argument('--results-file', help="Append the results as a JSON line to this file")
+    parser.add_argument('--keep-files', action='store_true', help="Keep the generated documents and outputs")
+    parser.add_argument('--verbose', action='store_true', help="Log evaluator progress")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    report = run_benchmark(args)
+    print_report(report)
+
+    if args.results_file:
+        with open(args.results_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report) + '\n')
+
+
+if __name__ == "__main__":
+    main()
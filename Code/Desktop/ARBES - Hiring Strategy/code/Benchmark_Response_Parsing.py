@@ -0,0 +1,88 @@
+# Copyright (c) 2024 Antonio Quinonez
+# Licensed under the MIT License. See LICENSE in the project root for license information.
+
+# ================================================================================
+# Microbenchmark for evaluation response parsing.
+#
+# Compares the previous approach (clean the whole response text, regex for the
+# fenced JSON, parse, then clean the parsed values) with the single-pass
+# ResponseJSONExtractor + OutputTextCleaner.clean_json_strings approach on
+# synthetic responses of increasing size, and checks both give the same result.
+#
+# Example:
+#   python Benchmark_Response_Parsing.py --repeat 200
+# ================================================================================
+
+import argparse
+import json
+import random
+import re
+import timeit
+from typing import Any, Dict
+
+from libs.OutputTextCleaner import OutputTextCleaner
+from libs.ResponseJSONExtractor import ResponseJSONExtractor
+from libs.SafeJSONEncoder import safe_json_loads
+
+SKILLS = ["Python", "SQL", "AWS", "Azure", "Kubernetes", "Docker", "Spark", "React", "Java", "Terraform"]
+SOURCES = ["Skills section", "Work Experience – Acme Corp", "Project “Atlas” description", "Summary"]
+
+
+def synthetic_response(skill_count: int, seed: int = 42) -> str:
+    """Fenced JSON response with a skills_df list of `skill_count` entries and a few scalar rules"""
+    rng = random.Random(seed)
+    skills = [
+        {
+            "skill": f"{rng.choice(SKILLS)} {index}",
+            "technologies": rng.sample(SKILLS, 3),
+            "score": rng.randint(1, 10),
+            "eval": f"Used  extensively in {rng.randint(2, 9)} projects — see resume.",
+            "source_detail": rng.sample(SOURCES, 2)
+        }
+        for index in range(skill_count)
+    ]
+    results = {
+        "skills_df": {"type": "Technical", "sub_type": "Skill", "value": skills,
+                      "eval": "Skills listed  in the resume", "source": ["resume"]},
+        "has_python": {"type": "Technical", "value": True, "eval": "Python is listed.", "source": ["resume"]},
+        "years_experience": {"type": "Experience", "value": 12, "eval": "Career spans 2012 – 2024."}
+    }
+    return "Here is the evaluation:\n```json\n" + json.dumps(results, indent=2, ensure_ascii=False) + "\n```\n"
+
+
+def parse_previous(response: str) -> Dict[str, Any]:
+    """The previous parsing path"""
+    cleaned_text = OutputTextCleaner.clean_text(response)
+    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', cleaned_text, re.DOTALL)
+    if json_match:
+        json_text = json_match.group(1)
+    else:
+        json_text = cleaned_text[cleaned_text.find('{'):cleaned_text.rfind('}') + 1]
+    return OutputTextCleaner.clean_dict_values(safe_json_loads(json_text))
+
+
+def parse_single_pass(response: str) -> Dict[str, Any]:
+    """The single-pass parsing path"""
+    return OutputTextCleaner.clean_json_strings(ResponseJSONExtractor.extract_object(response))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark evaluation response parsing")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5, 50, 500], help="skills_df entries per response")
+    parser.add_argument('--repeat', type=int, default=100, help="Parses timed per size and approach")
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'chars':>9} {'previous ms':>12} {'single-pass ms':>15} {'speedup':>8} {'same result':>12}")
+    for size in args.sizes:
+        response = synthetic_response(size)
+        same = parse_previous(response) == parse_single_pass(response)
+
+        previous = min(timeit.repeat(lambda: parse_previous(response), number=args.repeat, repeat=3)) / args.repeat
+        single_pass = min(timeit.repeat(lambda: parse_single_pass(response), number=args.repeat, repeat=3)) / args.repeat
+
+        print(f"{size:>8} {len(response):>9} {previous * 1000:>12.3f} {single_pass * 1000:>15.3f} "
+              f"{previous / single_pass:>7.1f}x {str(same):>12}")
+
+
+if __name__ == "__main__":
+    main()
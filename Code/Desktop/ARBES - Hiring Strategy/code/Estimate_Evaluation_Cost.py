@@ -0,0 +1,84 @@
+# Copyright (c) 2024 Antonio Quinonez
+# Licensed under the MIT License. See LICENSE in the project root for license information.
+
+# ================================================================================
+# Dry run of an evaluation: projects calls, tokens, cost per model and wall time
+# for a directory of documents without contacting any provider.
+#
+# The rulebook is planned exactly as evaluate_directory would plan it (batch
+# packing, saved results in the cache/checkpoint, duplicates), with the same
+# rate limits, so the estimate reflects the configured run.
+#
+# Example:
+#   python Estimate_Evaluation_Cost.py documents_to_evaluate/resumes --workers 4
+#   python Estimate_Evaluation_Cost.py documents_to_evaluate/resumes --pricing pricing.json --json
+# ================================================================================
+
+import argparse
+import json
+import logging
+
+from libs.DocumentEvaluator import DocumentEvaluator
+from libs.EvaluationCostEstimator import EvaluationCostEstimator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate the cost and duration of evaluating a directory")
+    parser.add_argument('document_dir', help="Directory of documents to evaluate")
+    parser.add_argument('--rules', default="candidate_evaluation_rules.json", help="Evaluation rules JSON")
+    parser.add_argument('--steps', default="evaluation_steps.json", help="Evaluation steps JSON")
+    parser.add_argument('--workers', type=int, default=4, help="Documents evaluated concurrently")
+    parser.add_argument('--rule-workers', type=int, default=4, help="Rules/batches evaluated concurrently per document")
+    parser.add_argument('--concurrency', type=int, help="Calls in flight at once (default: workers x rule workers)")
+    parser.add_argument('--rate-limits', help="JSON file of rate limits by model, as passed to DocumentEvaluator")
+    parser.add_argument('--pricing', help="JSON file of USD per million tokens by model: "
+                                          "{\"gpt-4o\": {\"input\": 2.5, \"cached_input\": 1.25, \"output\": 10}}")
+    parser.add_argument('--rulebook-in-prefix', action='store_true', help="Put rule definitions in the system prompt")
+    parser.add_argument('--cache-path', default="evaluation_cache/rule_results.sqlite",
+                        help="Rule result cache; rules with saved results are not counted")
+    parser.add_argument('--batch-hints-path', default="evaluation_cache/batch_size_hints.json",
+                        help="Observed rule output sizes")
+    parser.add_argument('--checkpoint-path', help="Checkpoint journal; documents already exported are not counted")
+    parser.add_argument('--text-cache-path', default="evaluation_cache/document_texts.sqlite",
+                        help="Extracted document text cache")
+    parser.add_argument('--dedupe-threshold', type=float, help="Leave out duplicate documents, as evaluation would")
+    parser.add_argument('--json', action='store_true', help="Print the estimate as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    rate_limits = None
+    if args.rate_limits:
+        with open(args.rate_limits, 'r', encoding='utf-8') as f:
+            rate_limits = json.load(f)
+
+    pricing = None
+    if args.pricing:
+        with open(args.pricing, 'r', encoding='utf-8') as f:
+            pricing = json.load(f)
+
+    evaluator = DocumentEvaluator(
+        evaluation_rules_path=args.rules,
+        evaluation_steps_path=args.steps,
+        output_dir="evaluation_results",
+        max_workers=args.workers,
+        max_rule_workers=args.rule_workers,
+        rate_limits=rate_limits,
+        cache_path=args.cache_path,
+        batch_hints_path=args.batch_hints_path,
+        checkpoint_path=args.checkpoint_path,
+        rulebook_in_prefix=args.rulebook_in_prefix,
+        text_cache_path=args.text_cache_path,
+        dedupe_threshold=args.dedupe_threshold
+    )
+
+    estimate = evaluator.estimate_directory(args.document_dir, pricing=pricing, concurrency=args.concurrency)
+
+    if args.json:
+        print(json.dumps(estimate, indent=2))
+    else:
+        print(EvaluationCostEstimator.format_report(estimate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Copyright (c) 2024 Antonio Quinonez
+# Licensed under the MIT License. See LICENSE in the project root for license information.
+
+from libs.AsyncDocumentEvaluator import AsyncDocumentEvaluator
+import asyncio
+import os
+
+# ================================================================================
+# SETUP LOGGING
+# ================================================================================
+from libs.ARBES_Logging import initialize_logging
+
+# --------------------------------------------------------------------------------
+script_name = os.path.basename(__file__)
+script_name_no_ext = os.path.splitext(script_name)[0]
+
+# Text extraction runs in worker processes, which re-import this script on
+# platforms that spawn them, so the run only starts from the main process
+if __name__ == "__main__":
+    # Initialize logging for the entire application
+    logger = initialize_logging(
+        log_file=f"logs/{script_name_no_ext}.log",
+        max_files=20
+    )
+
+    logger.info("Starting application...")
+    # ================================================================================
+    # Initialize evaluator
+    # ================================================================================
+
+    evaluator = AsyncDocumentEvaluator(
+        evaluation_rules_path="candidate_evaluation_rules.json",
+        evaluation_steps_path="evaluation_steps.json",
+        output_dir="evaluation_results",
+        max_concurrent_documents=20,
+        max_concurrent_requests=100,
+        cache_path="evaluation_cache/rule_results.sqlite",
+        batch_hints_path="evaluation_cache/batch_size_hints.json",
+        checkpoint_path="evaluation_cache/checkpoint.jsonl",
+        stream_responses=True,
+        metrics_path=f"logs/{script_name_no_ext}_llm_calls.jsonl",
+        text_cache_path="evaluation_cache/document_texts.sqlite",
+        source_text_store_path="evaluation_cache/source_texts",
+        extract_workers=2,
+        # Duplicate detection is opt-in: only the newest file of each group is evaluated and
+        # the rest are moved to processed/, so two candidates' resumes built from the same
+        # template could be merged. 1.0 skips exact copies only; a lower similarity such as
+        # 0.9 also skips near duplicates. Each run lists what it skipped in
+        # evaluation_results/duplicate_report_*.json
+        dedupe_threshold=None
+    )
+
+    async def evaluate_all() -> int:
+        # Results are exported as they complete; none are kept here
+        processed = 0
+        async for _ in evaluator.iter_evaluate_directory_async("documents_to_evaluate/resumes"):
+            processed += 1
+        return processed
+
+    processed = asyncio.run(evaluate_all())
+
+    # Log summary
+    logger.info(f"Processed {processed} documents")
@@ -0,0 +1,120 @@
+# Copyright (c) 2024 Antonio Quinonez
+# Licensed under the MIT License. See LICENSE in the project root for license information.
+
+# ================================================================================
+# Long-running evaluation daemon.
+#
+# Watches the folders under documents_to_evaluate/ and evaluates new documents
+# as they arrive, with evaluators that stay loaded between documents. Jobs are
+# kept in an SQLite queue, so a restart picks up where the daemon left off;
+# documents that keep failing are dead-lettered instead of retried forever.
+#
+# Example:
+#   python Evaluate_Candidates_Daemon.py --concurrency 4
+#   python Evaluate_Candidates_Daemon.py --list-dead
+#   python Evaluate_Candidates_Daemon.py --retry-dead        # all dead letters
+#   python Evaluate_Candidates_Daemon.py --retry-dead 42     # one job
+# ================================================================================
+
+import argparse
+import os
+import signal
+from pathlib import Path
+
+from libs.DocumentEvaluator import DocumentEvaluator
+from libs.EvaluationDaemon import EvaluationDaemon
+from libs.EvaluationJobQueue import EvaluationJobQueue
+
+# ================================================================================
+# SETUP LOGGING
+# ================================================================================
+from libs.ARBES_Logging import initialize_logging
+
+# --------------------------------------------------------------------------------
+script_name = os.path.basename(__file__)
+script_name_no_ext = os.path.splitext(script_name)[0]
+
+# Rules evaluated for each watched folder
+WATCHED_FOLDERS = {
+    "documents_to_evaluate/resumes": "candidate_evaluation_rules.json",
+    "documents_to_evaluate/code": "code_evaluation_rules.json"
+}
+
+QUEUE_PATH = "evaluation_cache/job_queue.sqlite"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch documents_to_evaluate/ and evaluate new documents")
+    parser.add_argument('--concurrency', type=int, default=4, help="Documents evaluated at once")
+    parser.add_argument('--poll-seconds', type=float, default=10, help="Seconds between folder scans")
+    parser.add_argument('--settle-seconds', type=float, default=5,
+                        help="Seconds a file must go unmodified before it is queued")
+    parser.add_argument('--max-attempts', type=int, default=3, help="Failed attempts before a document is dead-lettered")
+    parser.add_argument('--retry-seconds', type=float, default=60, help="Delay before the first retry of a failure")
+    parser.add_argument('--list-dead', action='store_true', help="List dead-lettered documents and exit")
+    parser.add_argument('--retry-dead', nargs='?', type=int, const=-1, metavar='JOB_ID',
+                        help="Queue dead-lettered documents again (all, or one job) and exit")
+    args = parser.parse_args()
+
+    logger = initialize_logging(
+        log_file=f"logs/{script_name_no_ext}.log",
+        max_files=20
+    )
+
+    queue = EvaluationJobQueue(QUEUE_PATH, max_attempts=args.max_attempts, retry_seconds=args.retry_seconds)
+
+    if args.list_dead:
+        for job in queue.dead_letters():
+            print(f"{job['id']:>6}  {job['updated_at']}  attempts={job['attempts']}  {job['file_path']}\n"
+                  f"        {job['last_error']}")
+        return
+
+    if args.retry_dead is not None:
+        requeued = queue.retry_dead(None if args.retry_dead < 0 else args.retry_dead)
+        print(f"Requeued {requeued} dead-lettered job(s)")
+        return
+
+    logger.info("Starting evaluation daemon...")
+    # ================================================================================
+    # Initialize evaluators, one per watched folder, loaded once for the daemon's lifetime
+    # ================================================================================
+
+    evaluators = {}
+    for folder, rules_path in WATCHED_FOLDERS.items():
+        if not Path(rules_path).exists():
+            logger.warning(f"Not watching {folder}: {rules_path} not found")
+            continue
+
+        Path(folder).mkdir(parents=True, exist_ok=True)
+        # The checkpoint journal, size hints and call metrics are each written by a
+        # single evaluator, so every folder gets its own files; the SQLite caches
+        # and the source text store are safe to share
+        folder_name = Path(folder).name
+        evaluators[folder] = DocumentEvaluator(
+            evaluation_rules_path=rules_path,
+            evaluation_steps_path="evaluation_steps.json",
+            output_dir="evaluation_results",
+            cache_path="evaluation_cache/rule_results.sqlite",
+            batch_hints_path=f"evaluation_cache/{folder_name}_batch_size_hints.json",
+            checkpoint_path=f"evaluation_cache/{folder_name}_checkpoint.jsonl",
+            stream_responses=True,
+            metrics_path=f"logs/{script_name_no_ext}_{folder_name}_llm_calls.jsonl",
+            text_cache_path="evaluation_cache/document_texts.sqlite",
+            source_text_store_path="evaluation_cache/source_texts"
+        )
+
+    daemon = EvaluationDaemon(evaluators, queue, concurrency=args.concurrency,
+                              poll_seconds=args.poll_seconds, settle_seconds=args.settle_seconds)
+
+    # Finish the documents in progress on Ctrl+C or a service stop
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+
+    daemon.run()
+    queue.close()
+
+
+# Text extraction may run in worker processes, which re-import this script on
+# platforms that spawn them, so the daemon only starts from the main process
+if __name__ == "__main__":
+    main()
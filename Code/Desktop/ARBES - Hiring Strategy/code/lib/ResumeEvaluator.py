@@ -9,7 +9,6 @@ import logging
 import shutil
 from operator import itemgetter
 from dotenv import load_dotenv
-import time
 from itertools import groupby
 import backoff
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -55,6 +54,7 @@ DEFAULT_MODEL='gpt-4o'
 # ==============================================================
 from lib.AI.FFAI_AzureOpenAI import FFAI_AzureOpenAI as AI
 from lib.AI.FFAzureOpenAI import FFAzureOpenAI
+from libs.RateLimiter import get_rate_limiter
 
 
 def _get_ai(system_instructions: str = None):
@@ -81,8 +81,16 @@ class ResumeEvaluator:
     
     SUPPORTED_EXTENSIONS: Set[str] = {'.pdf', '.doc', '.docx', '.txt'}
     BATCH_SIZE = 4
+
+    # Per model/deployment quotas; 'default' applies to models not listed
+    RATE_LIMITS: Dict[str, Dict[str, int]] = {
+        'default': {'requests_per_minute': 60, 'tokens_per_minute': 150000}
+    }
+    CHARS_PER_TOKEN = 4
+    EXPECTED_OUTPUT_TOKENS = 1000
     
-    def __init__(self, evaluation_rules_path: str, evaluation_steps_path: str, output_dir: str):
+    def __init__(self, evaluation_rules_path: str, evaluation_steps_path: str, output_dir: str,
+                 rate_limits: Optional[Dict[str, Dict[str, int]]] = None, build_index: bool = False):
         """
         Initialize the resume evaluator with evaluation rules and steps.
         
@@ -90,18 +98,36 @@ class ResumeEvaluator:
             evaluation_rules_path (str): Path to evaluation rules JSON
             evaluation_steps_path (str): Path to evaluation steps JSON
             output_dir (str): Directory for evaluation results
+            rate_limits (dict, optional): Quotas keyed by model/deployment
+            build_index (bool, optional): Build the vector index when loading instead of on first access
         """
         self.evaluation_rules = self._load_json(evaluation_rules_path)
         self.evaluation_steps = self._load_json(evaluation_steps_path)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.rate_limits = {**self.RATE_LIMITS, **(rate_limits or {})}
+        self.build_index = build_index
         
+        self.documents = None
         self.document_index = None
         self.resume_text = None
         self.current_resume_path = None
         self.stage_results = self._init_stage_results()
         self.llm = None
+        self.system_instruction_tokens = 0
         
+    @property
+    def document_index(self) -> Optional[VectorStoreIndex]:
+        """Vector index of the loaded resume, built on first access."""
+        if self._document_index is None and self.documents:
+            logger.info(f"Building vector index for {self.current_resume_path}")
+            self._document_index = VectorStoreIndex.from_documents(self.documents)
+        return self._document_index
+
+    @document_index.setter
+    def document_index(self, value: Optional[VectorStoreIndex]) -> None:
+        self._document_index = value
+
     def _load_json(self, file_path: str) -> Dict:
         """Load and parse a JSON file."""
         try:
@@ -195,17 +221,21 @@ class ResumeEvaluator:
         max_time=300
     )
     def load_resume(self, resume_path: str) -> bool:
-        """Load and index a resume document."""
+        """Load a resume document; the vector index is built lazily unless build_index is set."""
         try:
             documents = SimpleDirectoryReader(input_files=[resume_path]).load_data()
-            self.document_index = VectorStoreIndex.from_documents(documents)
+            self.documents = documents
+            self.document_index = None
             self.resume_text = "\n".join([doc.text for doc in documents])
             self.current_resume_path = resume_path
+
+            if self.build_index:
+                self.document_index = VectorStoreIndex.from_documents(documents)
             
             # Initialize LLM if needed
             self._init_llm()
             
-            logger.info(f"Successfully loaded and indexed resume from {resume_path}")
+            logger.info(f"Successfully loaded resume from {resume_path}")
             return True
             
         except Exception as e:
@@ -219,8 +249,26 @@ class ResumeEvaluator:
             
         if self.llm is None:
             system_instructions = self._get_base_instructions()
+            self.system_instruction_tokens = len(system_instructions) // self.CHARS_PER_TOKEN
             self.llm = _get_ai(system_instructions=system_instructions)
 
+    def _acquire_rate_limit(self, model: str, prompt: str) -> float:
+        """Wait until the model's shared quota can take this call."""
+        limits = self.rate_limits.get(model, self.rate_limits['default'])
+        limiter = get_rate_limiter(
+            model,
+            requests_per_minute=limits['requests_per_minute'],
+            tokens_per_minute=limits['tokens_per_minute']
+        )
+
+        tokens = (self.system_instruction_tokens
+                  + len(prompt) // self.CHARS_PER_TOKEN
+                  + self.EXPECTED_OUTPUT_TOKENS)
+        waited = limiter.acquire(tokens)
+        if waited:
+            logger.info(f"Waited {waited:.2f}s for {model} rate limit")
+        return waited
+
     def _get_rule_stage(self, rule: Dict) -> int:
         """Helper method to consistently get stage as integer."""
         try:
@@ -275,6 +323,7 @@ class ResumeEvaluator:
                 giveup=lambda e: not isinstance(e, Exception) or not str(e).startswith('429')
             )
             def execute_batch():
+                self._acquire_rate_limit(model, combined_prompt)
                 return self.llm.generate_response(
                     prompt=combined_prompt,
                     model=model
@@ -322,9 +371,6 @@ class ResumeEvaluator:
                         rule,
                         "No result in batch response"
                     )
-            
-            # Add sleep between batches to avoid rate limits        
-            time.sleep(5)
                 
             return results
         
@@ -400,6 +446,7 @@ class ResumeEvaluator:
             prompt = self._prepare_single_rule_prompt(rule_name, rule)
             
         try:
+            self._acquire_rate_limit(model, prompt)
             response = self.llm.generate_response(prompt, model=model)
             results = self._process_evaluation_response(response)
             
@@ -545,9 +592,6 @@ class ResumeEvaluator:
                                 model
                             )
                         )
-                        
-                        # Add delay between submitting batches
-                        time.sleep(2)
                     
                     # Wait for all batch evaluations in this stage to complete
                     for future in as_completed(futures):
@@ -572,7 +616,6 @@ class ResumeEvaluator:
                         stage = self._get_rule_stage(rule)
                         logger.debug(f"Stage {stage} results after individual evaluation: "
                                 f"{json.dumps(self.stage_results[stage], indent=2)}")
-                        time.sleep(1)
                     except Exception as e:
                         logger.error(f"Error evaluating {rule_name}: {str(e)}", exc_info=True)
                         self._add_to_cannot_evaluate(
@@ -580,9 +623,6 @@ class ResumeEvaluator:
                             rule,
                             f"Individual evaluation failed: {str(e)}"
                         )
-                        
-                # Add delay between stages
-                time.sleep(3)
 
             logger.info("Resume evaluation completed, getting combined results")
             return self.get_combined_evaluation()
@@ -770,9 +810,6 @@ class ResumeEvaluator:
                     output_path = self.output_dir / f"{preferred_name}_evaluation.json"
                     self.export_results(str(output_path))
                     logger.debug(f"Results exported to {output_path}")
-                    
-                    # Add delay between resumes
-                    time.sleep(2)
                 else:
                     logger.error(f"Failed to load resume: {file_path}")
                     
@@ -0,0 +1,538 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import backoff
+from llama_index.core.schema import Document
+
+from libs.CircuitBreaker import is_rate_limit_error, is_service_error
+from libs.DocumentEvaluator import (AI, DocumentEvaluator, BatchEvaluationStrategy, IndividualEvaluationStrategy,
+                                   _record_rule_backoff, _is_circuit_open)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBatchEvaluationStrategy(BatchEvaluationStrategy):
+    """Batch strategy whose tasks are coroutines"""
+
+    async def _run_batch(self, batch: List[Tuple[str, Dict]], model: str, stage: int) -> Dict[str, Any]:
+        batch_results = await self.evaluator._evaluate_batch_async(batch, model, llm=self.evaluator._fork_llm())
+        self.evaluator._update_stage_results(batch_results, stage)
+        return batch_results
+
+
+class AsyncIndividualEvaluationStrategy(IndividualEvaluationStrategy):
+    """Individual strategy whose tasks are coroutines"""
+
+    async def _run_rule(self, rule_name: str, rule: Dict, llm: Optional[AI] = None) -> Dict[str, Any]:
+        try:
+            rule_result = await self.evaluator._evaluate_single_rule_async(rule_name, rule, llm=llm)
+            self.evaluator._update_stage_results(rule_result, self.evaluator._get_rule_stage(rule))
+            return rule_result
+        except Exception as e:
+            logger.error(f"Error evaluating {rule_name}: {str(e)}", exc_info=True)
+            self.evaluator._add_to_cannot_evaluate(
+                rule_name,
+                rule,
+                f"Individual evaluation failed: {str(e)}"
+            )
+            return {}
+
+
+class AsyncDocumentEvaluator(DocumentEvaluator):
+    """
+    asyncio version of DocumentEvaluator.
+
+    Documents, batches and rules are coroutines on one event loop instead of
+    threads, so a single process can keep many LLM requests in flight. A
+    process-wide request semaphore caps the calls in flight across all
+    documents, a document semaphore caps the documents being evaluated, and the
+    shared per-model rate limiters still apply. Loading, planning, building and
+    exporting the evaluation, and writes to the checkpoint journal, the result
+    cache and the size hints run in worker threads, so they never hold up the
+    requests in flight. Each document's client is closed once it is finished.
+    """
+
+    def __init__(self, *args, max_concurrent_requests: int = 100, max_concurrent_documents: int = 20, **kwargs):
+        """
+        Initialize the evaluator. Takes the same arguments as DocumentEvaluator, plus:
+
+        Args:
+            max_concurrent_requests: LLM requests in flight at once across all documents
+            max_concurrent_documents: Documents evaluate_directory_async works on at once
+        """
+        kwargs.setdefault('max_rule_workers', 16)
+        kwargs.setdefault('max_individual_workers', 8)
+        super().__init__(*args, **kwargs)
+
+        self.max_concurrent_requests = max(1, int(max_concurrent_requests))
+        self.max_concurrent_documents = max(1, int(max_concurrent_documents))
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_saves: List[asyncio.Future] = []
+
+        self.batch_strategy = AsyncBatchEvaluationStrategy(self)
+        self.individual_strategy = AsyncIndividualEvaluationStrategy(self)
+
+    def _get_request_semaphore(self) -> asyncio.Semaphore:
+        """Request semaphore for the running event loop, shared with workers created from this evaluator"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._semaphore_loop = loop
+        return self._request_semaphore
+
+    def _create_worker(self) -> 'AsyncDocumentEvaluator':
+        worker = super()._create_worker()
+        worker.batch_strategy = AsyncBatchEvaluationStrategy(worker)
+        worker.individual_strategy = AsyncIndividualEvaluationStrategy(worker)
+        return worker
+
+    def _reset_evaluator_state(self):
+        super()._reset_evaluator_state()
+        self._pending_saves = []
+
+    def _save_rule_result(self, document_key: Optional[str], rule_name: str, cache_key: str, stage: int,
+                          result: Any) -> None:
+        """Write a rule result in a worker thread; evaluate_document_async waits for the writes"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            super()._save_rule_result(document_key, rule_name, cache_key, stage, result)
+            return
+
+        self._pending_saves.append(asyncio.ensure_future(asyncio.to_thread(
+            super()._save_rule_result, document_key, rule_name, cache_key, stage, result
+        )))
+
+    async def _wait_for_saves(self) -> None:
+        """Wait for the rule result writes started so far"""
+        while self._pending_saves:
+            saves, self._pending_saves = self._pending_saves, []
+            for outcome in await asyncio.gather(*saves, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error saving a rule result: {str(outcome)}")
+
+    async def _close_llm_async(self) -> None:
+        """Close the connections of the document's client"""
+        aclose = getattr(self.llm, 'aclose', None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning(f"Error closing client: {str(e)}")
+
+    async def _generate_response_async(self, prompt: str, model: str, prompt_name: Any = None,
+                                       history: Optional[List[str]] = None,
+                                       dependencies: Optional[List[str]] = None,
+                                       clear_conversation: bool = False,
+                                       llm: Optional[AI] = None,
+                                       stream_callback: Optional[Callable[[str], None]] = None,
+                                       prompt_names: Optional[List[str]] = None) -> str:
+        """
+        Send one prompt while holding a request slot and the model's rate limit.
+
+        Args:
+            prompt: Prompt to send
+            model: Model to use
+            prompt_name: Name the interaction is recorded under
+            history: Prompt names whose results are added as history
+            dependencies: Data dependencies of the prompt
+            clear_conversation: Clear the conversation before sending
+            llm: Conversation to use; defaults to the evaluator's
+            stream_callback: Receives the response text as it streams in
+            prompt_names: Rule names the prompt covers, for telemetry; defaults to [prompt_name]
+
+        Returns:
+            Raw response text
+        """
+        llm = llm or self.llm
+
+        # Wait for an open circuit before taking a request slot, so calls to
+        # other models are not held up behind it
+        breaker = self._get_circuit_breaker(model)
+        is_probe = await breaker.acquire_async()
+
+        try:
+            async with self._get_request_semaphore():
+                waited = await self._get_rate_limiter(model).acquire_async(self._estimate_call_tokens(prompt))
+                if waited:
+                    logger.info(f"Waited {waited:.2f}s for {model} rate limit")
+
+                # Clear right before sending: the client takes its messages from the
+                # conversation before its first await, so no other call can slip in
+                if clear_conversation:
+                    llm.clear_conversation()
+
+                started = time.monotonic()
+                error = None
+                try:
+                    response = await llm.generate_response_async(
+                        prompt=prompt,
+                        model=model,
+                        prompt_name=prompt_name,
+                        history=history,
+                        dependencies=dependencies,
+                        stream_callback=stream_callback
+                    )
+                except Exception as e:
+                    error = str(e)
+                    raise
+                finally:
+                    self._record_call(llm, model, prompt_names or [prompt_name], time.monotonic() - started,
+                                      waited, error)
+        except Exception as e:
+            if is_service_error(e):
+                breaker.record_failure(is_probe)
+            else:
+                # The service answered; a response that cannot be used says nothing about its health
+                breaker.release(is_probe)
+            raise
+        except BaseException:
+            # Cancelled while waiting or in flight; frees the probe slot if it was one
+            breaker.release(is_probe)
+            raise
+
+        breaker.record_success(is_probe)
+        return response
+
+    async def _evaluate_batch_async(self, batch: List[Tuple[str, Dict]], model: str,
+                                    llm: Optional[AI] = None, bisected: bool = False) -> Dict[str, Any]:
+        """Evaluate a batch of rules together, on `llm` if given, otherwise the evaluator's conversation (see _evaluate_batch)"""
+        logger.info(f"Evaluating batch with {len(batch)} rules")
+        llm = llm or self.llm
+        streamed = {}
+        rule_names = [rule_name for rule_name, _ in batch]
+
+        try:
+            combined_prompt, history_items = self._prepare_batch_prompt(batch)
+
+            @backoff.on_exception(
+                backoff.expo,
+                Exception,
+                max_tries=3,
+                max_time=300,
+                giveup=lambda e: not is_rate_limit_error(e),
+                on_backoff=lambda details: self._record_backoff(model, rule_names, details)
+            )
+            async def execute_batch():
+                response = await self._generate_response_async(
+                    combined_prompt,
+                    model,
+                    prompt_name=tuple(batch),
+                    history=history_items,
+                    dependencies=self._get_all_data_dependencies(),
+                    clear_conversation=True,
+                    llm=llm,
+                    stream_callback=self._stream_batch_results(batch, model, llm, streamed),
+                    prompt_names=rule_names
+                )
+
+                if not response or response.isspace():
+                    logger.error("Received empty response from LLM")
+                    raise ValueError("Empty response received from LLM")
+
+                return response
+
+            response = None
+            blame = False
+            try:
+                response = await execute_batch()
+                results = self._process_evaluation_response(response)
+
+            except ValueError as ve:
+                # Empty or unparseable (e.g. cut off) response
+                logger.error(f"Batch execution failed: {str(ve)}")
+                self._salvage_response_text(batch, response, streamed)
+                failure, reason = ve, f"Failed to get valid response: {str(ve)}"
+                # The answer broke the batch, so a rule bisection isolated is to blame
+                blame = bisected
+
+            else:
+                missing = self._record_batch_results(batch, results)
+                if not missing:
+                    return results
+
+                # Ask again for just the attributes the response left out
+                return {**results,
+                        **await self._recover_failed_batch_async(missing, {}, model, llm, "No result in batch response",
+                                                                 blame=bisected)}
+
+        except Exception as e:
+            # Provider errors (timeouts, 5xx, an open circuit) are not the rules' fault
+            logger.error(f"Error evaluating batch: {str(e)}", exc_info=True)
+            failure, reason, blame = e, f"Batch evaluation failed: {str(e)}", False
+
+        return await self._recover_failed_batch_async(batch, streamed, model, llm, reason, failure, blame)
+
+    async def _recover_failed_batch_async(self, batch: List[Tuple[str, Dict]], streamed: Dict[str, Any], model: str,
+                                          llm: AI, reason: str, error: Optional[Exception] = None,
+                                          blame: bool = False) -> Dict[str, Any]:
+        """Keep what a failed batch produced and recover the rest by bisection"""
+        remaining = self._get_rules_to_recover(batch, streamed, model, reason, error, blame)
+        if not remaining:
+            return streamed
+        return {**streamed, **await self._evaluate_batch_fallback_async(remaining, model, llm)}
+
+    async def _evaluate_batch_fallback_async(self, batch: List[Tuple[str, Dict]], model: str,
+                                             llm: Optional[AI] = None) -> Dict[str, Any]:
+        """Recover the rules of a failed batch by bisection, evaluating both halves concurrently on their own conversations"""
+        llm = llm or self.llm
+
+        if len(batch) == 1:
+            return await self._evaluate_isolated_rule_async(*batch[0], model=model, llm=llm)
+
+        middle = len(batch) // 2
+        logger.info(f"Bisecting failed batch of {len(batch)} rules into {middle} and {len(batch) - middle}")
+
+        results = {}
+        for half_results in await asyncio.gather(
+            self._evaluate_batch_async(batch[:middle], model, llm=llm.fork(), bisected=True),
+            self._evaluate_batch_async(batch[middle:], model, llm=llm.fork(), bisected=True)
+        ):
+            results.update(half_results)
+        return results
+
+    async def _evaluate_isolated_rule_async(self, rule_name: str, rule: Dict[str, Any], model: str,
+                                            llm: Optional[AI] = None) -> Dict[str, Any]:
+        """Evaluate a rule bisection isolated from a failed batch on its own"""
+        try:
+            return await self._evaluate_single_rule_async(rule_name, rule, use_steps=False, llm=llm)
+        except Exception as e:
+            logger.error(f"Fallback evaluation failed for {rule_name}: {str(e)}")
+            self._add_to_cannot_evaluate(
+                rule_name,
+                rule,
+                f"Fallback evaluation failed: {str(e)}"
+            )
+            return {}
+
+    @backoff.on_exception(
+        backoff.expo,
+        Exception,
+        max_tries=5,
+        max_time=300,
+        giveup=_is_circuit_open,
+        on_backoff=_record_rule_backoff
+    )
+    async def _evaluate_single_rule_async(self, rule_name: str, rule: Dict[str, Any], use_steps: bool = True,
+                                          llm: Optional[AI] = None) -> Dict:
+        """Evaluate a single rule, on `llm` if given, otherwise the evaluator's conversation"""
+        logger.debug(f"Evaluating rule: {rule_name}")
+
+        if self.llm is None:
+            self._init_llm()
+
+        model = rule.get('Model', [self.DEFAULT_MODEL])[0]
+        prompt = self._get_single_rule_prompt(rule_name, rule, use_steps)
+
+        try:
+            response = await self._generate_response_async(
+                prompt,
+                model,
+                prompt_name=rule_name,
+                history=self._get_rule_history(rule),
+                clear_conversation=self._is_batchable(rule),
+                llm=llm
+            )
+            results = self._process_evaluation_response(response)
+
+            if rule_name in results:
+                self._record_rule_result(rule_name, rule, results[rule_name])
+            else:
+                self._set_stage_result(self._get_rule_stage(rule), rule_name, {})
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error evaluating rule {rule_name}: {str(e)}")
+            self._add_to_cannot_evaluate(rule_name, rule, str(e))
+            raise
+
+    async def load_document_async(self, document_path: str, documents: Optional[List[Document]] = None,
+                                  content_hash: Optional[str] = None) -> bool:
+        """Load a document in a worker thread"""
+        return await asyncio.to_thread(self.load_document, document_path, documents, content_hash)
+
+    async def evaluate_document_async(self, use_steps: bool = True) -> Dict:
+        """Perform full document evaluation, running ready batches and rules concurrently"""
+        logger.info(f"Starting async document evaluation for {self.current_document_path}")
+
+        if not self.document_text:
+            raise ValueError("No document has been loaded. Please load a document to be evaluated first.")
+
+        self._reset_stage_results()
+
+        if self.llm:
+            self.llm.clear_conversation()
+
+        try:
+            self.scheduler = self._create_scheduler()
+            try:
+                await self.scheduler.run_async(await asyncio.to_thread(self._plan_evaluation_tasks))
+            finally:
+                await self._wait_for_saves()
+            await asyncio.to_thread(self.size_estimator.save)
+            self._log_token_usage()
+
+            return await asyncio.to_thread(self.get_combined_evaluation)
+
+        except Exception as e:
+            logger.error(f"Error during document evaluation: {str(e)}", exc_info=True)
+            raise
+        finally:
+            # Failed documents are summarized too, which also frees their totals
+            self.telemetry.record_document(self.current_document_path)
+
+    async def export_results_async(self, output_path: str, combined_results: Optional[Dict] = None) -> None:
+        """Export results and move the processed document in a worker thread"""
+        await asyncio.to_thread(self.export_results, output_path, combined_results)
+
+    async def _evaluate_document_file_async(self, file_path: Path, documents: Optional[List[Document]] = None,
+                                            content_hash: Optional[str] = None) -> Optional[Dict]:
+        """Load, evaluate and export a single document file, optionally with its text and hash already computed"""
+        logger.info(f"Processing document: {file_path}")
+
+        self._reset_evaluator_state()
+
+        # Hashed once for the checkpoint and the text cache
+        if content_hash is None:
+            content_hash = await asyncio.to_thread(self._hash_document_file, file_path)
+        if await asyncio.to_thread(self._skip_if_exported, file_path, content_hash):
+            return None
+
+        try:
+            if not await self.load_document_async(str(file_path), documents, content_hash):
+                logger.error(f"Failed to load document: {file_path}")
+                return None
+
+            evaluation_result = await self.evaluate_document_async()
+
+            output_path = self.output_dir / f"{self._get_preferred_name()}_evaluation.json"
+            await self.export_results_async(str(output_path), evaluation_result)
+
+            return evaluation_result
+        finally:
+            await self._close_llm_async()
+
+    async def evaluate_directory_async(self, document_dir: str,
+                                       max_concurrent_documents: Optional[int] = None) -> List[Dict]:
+        """
+        Evaluate all supported document files in directory concurrently
+
+        Every combined evaluation is kept until the run ends; use
+        iter_evaluate_directory_async for large directories.
+
+        Args:
+            document_dir: Directory containing the documents to evaluate
+            max_concurrent_documents: Documents to evaluate at once. Defaults to
+                the value given at construction time.
+
+        Returns:
+            List of combined evaluations, in order of completion
+        """
+        return [result async for result in self.iter_evaluate_directory_async(document_dir, max_concurrent_documents)]
+
+    async def iter_evaluate_directory_async(self, document_dir: str, max_concurrent_documents: Optional[int] = None,
+                                            on_result: Optional[Callable[[Dict], None]] = None,
+                                            on_error: Optional[Callable[[Path, Exception], None]] = None
+                                            ) -> AsyncIterator[Dict]:
+        """
+        Evaluate all supported document files in directory concurrently, yielding each result once it is exported
+
+        A document slot is only freed once its result has been taken, so at most
+        max_concurrent_documents results are held at a time and nothing is kept
+        after it has been yielded. If the caller stops early, documents still
+        being evaluated are cancelled and left for the next run.
+
+        Args:
+            document_dir: Directory containing the documents to evaluate
+            max_concurrent_documents: Documents to evaluate at once. Defaults to
+                the value given at construction time.
+            on_result: Called with each combined evaluation once it is exported
+            on_error: Called with the file path and exception of each document that failed
+
+        Yields:
+            Combined evaluations, in order of completion
+        """
+        document_files = self._list_document_files(document_dir)
+        document_limit = max(1, int(max_concurrent_documents or self.max_concurrent_documents))
+
+        logger.info(f"Found {len(document_files)} supported document files to process, "
+                    f"{document_limit} documents and {self.max_concurrent_requests} requests at a time")
+
+        pending = await asyncio.to_thread(self._hash_pending_documents, document_files)
+        extracted = None
+        if self.dedupe_threshold is not None:
+            pending, extracted = await asyncio.to_thread(self._deduplicate_documents, pending)
+
+        # Created before the workers so they all share it
+        self._get_request_semaphore()
+        document_semaphore = asyncio.Semaphore(document_limit)
+        finished: asyncio.Queue = asyncio.Queue()
+        all_done = object()
+
+        async def evaluate_file(file_path: Path, content_hash: Optional[str],
+                                documents: Optional[List[Document]]) -> None:
+            try:
+                evaluation_result = await self._create_worker()._evaluate_document_file_async(
+                    file_path, documents, content_hash)
+                finished.put_nowait((file_path, evaluation_result, None))
+            except Exception as e:
+                finished.put_nowait((file_path, None, e))
+
+        async def feed() -> None:
+            # A document is only taken (and its pre-extracted text only leaves the
+            # bounded extraction queue) once a document slot is free
+            document_iter = self._iter_document_files(pending, document_limit, extracted)
+            tasks = []
+            try:
+                while True:
+                    await document_semaphore.acquire()
+                    item = await asyncio.to_thread(next, document_iter, None)
+                    if item is None:
+                        document_semaphore.release()
+                        break
+                    tasks.append(asyncio.create_task(evaluate_file(*item)))
+
+                await asyncio.gather(*tasks)
+            except Exception as e:
+                logger.error(f"Stopped taking documents: {str(e)}", exc_info=True)
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                finished.put_nowait(all_done)
+
+        feeder = asyncio.create_task(feed())
+        evaluated = set()
+        try:
+            while True:
+                item = await finished.get()
+                if item is all_done:
+                    break
+
+                document_semaphore.release()
+                file_path, evaluation_result, error = item
+                if error is not None:
+                    self._handle_document_error(file_path, error, on_error)
+                elif evaluation_result is not None:
+                    self._handle_document_result(evaluation_result, evaluated, on_result)
+                    yield evaluation_result
+        finally:
+            feeder.cancel()
+            await asyncio.gather(feeder, return_exceptions=True)
+
+            await asyncio.to_thread(self._resolve_duplicates, evaluated)
+            self._log_telemetry_summary()
+
+    def evaluate_document(self, use_steps: bool = True) -> Dict:
+        """Synchronous wrapper around evaluate_document_async"""
+        return asyncio.run(self.evaluate_document_async(use_steps))
+
+    def evaluate_directory(self, document_dir: str, max_workers: Optional[int] = None) -> List[Dict]:
+        """Synchronous wrapper around evaluate_directory_async; max_workers caps concurrent documents"""
+        return asyncio.run(self.evaluate_directory_async(document_dir, max_workers))
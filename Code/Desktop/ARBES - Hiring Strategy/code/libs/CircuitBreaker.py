@@ -0,0 +1,299 @@
+import asyncio
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, Tuple
+
+import openai
+
+from libs.RateLimiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model/deployment whose circuit is open"""
+
+
+class RetryBudgetExhausted(CircuitOpenError):
+    """Raised instead of retrying a call when the model/deployment's retry budget is spent"""
+
+
+def _error_chain(error: BaseException) -> Iterator[BaseException]:
+    """An error and the errors it was raised from, e.g. the API error an AI client wrapped"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def is_service_error(error: BaseException) -> bool:
+    """
+    Whether a call failed because of the provider or the connection to it
+    (timeouts, connection errors, 429 and 5xx responses) rather than because
+    of what the model answered, such as a response that cannot be parsed.
+    Only these count towards opening a circuit.
+    """
+    for cause in _error_chain(error):
+        if isinstance(cause, (openai.APIConnectionError, TimeoutError, ConnectionError)):
+            return True
+        if isinstance(cause, openai.APIStatusError):
+            return cause.status_code == 429 or cause.status_code >= 500
+    return False
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether a call was refused with a 429 (rate limit) response"""
+    return any(
+        isinstance(cause, openai.RateLimitError) or getattr(cause, 'status_code', None) == 429
+        for cause in _error_chain(error)
+    )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker and retry budget for one model/deployment.
+
+    Closed: calls go through and their outcomes are kept for window_seconds.
+    Once at least min_calls outcomes are in the window and failure_rate of
+    them failed, the circuit opens. Open: callers wait up to open_wait seconds
+    for it to recover and then fail fast with CircuitOpenError. After
+    open_seconds the circuit is half-open and admits one probe call, then one
+    more at a time for every probe that succeeds; probe_successes successes
+    close it, and a failed probe opens it again for twice as long (up to
+    max_open_seconds).
+
+    Retries are paid from a budget: every admitted call adds retry_ratio of a
+    retry, min_retries_per_minute are granted regardless, and at most
+    max_retries are banked.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, key: str, failure_rate: float = 0.5, min_calls: int = 10, window_seconds: float = 60,
+                 open_seconds: float = 30, max_open_seconds: float = 300, probe_successes: int = 3,
+                 open_wait: float = 60, retry_ratio: float = 0.2, min_retries_per_minute: int = 10,
+                 max_retries: int = 100):
+        """
+        Initialize a closed circuit.
+
+        Args:
+            key: Model or deployment name, for logging
+            failure_rate: Share of failed calls in the window that opens the circuit
+            min_calls: Calls needed in the window before the failure rate counts
+            window_seconds: How long call outcomes count towards the failure rate
+            open_seconds: How long the circuit stays open the first time it trips
+            max_open_seconds: Longest the circuit stays open after repeated trips
+            probe_successes: Successful probes that close a half-open circuit
+            open_wait: Seconds a call waits for an open circuit before failing fast; 0 fails fast
+            retry_ratio: Retries earned by each admitted call
+            min_retries_per_minute: Retries granted per minute regardless of traffic
+            max_retries: Most retries that can be banked
+        """
+        self.key = key
+        self.failure_rate = float(failure_rate)
+        self.min_calls = max(1, int(min_calls))
+        self.window_seconds = float(window_seconds)
+        self.open_seconds = float(open_seconds)
+        self.max_open_seconds = max(float(max_open_seconds), self.open_seconds)
+        self.probe_successes = max(1, int(probe_successes))
+        self.open_wait = max(0.0, float(open_wait))
+        self.retry_ratio = float(retry_ratio)
+
+        self.state = self.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._cooldown = self.open_seconds
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self._retries = TokenBucket(max(1, int(max_retries)), max(0, int(min_retries_per_minute)) / 60.0)
+        self._retries.available = min(self._retries.capacity, float(min_retries_per_minute))
+        self._lock = threading.Lock()
+
+        self.trips = 0
+        self.rejected_calls = 0
+        self.rejected_retries = 0
+
+    def _try_admit(self) -> Tuple[bool, bool, float]:
+        """Admit a call if the circuit allows it; returns (admitted, is_probe, seconds until it might)"""
+        with self._lock:
+            now = time.monotonic()
+
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self._cooldown - now
+                if remaining > 0:
+                    return False, False, remaining
+                self.state = self.HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+                logger.info(f"Circuit for {self.key} half-open, probing with one call")
+
+            if self.state == self.HALF_OPEN:
+                # One probe at first, one more for each probe that succeeded
+                if self._probes_in_flight > self._probe_successes:
+                    return False, False, 1.0
+                self._probes_in_flight += 1
+                is_probe = True
+            else:
+                is_probe = False
+
+            self._retries.refill(now)
+            self._retries.available = min(self._retries.capacity, self._retries.available + self.retry_ratio)
+            return True, is_probe, 0.0
+
+    def _reject(self, waited: float) -> None:
+        with self._lock:
+            self.rejected_calls += 1
+        raise CircuitOpenError(f"Circuit for {self.key} is {self.state}; gave up after waiting {waited:.1f}s")
+
+    def acquire(self) -> bool:
+        """
+        Wait until the circuit admits a call, up to open_wait seconds.
+
+        Returns:
+            Whether the call is a half-open probe; pass it to record_success/record_failure
+
+        Raises:
+            CircuitOpenError: If the circuit did not admit the call in time
+        """
+        waited = 0.0
+        while True:
+            admitted, is_probe, wait = self._try_admit()
+            if admitted:
+                return is_probe
+
+            if waited >= self.open_wait:
+                self._reject(waited)
+            wait = min(wait, self.open_wait - waited)
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self) -> bool:
+        """Like acquire, but waits with asyncio.sleep so the event loop keeps running"""
+        waited = 0.0
+        while True:
+            admitted, is_probe, wait = self._try_admit()
+            if admitted:
+                return is_probe
+
+            if waited >= self.open_wait:
+                self._reject(waited)
+            wait = min(wait, self.open_wait - waited)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def record_success(self, is_probe: bool = False) -> None:
+        """Record a call that succeeded"""
+        with self._lock:
+            if is_probe and self.state == self.HALF_OPEN:
+                self._probes_in_flight -= 1
+                self._probe_successes += 1
+                if self._probe_successes >= self.probe_successes:
+                    self.state = self.CLOSED
+                    self._cooldown = self.open_seconds
+                    self._outcomes.clear()
+                    logger.info(f"Circuit for {self.key} closed after {self._probe_successes} successful probes")
+                return
+
+            if self.state == self.CLOSED:
+                self._add_outcome(False)
+
+    def release(self, is_probe: bool = False) -> None:
+        """Give back an admitted call that was cancelled before it had an outcome"""
+        with self._lock:
+            if is_probe and self.state == self.HALF_OPEN:
+                self._probes_in_flight -= 1
+
+    def record_failure(self, is_probe: bool = False) -> None:
+        """Record a call that failed"""
+        with self._lock:
+            if is_probe and self.state == self.HALF_OPEN:
+                self._cooldown = min(self._cooldown * 2, self.max_open_seconds)
+                self._open(f"probe failed, staying open for {self._cooldown:.0f}s")
+                return
+
+            if self.state == self.CLOSED:
+                self._add_outcome(True)
+                failures = sum(1 for _, failed in self._outcomes if failed)
+                if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                    self._open(f"{failures} of the last {len(self._outcomes)} calls failed, "
+                               f"open for {self._cooldown:.0f}s")
+
+    def _add_outcome(self, failed: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self, reason: str) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.trips += 1
+        logger.warning(f"Circuit for {self.key} opened: {reason}")
+
+    def try_spend_retry(self) -> bool:
+        """Take one retry from the budget; False if the circuit is open or the budget is spent"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                self.rejected_retries += 1
+                return False
+
+            self._retries.refill(time.monotonic())
+            if self._retries.available < 1:
+                self.rejected_retries += 1
+                return False
+
+            self._retries.consume(1)
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current state and counters"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "trips": self.trips,
+                "rejected_calls": self.rejected_calls,
+                "rejected_retries": self.rejected_retries,
+                "retry_budget": round(self._retries.available, 1)
+            }
+
+
+# Process-wide registry of breakers keyed by model/deployment name
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(key: str, **settings: Any) -> CircuitBreaker:
+    """
+    Get the shared circuit breaker for a model/deployment, creating it on first use.
+
+    Settings are only applied when the breaker is created; later callers share
+    the existing breaker regardless of the settings they pass.
+
+    Args:
+        key: Model or deployment name
+        **settings: CircuitBreaker arguments for a new breaker
+
+    Returns:
+        CircuitBreaker shared by every caller in the process using the same key
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, **settings)
+            _circuit_breakers[key] = breaker
+            logger.info(f"Created circuit breaker for {key}")
+        return breaker
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """State and counters of every breaker in the process, keyed by model/deployment"""
+    with _circuit_breakers_lock:
+        breakers = dict(_circuit_breakers)
+    return {key: breaker.get_stats() for key, breaker in breakers.items()}
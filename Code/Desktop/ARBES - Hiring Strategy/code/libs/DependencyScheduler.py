@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledTask:
+    """A unit of work (a rule or a batch of rules) in the dependency graph"""
+    name: str
+    run: Callable[[], Any]
+    provides: Set[str]
+    requires: Set[str] = field(default_factory=set)
+    priority: Tuple = ()
+    exclusive: bool = False
+    group: Optional[str] = None
+
+
+class DependencyScheduler:
+    """
+    Runs tasks on a bounded thread pool as soon as the rules they require are done.
+
+    A task's rules are marked done when it finishes, whether it succeeded or
+    failed, so a failure never blocks dependents. Tasks may also report rules
+    done early through mark_done. run uses a thread pool; run_async runs
+    coroutine tasks on the event loop. Exclusive tasks run alone, and tasks in a
+    group with a limit run at most that many at a time. If the remaining
+    tasks can never become ready (a dependency cycle), the highest priority one
+    is started anyway so the run always completes.
+    """
+
+    def __init__(self, max_workers: int = 2, group_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            max_workers: Tasks run at once
+            group_limits: Tasks run at once per task group, e.g. {'individual': 2}
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.group_limits = {group: max(1, int(limit)) for group, limit in (group_limits or {}).items()}
+        self._condition = threading.Condition()
+        self._done: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def mark_done(self, names: Iterable[str]) -> None:
+        """Mark rules as done, releasing tasks that were waiting on them"""
+        with self._condition:
+            self._done.update(names)
+            self._condition.notify_all()
+
+        # run_async only looks for newly ready tasks when something wakes it up
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _prepare(self, tasks: List[ScheduledTask], completed: Optional[Iterable[str]]) -> List[ScheduledTask]:
+        """Reset the done set and return the tasks in priority order"""
+        with self._condition:
+            self._done = set(completed or [])
+
+        # Requirements no task provides can never be met and are ignored
+        provided = set().union(*(task.provides for task in tasks)) if tasks else set()
+        pending = sorted(tasks, key=lambda t: t.priority)
+        for task in pending:
+            task.requires = (task.requires & provided) - task.provides
+        return pending
+
+    def _take_startable(self, pending: List[ScheduledTask], running: List[ScheduledTask]) -> List[ScheduledTask]:
+        """Remove and return the pending tasks that can start now; call with the condition held"""
+        ready = [task for task in pending if task.requires <= self._done]
+
+        if not ready and not running and pending:
+            task = pending[0]
+            logger.warning(f"Dependency cycle detected; starting {task.name} "
+                           f"without {sorted(task.requires - self._done)}")
+            ready = [task]
+
+        started = []
+        running_count = len(running)
+        running_exclusive = any(t.exclusive for t in running)
+        group_counts: Dict[str, int] = {}
+        for t in running:
+            group_counts[t.group] = group_counts.get(t.group, 0) + 1
+
+        for task in ready:
+            if running_count >= self.max_workers:
+                break
+            if running_count and (task.exclusive or running_exclusive):
+                break
+            # A full group leaves its slot to ready tasks outside the group
+            if task.group in self.group_limits and group_counts.get(task.group, 0) >= self.group_limits[task.group]:
+                continue
+
+            pending.remove(task)
+            started.append(task)
+            running_count += 1
+            running_exclusive = running_exclusive or task.exclusive
+            group_counts[task.group] = group_counts.get(task.group, 0) + 1
+            logger.debug(f"Starting task {task.name}")
+        return started
+
+    def run(self, tasks: List[ScheduledTask], completed: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Run all tasks, respecting their dependencies.
+
+        Args:
+            tasks: Tasks to run
+            completed: Rules that are already done before the run starts
+
+        Returns:
+            Task results keyed by task name; failed tasks are omitted
+        """
+        pending = self._prepare(tasks, completed)
+        results: Dict[str, Any] = {}
+        running: Dict[str, ScheduledTask] = {}
+
+        def on_done(task: ScheduledTask, future) -> None:
+            try:
+                results[task.name] = future.result()
+            except Exception as e:
+                logger.error(f"Task {task.name} failed: {str(e)}", exc_info=True)
+            finally:
+                with self._condition:
+                    running.pop(task.name, None)
+                    self._done.update(task.provides)
+                    self._condition.notify_all()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self._condition:
+                while pending or running:
+                    started = self._take_startable(pending, list(running.values()))
+
+                    for task in started:
+                        running[task.name] = task
+                        future = executor.submit(task.run)
+                        future.add_done_callback(lambda f, task=task: on_done(task, f))
+
+                    if not started:
+                        self._condition.wait()
+
+        return results
+
+    async def run_async(self, tasks: List[ScheduledTask], completed: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Run all tasks on the current event loop, respecting their dependencies.
+
+        Same rules as run, but each task's run must return an awaitable and at
+        most max_workers of them are awaited at once.
+
+        Args:
+            tasks: Tasks to run
+            completed: Rules that are already done before the run starts
+
+        Returns:
+            Task results keyed by task name; failed tasks are omitted
+        """
+        pending = self._prepare(tasks, completed)
+        results: Dict[str, Any] = {}
+        running: Dict[asyncio.Future, ScheduledTask] = {}
+
+        self._wakeup = asyncio.Event()
+        wakeup = asyncio.ensure_future(self._wakeup.wait())
+
+        try:
+            while pending or running:
+                with self._condition:
+                    started = self._take_startable(pending, list(running.values()))
+
+                for task in started:
+                    running[asyncio.ensure_future(task.run())] = task
+
+                if not running:
+                    continue
+
+                finished, _ = await asyncio.wait([*running, wakeup], return_when=asyncio.FIRST_COMPLETED)
+                if wakeup in finished:
+                    self._wakeup.clear()
+                    wakeup = asyncio.ensure_future(self._wakeup.wait())
+
+                for future in finished:
+                    if future not in running:
+                        continue
+                    task = running.pop(future)
+                    try:
+                        results[task.name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Task {task.name} failed: {str(e)}", exc_info=True)
+                    with self._condition:
+                        self._done.update(task.provides)
+        finally:
+            wakeup.cancel()
+            self._wakeup = None
+
+        return results
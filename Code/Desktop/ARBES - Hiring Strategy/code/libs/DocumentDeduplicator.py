@@ -0,0 +1,161 @@
+import hashlib
+import re
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DuplicateGroup:
+    """A document that is evaluated and the copies of it that are not"""
+    canonical: Path
+    duplicates: List[Tuple[Path, str, float]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            "canonical": str(self.canonical),
+            "duplicates": [
+                {"file": str(path), "match": match, "similarity": round(similarity, 3)}
+                for path, match, similarity in self.duplicates
+            ]
+        }
+
+
+class DocumentDeduplicator:
+    """
+    Groups documents whose text is identical or nearly identical.
+
+    Each document gets a SHA-256 of its text and a MinHash signature of its
+    word shingles. Identical hashes are exact duplicates; otherwise documents
+    whose signatures land in the same LSH band are compared, and pairs whose
+    estimated Jaccard similarity reaches the threshold are grouped. Documents
+    without any words are never grouped. The newest file in a group is its
+    canonical document.
+    """
+
+    SHINGLE_SIZE = 5
+    NUM_PERM = 128
+    BANDS = 16
+
+    _WORD = re.compile(r'\w+')
+    _PRIME = np.uint64((1 << 61) - 1)
+
+    def __init__(self, threshold: float = 0.9):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity of word shingles at or above which
+                two documents are duplicates; 1.0 groups exact copies only
+        """
+        self.threshold = float(threshold)
+        self._rows = self.NUM_PERM // self.BANDS
+
+        # Fixed seed so signatures are comparable between runs
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, 1 << 32, size=self.NUM_PERM, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=self.NUM_PERM, dtype=np.uint64)
+
+        self._paths: List[Path] = []
+        self._hashes: List[str] = []
+        self._signatures: List[Optional[np.ndarray]] = []
+
+    def _signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of the text's word shingles, or None for text without words"""
+        words = self._WORD.findall(text.lower())
+        if not words:
+            return None
+
+        size = min(self.SHINGLE_SIZE, len(words))
+        shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+        # Both factors are below 2**32, so (a * x + b) cannot overflow 64 bits
+        permuted = (np.outer(hashes, self._a) + self._b) % self._PRIME
+        return permuted.min(axis=0)
+
+    def add(self, path: Path, text: str) -> None:
+        """Fingerprint a document"""
+        self._paths.append(Path(path))
+        self._hashes.append(hashlib.sha256((text or '').encode('utf-8')).hexdigest())
+        self._signatures.append(self._signature(text or ''))
+
+    def _similarity(self, i: int, j: int) -> float:
+        """Estimated Jaccard similarity of two fingerprinted documents"""
+        if self._hashes[i] == self._hashes[j]:
+            return 1.0
+        if self._signatures[i] is None or self._signatures[j] is None:
+            return 0.0
+        return float(np.mean(self._signatures[i] == self._signatures[j]))
+
+    def find_groups(self) -> List[DuplicateGroup]:
+        """
+        Group the fingerprinted documents.
+
+        Returns:
+            One group per set of duplicates; documents without duplicates are left out
+        """
+        parent = list(range(len(self._paths)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i: int, j: int) -> None:
+            parent[find(i)] = find(j)
+
+        buckets: Dict[Tuple, List[int]] = {}
+        for i, (text_hash, signature) in enumerate(zip(self._hashes, self._signatures)):
+            # Documents without text (scans, failed extraction) say nothing about each other
+            if signature is None:
+                continue
+
+            buckets.setdefault(('exact', text_hash), []).append(i)
+            if self.threshold < 1.0:
+                for band in range(self.BANDS):
+                    key = (band, signature[band * self._rows:(band + 1) * self._rows].tobytes())
+                    buckets.setdefault(key, []).append(i)
+
+        for members in buckets.values():
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    if find(i) != find(j) and self._similarity(i, j) >= self.threshold:
+                        union(i, j)
+
+        members_by_root: Dict[int, List[int]] = {}
+        for i in range(len(self._paths)):
+            members_by_root.setdefault(find(i), []).append(i)
+
+        groups = []
+        for members in members_by_root.values():
+            if len(members) < 2:
+                continue
+
+            canonical = max(members, key=self._canonical_key)
+            group = DuplicateGroup(self._paths[canonical])
+            for i in sorted(members, key=lambda m: self._paths[m].name):
+                if i != canonical:
+                    match = 'exact' if self._hashes[i] == self._hashes[canonical] else 'near'
+                    group.duplicates.append((self._paths[i], match, self._similarity(i, canonical)))
+            groups.append(group)
+
+        logger.info(f"Found {sum(len(g.duplicates) for g in groups)} duplicate document(s) "
+                    f"in {len(groups)} group(s) among {len(self._paths)} document(s)")
+        return groups
+
+    def _canonical_key(self, i: int) -> Tuple:
+        """Newest file first, then name, so the latest resubmission is the one evaluated"""
+        try:
+            modified = self._paths[i].stat().st_mtime
+        except OSError:
+            modified = 0.0
+        return modified, self._paths[i].name
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Set, Tuple
 from datetime import datetime, date
 from abc import ABC, abstractmethod
 import sys
@@ -8,15 +8,16 @@ import json
 import logging
 import shutil
 import time
+import copy
 import backoff
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from itertools import groupby
+from functools import partial
 from typing import List, Tuple, Dict
 import textwrap
 import re
 
 from llama_index.core import VectorStoreIndex
-from llama_index.core.readers import SimpleDirectoryReader
 from llama_index.core.schema import Document
 
 sys.path.append(os.path.abspath(os.path.join(os.getcwd(), '..')))
@@ -31,11 +32,36 @@ from libs.FieldFormatter import FieldFormatter
 from libs.OutputTextCleaner import OutputTextCleaner
 from libs.InputTextCleaner import InputTextCleaner
 from libs.SafeJSONEncoder import SafeJSONEncoder, safe_json_loads, safe_json_dumps
+from libs.RateLimiter import RateLimiter, get_rate_limiter
+from libs.CircuitBreaker import (CircuitBreaker, CircuitOpenError, RetryBudgetExhausted, get_circuit_breaker,
+                                 get_circuit_breaker_stats, is_rate_limit_error, is_service_error)
+from libs.RuleResultCache import RuleResultCache
+from libs.DependencyScheduler import DependencyScheduler, ScheduledTask
+from libs.RuleSizeEstimator import RuleSizeEstimator
+from libs.EvaluationCheckpoint import EvaluationCheckpoint
+from libs.IncrementalJSONParser import IncrementalJSONParser
+from libs.EvaluationTelemetry import EvaluationTelemetry
+from libs.ResponseJSONExtractor import ResponseJSONExtractor
+from libs.DocumentTextCache import DocumentTextCache
+from libs.DocumentTextExtractor import DocumentTextExtractor
+from libs.EvaluationCostEstimator import EvaluationCostEstimator
+from libs.DocumentDeduplicator import DocumentDeduplicator, DuplicateGroup
+from libs.SourceTextStore import SourceTextStore
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def _record_rule_backoff(details: Dict[str, Any]) -> None:
+    """backoff handler for single-rule evaluation: pay for the retry and record it in the evaluator's telemetry"""
+    evaluator, rule_name = details['args'][0], details['args'][1]
+    rule = details['args'][2] if len(details['args']) > 2 else details['kwargs'].get('rule', {})
+    evaluator._record_backoff(rule.get('Model', [evaluator.DEFAULT_MODEL])[0], [rule_name], details)
+
+def _is_circuit_open(e: Exception) -> bool:
+    """backoff giveup check: never retry a call the circuit breaker refused"""
+    return isinstance(e, CircuitOpenError)
+
 class EvaluationStrategy(ABC):
     """Base strategy for evaluation rule processing"""
     
@@ -44,92 +70,235 @@ class EvaluationStrategy(ABC):
         logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     @abstractmethod
+    def plan_tasks(self, rules: List[Tuple[str, Dict]]) -> List[ScheduledTask]:
+        """Turn rules into tasks for the dependency scheduler"""
+        pass
+
     def process_rules(self, rules: List[Tuple[str, Dict]], stage: int) -> Dict[str, Any]:
         """Process a set of rules for a given stage"""
-        pass
+        scheduler = self.evaluator._create_scheduler()
+        results = {}
+        for task_results in scheduler.run(self.plan_tasks(rules)).values():
+            results.update(task_results)
+        return results
 
 class BatchEvaluationStrategy(EvaluationStrategy):
     """Strategy for batch processing of rules"""
     
-    def process_rules(self, rules: List[Tuple[str, Dict]], stage: int) -> Dict[str, Any]:
-        batches = self.evaluator._group_rules_for_batching(rules)
-        results = {}
+    def plan_tasks(self, rules: List[Tuple[str, Dict]]) -> List[ScheduledTask]:
+        batches = [batch for batch in self.evaluator._group_rules_for_batching(rules) if batch]
+        tasks = []
         
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = []
+        for batch_idx, batch in enumerate(batches):
+            model = batch[0][1].get('Model', [self.evaluator.DEFAULT_MODEL])[0]
+            stage = self.evaluator._get_rule_stage(batch[0][1])
+            logger.debug(f"Planning batch {batch_idx + 1}/{len(batches)} "
+                          f"with {len(batch)} rules using model {model}")
             
-            for batch_idx, batch in enumerate(batches):
-                if not batch:
-                    continue
+            tasks.append(ScheduledTask(
+                name=f"batch {batch_idx + 1}/{len(batches)} ({model}, stage {stage})",
+                run=partial(self._run_batch, batch, model, stage),
+                provides={rule_name for rule_name, _ in batch},
+                requires=self.evaluator._get_rule_prerequisites(batch),
+                priority=min(self.evaluator._get_rule_position(rule) for _, rule in batch)
+            ))
                     
-                model = batch[0][1].get('Model', [self.evaluator.DEFAULT_MODEL])[0]
-                logger.debug(f"Submitting batch {batch_idx + 1}/{len(batches)} "
-                              f"with {len(batch)} rules using model {model}")
-                
-                futures.append(
-                    executor.submit(
-                        self.evaluator._evaluate_batch,
-                        batch,
-                        model
-                    )
-                )
-                time.sleep(2)
-            
-            for future in as_completed(futures):
-                try:
-                    batch_results = future.result()
-                    results.update(batch_results)
-                except Exception as e:
-                    logger.error(f"Batch evaluation failed: {str(e)}", exc_info=True)
-                    
-        return results
+        return tasks
+
+    def _run_batch(self, batch: List[Tuple[str, Dict]], model: str, stage: int) -> Dict[str, Any]:
+        # Each batch gets its own conversation so concurrent batches can't mix context
+        batch_results = self.evaluator._evaluate_batch(batch, model, llm=self.evaluator._fork_llm())
+        self.evaluator._update_stage_results(batch_results, stage)
+        return batch_results
 
 class IndividualEvaluationStrategy(EvaluationStrategy):
     """Strategy for individual processing of rules"""
     
-    def process_rules(self, rules: List[Tuple[str, Dict]], stage: int) -> Dict[str, Any]:
-        results = {}
-        
-        for rule_name, rule in rules:
-            try:
-                rule_result = self.evaluator._evaluate_single_rule(rule_name, rule)
-                results.update(rule_result)
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"Error evaluating {rule_name}: {str(e)}", exc_info=True)
-                self.evaluator._add_to_cannot_evaluate(
-                    rule_name,
-                    rule,
-                    f"Individual evaluation failed: {str(e)}"
-                )
+    def plan_tasks(self, rules: List[Tuple[str, Dict]]) -> List[ScheduledTask]:
+        # Individual rules continue a conversation, so the rules on one conversation
+        # run one at a time in Stage/Order sequence. A pre_clear rule has no use for
+        # the conversation before it and starts a new one for itself and the rules
+        # after it, which runs alongside the others. deps_only and stateless rules
+        # get a conversation of their own that no other rule continues.
+        ordered_rules = sorted(rules, key=lambda r: self.evaluator._get_rule_position(r[1]))
+        tasks = []
+        previous_rule = None
+        llm = None
+
+        for rule_name, rule in ordered_rules:
+            hist_handling = self.evaluator._get_hist_handling(rule)
+            requires = self.evaluator._get_rule_prerequisites([(rule_name, rule)])
+
+            if hist_handling in ('deps_only', 'stateless'):
+                rule_llm = self.evaluator._fork_llm()
+            else:
+                if hist_handling == 'pre_clear' and previous_rule:
+                    previous_rule = None
+                    llm = self.evaluator._fork_llm()
+                if previous_rule:
+                    requires.add(previous_rule)
+                previous_rule = rule_name
+                rule_llm = llm
+
+            tasks.append(ScheduledTask(
+                name=f"rule {rule_name}",
+                run=partial(self._run_rule, rule_name, rule, rule_llm),
+                provides={rule_name},
+                requires=requires,
+                priority=self.evaluator._get_rule_position(rule),
+                group='individual'
+            ))
                 
-        return results
+        return tasks
+
+    def _run_rule(self, rule_name: str, rule: Dict, llm: Optional[AI] = None) -> Dict[str, Any]:
+        try:
+            rule_result = self.evaluator._evaluate_single_rule(rule_name, rule, llm=llm)
+            self.evaluator._update_stage_results(rule_result, self.evaluator._get_rule_stage(rule))
+            return rule_result
+        except Exception as e:
+            logger.error(f"Error evaluating {rule_name}: {str(e)}", exc_info=True)
+            self.evaluator._add_to_cannot_evaluate(
+                rule_name,
+                rule,
+                f"Individual evaluation failed: {str(e)}"
+            )
+            return {}
 
 class DocumentEvaluator:
     """Enhanced document evaluator with strategy pattern"""
     
     SUPPORTED_EXTENSIONS: Set[str] = {'.pdf', '.doc', '.docx', '.txt', '.py'}
-    BATCH_SIZE = 4
+    MAX_BATCH_SIZE = 10
     DEFAULT_MODEL = 'gpt-4'
+
+    # Token budgets for one batch call; 'default' applies to models not listed.
+    # o-series models spend part of their completion budget on reasoning.
+    BATCH_TOKEN_BUDGETS: Dict[str, Dict[str, int]] = {
+        'default': {'max_prompt_tokens': 6000, 'max_output_tokens': 8000},
+        'o1-preview': {'max_prompt_tokens': 6000, 'max_output_tokens': 4000},
+        'o1-mini': {'max_prompt_tokens': 6000, 'max_output_tokens': 4000}
+    }
+
+    # Per model/deployment quotas; 'default' applies to models not listed
+    RATE_LIMITS: Dict[str, Dict[str, int]] = {
+        'default': {'requests_per_minute': 60, 'tokens_per_minute': 150000}
+    }
+
+    # Circuit breaker and retry budget settings, applied to each model/deployment's
+    # breaker (see CircuitBreaker for their meaning)
+    CIRCUIT_BREAKER: Dict[str, Any] = {
+        'failure_rate': 0.5, 'min_calls': 10, 'window_seconds': 60,
+        'open_seconds': 30, 'max_open_seconds': 300, 'probe_successes': 3, 'open_wait': 60,
+        'retry_ratio': 0.2, 'min_retries_per_minute': 10, 'max_retries': 100
+    }
+    CHARS_PER_TOKEN = 4
+    EXPECTED_OUTPUT_TOKENS = 1000
+
+    # Hist Handling values, in order of precedence, for how much conversation a rule needs:
+    # - stateless: none; its Data Dependency is neither sent as history nor waited for
+    # - deps_only: only its Data Dependency results as history, on a conversation of its own
+    # - pre_clear: a cleared conversation with its Data Dependency results as history, which
+    #   individually evaluated rules after it continue
+    # Rules with none of these continue the conversation of the individual rules before
+    # them; rules with any of them are batched.
+    BATCHABLE_HIST_HANDLING = ('stateless', 'deps_only', 'pre_clear')
     
-    def __init__(self, evaluation_rules_path: str, evaluation_steps_path: str, output_dir: str):
-        """Initialize the document evaluator"""
+    def __init__(self, evaluation_rules_path: str, evaluation_steps_path: str, output_dir: str,
+                 max_workers: int = 1, rate_limits: Optional[Dict[str, Dict[str, int]]] = None,
+                 cache_path: Optional[str] = None, build_index: bool = False,
+                 max_rule_workers: int = 4, batch_hints_path: Optional[str] = None,
+                 checkpoint_path: Optional[str] = None, stream_responses: bool = False,
+                 rulebook_in_prefix: bool = False, metrics_path: Optional[str] = None,
+                 text_cache_path: Optional[str] = None, extract_workers: int = 0,
+                 dedupe_threshold: Optional[float] = None, circuit_breaker: Optional[Dict[str, Any]] = None,
+                 max_individual_workers: int = 2, source_text_store_path: Optional[str] = None):
+        """
+        Initialize the document evaluator
+
+        Args:
+            evaluation_rules_path: Path to evaluation rules JSON
+            evaluation_steps_path: Path to evaluation steps JSON
+            output_dir: Directory for evaluation results
+            max_workers: Number of documents evaluate_directory processes concurrently
+            rate_limits: Quotas keyed by model/deployment, e.g.
+                {'gpt-4o': {'requests_per_minute': 450, 'tokens_per_minute': 150000}}
+            cache_path: Optional SQLite file for caching rule results between runs
+            build_index: Build the document vector index when loading instead of on first access
+            max_rule_workers: Number of rules/batches evaluated concurrently within a document
+            batch_hints_path: Optional JSON file that keeps observed rule output sizes between runs
+            checkpoint_path: Optional JSONL journal used to resume interrupted runs
+            stream_responses: Stream batch responses and publish each rule result as soon as it is complete
+            rulebook_in_prefix: Put every rule definition in the cached system prompt and refer to
+                rules by name in prompts, instead of sending definitions with each call
+            metrics_path: Optional JSONL file for per-call token, latency and retry telemetry
+            text_cache_path: Optional SQLite file caching extracted document text by file content hash
+            extract_workers: Processes evaluate_directory uses to extract document text ahead of
+                evaluation; 0 extracts each document when it is loaded
+            dedupe_threshold: Similarity (0-1) at or above which evaluate_directory treats documents
+                as duplicates and evaluates only the newest one; None evaluates every document.
+                1.0 groups exact copies only; lower values also group near duplicates, which
+                can merge different candidates' resumes built from the same template
+            circuit_breaker: Overrides for the CIRCUIT_BREAKER settings, e.g. {'open_wait': 0} to
+                fail fast instead of waiting for an open circuit
+            max_individual_workers: Number of rules evaluated individually at once within a document,
+                out of max_rule_workers
+            source_text_store_path: Optional directory storing each document's text once, compressed;
+                exported evaluations then reference it by hash instead of embedding it as source_txt
+        """
         self.evaluation_rules = self._load_json(evaluation_rules_path)
         self.evaluation_steps = self._load_json(evaluation_steps_path)
+        self.evaluation_fingerprint = self._get_evaluation_fingerprint()
 
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.max_workers = max(1, int(max_workers))
+        self.max_rule_workers = max(1, int(max_rule_workers))
+        self.max_individual_workers = max(1, int(max_individual_workers))
+        self.rate_limits = {**self.RATE_LIMITS, **(rate_limits or {})}
+        self.circuit_breaker_settings = {**self.CIRCUIT_BREAKER, **(circuit_breaker or {})}
+        self.size_estimator = RuleSizeEstimator(batch_hints_path, chars_per_token=self.CHARS_PER_TOKEN)
+        self.result_cache = RuleResultCache(cache_path) if cache_path else None
+        self.checkpoint = EvaluationCheckpoint(checkpoint_path) if checkpoint_path else None
+        self.build_index = build_index
+        self.stream_responses = stream_responses
+        self.rulebook_in_prefix = rulebook_in_prefix
+        self.telemetry = EvaluationTelemetry(metrics_path)
+        self.text_cache = DocumentTextCache(text_cache_path) if text_cache_path else None
+        self.extract_workers = max(0, int(extract_workers))
+        self.text_extractor = DocumentTextExtractor(self.text_cache, max_processes=self.extract_workers or 1)
+        self.dedupe_threshold = dedupe_threshold
+        self.source_text_store = SourceTextStore(source_text_store_path) if source_text_store_path else None
+        self.duplicate_groups: Dict[str, DuplicateGroup] = {}
         
+        self.documents = None
         self.document_index = None
         self.document_text = None
+        self.document_hash = None
+        self.document_key = None
         self.current_document_path = None
-        self.stage_results = self._init_stage_results()
+        self._reset_stage_results()
         self.llm = None
+        self.system_instruction_tokens = 0
+        self.scheduler = None
         
         # Initialize evaluation strategies
         self.batch_strategy = BatchEvaluationStrategy(self)
         self.individual_strategy = IndividualEvaluationStrategy(self)
 
+    @property
+    def document_index(self) -> Optional[VectorStoreIndex]:
+        """Vector index of the loaded document, built on first access"""
+        if self._document_index is None and self.documents:
+            logger.info(f"Building vector index for {self.current_document_path}")
+            self._document_index = VectorStoreIndex.from_documents(self.documents)
+        return self._document_index
+
+    @document_index.setter
+    def document_index(self, value: Optional[VectorStoreIndex]) -> None:
+        self._document_index = value
+
     def _get_evaluation_rules(self):
         try:
             # Check if evaluation_rules exists and is a dictionary
@@ -191,24 +360,61 @@ class DocumentEvaluator:
         """Initialize empty stage results structure"""
         return {1: {}, 2: {}, 3: {}}
 
-    def _get_base_instructions(self) -> str:
-        """Get base system instructions with document to be evaluated content"""
-        base_instruction = next(
+    def _reset_stage_results(self) -> None:
+        """Start a fresh stage results structure and drop the memoized combined evaluation"""
+        self.stage_results = self._init_stage_results()
+        self._combined_evaluation = None
+
+    def _set_stage_result(self, stage: int, rule_name: str, result: Any) -> None:
+        """
+        Write a stage result and invalidate the memoized combined evaluation.
+
+        All writes to stage_results should go through this method (or
+        _add_to_cannot_evaluate) so get_combined_evaluation stays current.
+        """
+        self.stage_results[stage][rule_name] = result
+        self._combined_evaluation = None
+
+    def _get_evaluation_fingerprint(self) -> str:
+        """Hash of the rulebook, steps and default model, identifying what an export was evaluated with"""
+        return RuleResultCache.hash_text(json.dumps(
+            [self.evaluation_rules, self.evaluation_steps, self.DEFAULT_MODEL],
+            sort_keys=True,
+            ensure_ascii=True,
+            default=str
+        ))
+
+    def _get_base_instruction_text(self) -> str:
+        """Get the base system instruction from the evaluation steps"""
+        return next(
             (step_info.get('Instruction', '') 
              for step_name, step_info in self.evaluation_steps.items()
              if step_info.get('Type') == 'System Instruction' and 
              step_info.get('Stage') == 0),
             ""
         )
+
+    def _get_system_prompt_segments(self) -> List[str]:
+        """
+        System prompt split into segments, most stable first.
+
+        Every call for a document sends the same system prompt, so providers can
+        serve it from their prompt cache: the instructions (and rulebook) are the
+        same for every document, and only the last segment, with the date and the
+        document text, changes between documents.
+
+        Returns:
+            Segments that joined together make the system prompt
+        """
+        base_instruction = self._get_base_instruction_text()
         
         if not base_instruction:
             raise ValueError("System instructions not found in evaluation steps")
+
+        if not self.document_text:
+            raise ValueError("Document to be evaluated text must be loaded before getting system instructions")
         
-        todays_date = date.today().strftime("%Y-%m-%d")
-        
-        system_instructions = (
-            "===================================================================================================\n"
-            f"\nTODAY'S DATE: {todays_date}\n"
+        segments = [(
             "===================================================================================================\n"
             "BASE SYSTEM INSTRUCTIONS\n"
             "===================================================================================================\n"
@@ -216,34 +422,168 @@ class DocumentEvaluator:
             "===================================================================================================\n"
             f"OUTPUT ENCODING: ISO-8859-1\n"
             "===================================================================================================\n"
-        )
+        )]
 
-        if self.document_text:
-            system_instructions = (
-                f"{system_instructions}\n"
-                "\n===================================================================================================\n"
-                "DOCUMENT TO BE EVALUATED TEXT\n"
-                "===================================================================================================\n"
-                f"{self.document_text}\n"
-                "===================================================================================================\n"
-                "END OF DOCUMENT TO BE EVALUATED TEXT\n"
-                "===================================================================================================\n"
-            )
-        else:
-            raise ValueError("Document to be evaluated text must be loaded before getting system instructions")
+        if self.rulebook_in_prefix:
+            segments.append(self._get_rulebook_text())
+
+        todays_date = date.today().strftime("%Y-%m-%d")
+
+        segments.append(
+            f"\nTODAY'S DATE: {todays_date}\n"
+            "\n===================================================================================================\n"
+            "DOCUMENT TO BE EVALUATED TEXT\n"
+            "===================================================================================================\n"
+            f"{self.document_text}\n"
+            "===================================================================================================\n"
+            "END OF DOCUMENT TO BE EVALUATED TEXT\n"
+            "===================================================================================================\n"
+        )
             
-        return system_instructions
+        return segments
 
-    def _get_ai(self, system_instructions: str = None) -> AI:
+    def _get_base_instructions(self) -> str:
+        """Get base system instructions with document to be evaluated content"""
+        return ''.join(self._get_system_prompt_segments())
+
+    def _get_rulebook_text(self) -> str:
+        """Definitions of all evaluation rules, for the system prompt"""
+        formatter = FieldFormatter()
+        lines = [
+            "\n===================================================================================================",
+            "RULEBOOK: ATTRIBUTE DEFINITIONS",
+            "==================================================================================================="
+        ]
+
+        for rule_name, rule in self.evaluation_rules.items():
+            if rule.get('Type') == 'System Instruction':
+                continue
+            lines.extend(self._format_rule_definition(rule_name, rule, formatter))
+
+        lines.append("===================================================================================================\n")
+        return '\n'.join(lines)
+
+    def _get_ai(self, system_instructions: str = None, system_instruction_segments: Optional[List[str]] = None) -> AI:
         """Initialize the AI client"""
         azure_client = FFAzureOpenAI(config={
             "system_instructions": system_instructions,
+            "system_instruction_segments": system_instruction_segments,
             "temperature": 0.5,
             "infer_o1": True,
             "max_tokens": 16384
         })
         return AI(azure_client)
 
+    def _fork_llm(self) -> AI:
+        """Conversation handle for one concurrent task, sharing the client and recorded history"""
+        if self.llm is None:
+            self._init_llm()
+        return self.llm.fork()
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Rough token estimate for rate limiting"""
+        return len(text or '') // self.CHARS_PER_TOKEN
+
+    def _get_rate_limiter(self, model: str) -> RateLimiter:
+        """Shared rate limiter for a model"""
+        limits = self.rate_limits.get(model, self.rate_limits['default'])
+        return get_rate_limiter(
+            model,
+            requests_per_minute=limits['requests_per_minute'],
+            tokens_per_minute=limits['tokens_per_minute']
+        )
+
+    def _get_circuit_breaker(self, model: str) -> CircuitBreaker:
+        """Shared circuit breaker and retry budget for a model"""
+        return get_circuit_breaker(model, **self.circuit_breaker_settings)
+
+    def _estimate_call_tokens(self, prompt: str) -> int:
+        """Estimated tokens one call with this prompt uses, including instructions and output"""
+        return self.system_instruction_tokens + self._estimate_tokens(prompt) + self.EXPECTED_OUTPUT_TOKENS
+
+    def _acquire_rate_limit(self, model: str, prompt: str) -> float:
+        """Wait until the model's shared quota can take this call"""
+        waited = self._get_rate_limiter(model).acquire(self._estimate_call_tokens(prompt))
+        if waited:
+            logger.info(f"Waited {waited:.2f}s for {model} rate limit")
+        return waited
+
+    def _generate_response(self, llm: AI, prompt: str, model: str, prompt_names: List[str], **kwargs) -> str:
+        """
+        Send one prompt once the model's circuit breaker admits it and after waiting for the
+        rate limit, recording the outcome in the breaker and the call in the telemetry.
+        Only service errors (see is_service_error) count as failures in the breaker.
+
+        Args:
+            llm: Conversation to send the prompt on
+            prompt: Prompt to send
+            model: Model to use
+            prompt_names: Rule names the prompt covers
+            **kwargs: Passed on to llm.generate_response
+
+        Returns:
+            Raw response text
+        """
+        breaker = self._get_circuit_breaker(model)
+        is_probe = breaker.acquire()
+        rate_limit_wait = self._acquire_rate_limit(model, prompt)
+        started = time.monotonic()
+        error = None
+
+        try:
+            response = llm.generate_response(prompt=prompt, model=model, **kwargs)
+            breaker.record_success(is_probe)
+            return response
+        except Exception as e:
+            error = str(e)
+            if is_service_error(e):
+                breaker.record_failure(is_probe)
+            else:
+                # The service answered; a response that cannot be used says nothing about its health
+                breaker.release(is_probe)
+            raise
+        except BaseException:
+            breaker.release(is_probe)
+            raise
+        finally:
+            self._record_call(llm, model, prompt_names, time.monotonic() - started, rate_limit_wait, error)
+
+    def _record_call(self, llm: AI, model: str, prompt_names: List[str], latency: float,
+                     rate_limit_wait: float, error: Optional[str]) -> None:
+        """Record a call attempt, with the usage the API reported for it, in the telemetry"""
+        self.telemetry.record_call(
+            document=self.current_document_path,
+            prompt_names=prompt_names,
+            model=model,
+            usage=llm.get_last_usage(),
+            latency=latency,
+            rate_limit_wait=rate_limit_wait,
+            error=error
+        )
+
+    def _record_backoff(self, model: str, prompt_names: List[str], details: Dict[str, Any]) -> None:
+        """
+        backoff on_backoff handler: pay for the next attempt from the model's retry budget
+        and record the wait before it.
+
+        Raises:
+            RetryBudgetExhausted: If the budget is spent or the circuit is not closed, so
+                the retry is dropped; the error that triggered it is chained as its __cause__
+        """
+        if not self._get_circuit_breaker(model).try_spend_retry():
+            logger.warning(f"Not retrying {', '.join(prompt_names)}: retry budget for {model} is spent "
+                           f"or its circuit is open")
+            raise RetryBudgetExhausted(f"Retry budget for {model} exhausted") from details.get('exception')
+
+        self.telemetry.record_backoff(self.current_document_path, prompt_names, details.get('wait') or 0.0)
+
+    def _should_fall_back(self, model: str, error: Optional[Exception] = None) -> bool:
+        """Whether a failed batch may be retried rule by rule; not while the model's circuit is open"""
+        if isinstance(error, CircuitOpenError) or self._get_circuit_breaker(model).state != CircuitBreaker.CLOSED:
+            logger.warning(f"Skipping individual fallback: circuit for {model} is not closed")
+            return False
+        return True
+
     def _sort_rules_by_stage_and_order(self) -> List[Tuple[str, Dict]]:
         """Sort evaluation rules by stage and order"""
         rules_with_metadata = [
@@ -270,14 +610,114 @@ class DocumentEvaluator:
             logger.warning(f"Invalid stage value in rule, defaulting to 1: {str(e)}")
             return 1
 
+    def _get_rule_position(self, rule: Dict) -> Tuple[int, int]:
+        """Get the (Stage, Order) position of a rule"""
+        try:
+            order = int(rule.get('Order', '1'))
+        except (TypeError, ValueError):
+            order = 1
+        return (self._get_rule_stage(rule), order)
+
+    def _get_hist_handling(self, rule: Dict) -> Optional[str]:
+        """The rule's Hist Handling mode (see BATCHABLE_HIST_HANDLING), or None if it continues the conversation"""
+        hist_handling = rule.get('Hist Handling', []) or []
+        if isinstance(hist_handling, str):
+            hist_handling = [hist_handling]
+        return next((mode for mode in self.BATCHABLE_HIST_HANDLING if mode in hist_handling), None)
+
+    def _is_batchable(self, rule: Dict) -> bool:
+        """Whether the rule can be evaluated in a batch, apart from any conversation"""
+        return self._get_hist_handling(rule) is not None
+
+    def _get_rule_history(self, rule: Dict) -> List[str]:
+        """Rules whose results are sent as history with the rule; none for stateless rules"""
+        if self._get_hist_handling(rule) == 'stateless':
+            return []
+        return list(rule.get('Data Dependency', []) or [])
+
+    def _get_rule_prerequisites(self, rules: List[Tuple[str, Dict]]) -> Set[str]:
+        """
+        Get the rules that must have results before the given rules can run.
+
+        Only Data Dependency entries naming a rule positioned earlier (by Stage,
+        then Order) count as prerequisites. Edges therefore always point
+        backwards, which keeps the graph acyclic even when rules reference each
+        other.
+        """
+        rule_names = {rule_name for rule_name, _ in rules}
+        prerequisites = set()
+
+        for rule_name, rule in rules:
+            position = self._get_rule_position(rule)
+            for dependency in self._get_rule_history(rule):
+                dependency_rule = self.evaluation_rules.get(dependency)
+                if dependency_rule is None or dependency in rule_names:
+                    continue
+
+                if self._get_rule_position(dependency_rule) < position:
+                    prerequisites.add(dependency)
+                else:
+                    logger.debug(f"Ignoring dependency of {rule_name} on {dependency}: "
+                                 f"not positioned before it")
+
+        return prerequisites
+
+    def _get_batch_token_budget(self, model: str) -> Dict[str, int]:
+        """Get the per-call token budget for a model"""
+        return self.BATCH_TOKEN_BUDGETS.get(model, self.BATCH_TOKEN_BUDGETS['default'])
+
+    def _estimate_rule_prompt_tokens(self, rule_name: str, rule: Dict) -> int:
+        """Estimate the prompt tokens a rule adds to a batch prompt"""
+        prompt, _ = self._prepare_batch_prompt([(rule_name, rule)])
+        return self._estimate_tokens(prompt)
+
+    def _pack_rules_by_token_budget(self, rules: List[Tuple[str, Dict]], model: str) -> List[List[Tuple[str, Dict]]]:
+        """
+        Pack rules into batches that fit the model's prompt and output budgets.
+
+        Rules are placed, in order, into the first batch with room left; a rule
+        too large for any batch, or one that chronically breaks batches, is
+        evaluated in a batch of its own.
+        """
+        budget = self._get_batch_token_budget(model)
+        batches = []
+        alone = []
+
+        for rule_name, rule in rules:
+            if self.size_estimator.breaks_batches(rule_name):
+                alone.append([(rule_name, rule)])
+                continue
+
+            prompt_tokens = self._estimate_rule_prompt_tokens(rule_name, rule)
+            output_tokens = self.size_estimator.estimate_output_tokens(rule_name, rule)
+
+            for batch in batches:
+                if (len(batch['rules']) < self.MAX_BATCH_SIZE
+                        and batch['prompt_tokens'] + prompt_tokens <= budget['max_prompt_tokens']
+                        and batch['output_tokens'] + output_tokens <= budget['max_output_tokens']):
+                    break
+            else:
+                batch = {'rules': [], 'prompt_tokens': 0, 'output_tokens': 0}
+                batches.append(batch)
+
+            batch['rules'].append((rule_name, rule))
+            batch['prompt_tokens'] += prompt_tokens
+            batch['output_tokens'] += output_tokens
+
+        for batch in batches:
+            logger.debug(f"Packed {len(batch['rules'])} rules for {model}: "
+                         f"~{batch['prompt_tokens']} prompt / ~{batch['output_tokens']} output tokens")
+
+        if alone:
+            logger.info(f"Batching {', '.join(batch[0][0] for batch in alone)} alone: they have repeatedly broken batches")
+
+        return [batch['rules'] for batch in batches] + alone
+
     def _group_rules_for_batching(self, rules: List[Tuple[str, Dict]]) -> List[List[Tuple[str, Dict]]]:
         """Group rules that can be batched together"""
         logger.debug(f"Grouping rules for batching: {rules}")
         
-        batchable_rules = [
-            (name, rule) for name, rule in rules
-            if "pre_clear" in rule.get('Hist Handling', [])
-        ]
+        batchable_rules = [(name, rule) for name, rule in rules if self._is_batchable(rule)]
         
         def get_group_key(rule_tuple):
             return (
@@ -289,16 +729,22 @@ class DocumentEvaluator:
         batches = []
         
         for (model, stage), group in groupby(sorted_rules, key=get_group_key):
-            group_list = list(group)
-            for i in range(0, len(group_list), self.BATCH_SIZE):
-                batch = group_list[i:i + self.BATCH_SIZE]
-                batches.append(batch)
+            batches.extend(self._pack_rules_by_token_budget(list(group), model))
         
         logger.debug(f"Batches: {batches}")
         return batches
 
-    def _evaluate_batch(self, batch: List[Tuple[str, Dict]], model: str) -> Dict[str, Any]:
-        """Evaluate a batch of rules together"""
+    def _evaluate_batch(self, batch: List[Tuple[str, Dict]], model: str, llm: Optional[AI] = None,
+                        bisected: bool = False) -> Dict[str, Any]:
+        """
+        Evaluate a batch of rules together, on `llm` if given, otherwise the evaluator's conversation
+
+        Args:
+            batch: Rules to evaluate
+            model: Model to use
+            llm: Conversation to use
+            bisected: Whether the batch is half of a failed batch being bisected
+        """
         logger.info(f"Evaluating batch with {len(batch)} rules")
 
         # create a tuple with the rule names -- we'll use this as the prompt_name
@@ -307,8 +753,12 @@ class DocumentEvaluator:
             rules.append(rule_name)
         rules = tuple(rules)
 
+        llm = llm or self.llm
+        streamed = {}
+        rule_names = [rule_name for rule_name, _ in batch]
+
         try:
-            self.llm.clear_conversation()
+            llm.clear_conversation()
             combined_prompt, history_items = self._prepare_batch_prompt(batch)
             
             @backoff.on_exception(
@@ -316,15 +766,19 @@ class DocumentEvaluator:
                 Exception,
                 max_tries=3,
                 max_time=300,
-                giveup=lambda e: not isinstance(e, Exception) or not str(e).startswith('429')
+                giveup=lambda e: not is_rate_limit_error(e),
+                on_backoff=lambda details: self._record_backoff(model, rule_names, details)
             )
             def execute_batch():
-                response = self.llm.generate_response(
-                    prompt=combined_prompt,
+                response = self._generate_response(
+                    llm,
+                    combined_prompt,
+                    model,
+                    rule_names,
                     prompt_name=rules,
-                    model=model,
                     history=history_items,
-                    dependencies=self._get_all_data_dependencies()
+                    dependencies=self._get_all_data_dependencies(),
+                    stream_callback=self._stream_batch_results(batch, model, llm, streamed)
                 )
                 
                 # Add validation for empty response
@@ -334,68 +788,267 @@ class DocumentEvaluator:
                     
                 return response
             
+            response = None
+            blame = False
             try:
                 response = execute_batch()
                 results = self._process_evaluation_response(response)
-                
-                for rule_name, rule in batch:
-                    if rule_name in results:
-                        stage = self._get_rule_stage(rule)
-                        self.stage_results[stage][rule_name] = results[rule_name]
-                    else:
-                        self._add_to_cannot_evaluate(
-                            rule_name, 
-                            rule,
-                            "No result in batch response"
-                        )
-                
-                time.sleep(5)
-                return results
-                
+
             except ValueError as ve:
-                # Handle empty response specifically
+                # Handle empty or unparseable (e.g. cut off) responses specifically
                 logger.error(f"Batch execution failed: {str(ve)}")
-                for rule_name, rule in batch:
-                    self._add_to_cannot_evaluate(
-                        rule_name,
-                        rule,
-                        f"Failed to get valid response: {str(ve)}"
-                    )
-                # Try evaluating rules individually as fallback
-                return self._evaluate_batch_fallback(batch, model)
-                
+                self._salvage_response_text(batch, response, streamed)
+                failure, reason = ve, f"Failed to get valid response: {str(ve)}"
+                # The answer broke the batch, so a rule bisection isolated is to blame
+                blame = bisected
+
+            else:
+                missing = self._record_batch_results(batch, results)
+                if not missing:
+                    return results
+
+                # Ask again for just the attributes the response left out
+                return {**results, **self._recover_failed_batch(missing, {}, model, llm, "No result in batch response",
+                                                                blame=bisected)}
+
         except Exception as e:
+            # Provider errors (timeouts, 5xx, an open circuit) are not the rules' fault
             logger.error(f"Error evaluating batch: {str(e)}", exc_info=True)
-            for rule_name, rule in batch:
-                self._add_to_cannot_evaluate(
-                    rule_name,
-                    rule,
-                    f"Batch evaluation failed: {str(e)}"
-                )
-            # Try fallback to individual evaluation
-            return self._evaluate_batch_fallback(batch, model)
+            failure, reason, blame = e, f"Batch evaluation failed: {str(e)}", False
 
-    def _evaluate_batch_fallback(self, batch: List[Tuple[str, Dict]], model: str) -> Dict[str, Any]:
-        """Fallback method to evaluate batch rules individually"""
-        logger.info("Attempting individual evaluation fallback for failed batch")
-        results = {}
-        
+        return self._recover_failed_batch(batch, streamed, model, llm, reason, failure, blame)
+
+    def _recover_failed_batch(self, batch: List[Tuple[str, Dict]], streamed: Dict[str, Any], model: str,
+                              llm: AI, reason: str, error: Optional[Exception] = None,
+                              blame: bool = False) -> Dict[str, Any]:
+        """
+        Keep what a failed batch produced and recover the rest by bisection
+
+        Args:
+            batch: Rules of the failed batch
+            streamed: Results salvaged from its response
+            model: Model the batch was evaluated with
+            llm: Conversation the batch ran on
+            reason: Why the batch failed, recorded for rules that cannot be recovered
+            error: Exception the batch failed with, if any
+            blame: Whether the rules' answers broke the batch (an unusable response or left-out
+                attributes) and it came from bisection, so a single rule left is recorded as breaking batches
+
+        Returns:
+            Salvaged and recovered results
+        """
+        remaining = self._get_rules_to_recover(batch, streamed, model, reason, error, blame)
+        if not remaining:
+            return streamed
+        return {**streamed, **self._evaluate_batch_fallback(remaining, model, llm)}
+
+    def _get_rules_to_recover(self, batch: List[Tuple[str, Dict]], streamed: Dict[str, Any], model: str,
+                              reason: str, error: Optional[Exception] = None,
+                              blame: bool = False) -> List[Tuple[str, Dict]]:
+        """Record what a failed batch salvaged; returns the rules still to recover, if recovery may run"""
+        remaining = self._salvage_streamed_results(batch, streamed)
+
+        # Bisection has narrowed the failure down to this rule
+        if blame and len(remaining) == 1:
+            self.size_estimator.record_batch_outcome([remaining[0][0]], failed=True)
+
+        if remaining and not self._should_fall_back(model, error):
+            for rule_name, rule in remaining:
+                self._add_to_cannot_evaluate(rule_name, rule, reason)
+            return []
+        return remaining
+
+    def _salvage_response_text(self, batch: List[Tuple[str, Dict]], response: Optional[str],
+                               streamed: Dict[str, Any]) -> None:
+        """Add the complete rule results in an unparseable (e.g. cut off) response to `streamed`"""
+        if not response:
+            return
+
+        rules = dict(batch)
+        for rule_name, value in IncrementalJSONParser().feed(response):
+            if rule_name in rules and rule_name not in streamed:
+                streamed[rule_name] = self._normalize_result_fields({rule_name: value})[rule_name]
+
+    def _stream_batch_results(self, batch: List[Tuple[str, Dict]], model: str, llm: AI,
+                              streamed: Dict[str, Any]) -> Optional[Callable[[str], None]]:
+        """
+        Stream callback that publishes each rule result of a batch response as soon as it is complete.
+
+        A published result goes into the stage results and the shared LLM history,
+        and rules waiting on it are released by the scheduler before the rest of
+        the batch arrives. Results are also collected in `streamed` so they can be
+        salvaged if the response is cut off.
+
+        Args:
+            batch: Rules in the batch
+            model: Model the batch is evaluated with
+            llm: Conversation the batch runs on
+            streamed: Dict that collects the published results
+
+        Returns:
+            The callback, or None if streaming is off
+        """
+        if not self.stream_responses:
+            return None
+
+        rules = dict(batch)
+        parser = IncrementalJSONParser()
+
+        def on_chunk(chunk: str) -> None:
+            for rule_name, value in parser.feed(chunk):
+                rule = rules.get(rule_name)
+                if rule is None or rule_name in streamed:
+                    continue
+
+                result = self._normalize_result_fields({rule_name: value})[rule_name]
+                streamed[rule_name] = result
+                self._set_stage_result(self._get_rule_stage(rule), rule_name, result)
+                llm.add_prompt_attr_interaction(prompt_name=rule_name, response=result, model=model)
+
+                if self.scheduler is not None:
+                    self.scheduler.mark_done([rule_name])
+                logger.debug(f"Published streamed result for {rule_name}")
+
+        return on_chunk
+
+    def _salvage_streamed_results(self, batch: List[Tuple[str, Dict]], streamed: Dict[str, Any]) -> List[Tuple[str, Dict]]:
+        """Keep the results a failed batch streamed before it broke off; returns the rules still without a result"""
+        remaining = []
         for rule_name, rule in batch:
-            try:
-                # Add delay between individual evaluations
-                time.sleep(2)
-                rule_result = self._evaluate_single_rule(rule_name, rule, use_steps=False)
-                results.update(rule_result)
-            except Exception as e:
-                logger.error(f"Fallback evaluation failed for {rule_name}: {str(e)}")
-                self._add_to_cannot_evaluate(
-                    rule_name,
-                    rule,
-                    f"Fallback evaluation failed: {str(e)}"
-                )
-        
+            if rule_name in streamed:
+                self._record_rule_result(rule_name, rule, streamed[rule_name])
+            else:
+                remaining.append((rule_name, rule))
+
+        if streamed:
+            logger.info(f"Salvaged {len(batch) - len(remaining)} of {len(batch)} results from an incomplete batch response")
+        return remaining
+
+    def _record_batch_results(self, batch: List[Tuple[str, Dict]], results: Dict[str, Any]) -> List[Tuple[str, Dict]]:
+        """Record each rule's result from a batch response; returns the rules it left out"""
+        missing = []
+        for rule_name, rule in batch:
+            if rule_name in results:
+                self._record_rule_result(rule_name, rule, results[rule_name])
+            else:
+                missing.append((rule_name, rule))
+
+        self.size_estimator.record_batch_outcome(
+            [rule_name for rule_name, _ in batch if rule_name in results], failed=False
+        )
+        if missing:
+            logger.warning(f"Batch response left out {', '.join(rule_name for rule_name, _ in missing)}")
+        return missing
+
+    def _evaluate_batch_fallback(self, batch: List[Tuple[str, Dict]], model: str, llm: Optional[AI] = None) -> Dict[str, Any]:
+        """
+        Recover the rules of a failed batch by bisection
+
+        Each half is evaluated as a batch of its own, and a half that fails is
+        split again, so a rule that breaks batches is isolated in a few calls
+        while the rules around it still get batched. A single rule is evaluated
+        individually.
+        """
+        if len(batch) == 1:
+            return self._evaluate_isolated_rule(*batch[0], model=model, llm=llm)
+
+        middle = len(batch) // 2
+        logger.info(f"Bisecting failed batch of {len(batch)} rules into {middle} and {len(batch) - middle}")
+
+        results = {}
+        for half in (batch[:middle], batch[middle:]):
+            results.update(self._evaluate_batch(half, model, llm=llm, bisected=True))
         return results
 
+    def _evaluate_isolated_rule(self, rule_name: str, rule: Dict[str, Any], model: str,
+                                llm: Optional[AI] = None) -> Dict[str, Any]:
+        """Evaluate a rule bisection isolated from a failed batch on its own"""
+        try:
+            return self._evaluate_single_rule(rule_name, rule, use_steps=False, llm=llm)
+        except Exception as e:
+            logger.error(f"Fallback evaluation failed for {rule_name}: {str(e)}")
+            self._add_to_cannot_evaluate(
+                rule_name,
+                rule,
+                f"Fallback evaluation failed: {str(e)}"
+            )
+            return {}
+
+    def _get_rule_cache_key(self, rule_name: str, rule: Dict[str, Any]) -> str:
+        """Cache key for a rule evaluated against the current document"""
+        return RuleResultCache.make_key(
+            document_hash=self.document_hash,
+            rule_name=rule_name,
+            rule=rule,
+            model=rule.get('Model', [self.DEFAULT_MODEL])[0],
+            base_instructions=self._get_base_instruction_text()
+        )
+
+    def _record_rule_result(self, rule_name: str, rule: Dict[str, Any], result: Any) -> None:
+        """Store a rule result in the stage results, the checkpoint journal and the result cache"""
+        stage = self._get_rule_stage(rule)
+        self._set_stage_result(stage, rule_name, result)
+        self.size_estimator.record_output(rule_name, result)
+
+        if self.result_cache is None and self.checkpoint is None:
+            return
+
+        self._save_rule_result(self.document_key, rule_name, self._get_rule_cache_key(rule_name, rule), stage, result)
+
+    def _save_rule_result(self, document_key: Optional[str], rule_name: str, cache_key: str, stage: int,
+                          result: Any) -> None:
+        """Write a rule result to the checkpoint journal and the result cache"""
+        if self.checkpoint is not None and document_key:
+            self.checkpoint.record_rule(document_key, rule_name, cache_key, stage, result)
+        if self.result_cache is not None:
+            self.result_cache.set(cache_key, rule_name, result)
+
+    def _get_saved_result(self, rule_name: str, rule: Dict[str, Any]) -> Optional[Any]:
+        """Get a rule result from the checkpoint journal or the result cache"""
+        cache_key = self._get_rule_cache_key(rule_name, rule)
+
+        if self.checkpoint is not None and self.document_key:
+            saved = self.checkpoint.get_rule(self.document_key, rule_name, cache_key)
+            if saved is not None:
+                return saved
+
+        if self.result_cache is not None:
+            return self.result_cache.get(cache_key)
+        return None
+
+    def _apply_cached_results(self, rules: List[Tuple[str, Dict]]) -> List[Tuple[str, Dict]]:
+        """
+        Fill stage results from the checkpoint journal and the result cache.
+
+        Saved results are also recorded in the LLM history so rules that depend
+        on them still receive them as context.
+
+        Args:
+            rules: Rules to look up
+
+        Returns:
+            The rules that had no saved result and still need evaluation
+        """
+        if self.result_cache is None and self.checkpoint is None:
+            return rules
+
+        remaining = []
+        for rule_name, rule in rules:
+            cached = self._get_saved_result(rule_name, rule)
+            if cached is None:
+                remaining.append((rule_name, rule))
+                continue
+
+            self._set_stage_result(self._get_rule_stage(rule), rule_name, cached)
+            self.llm.add_prompt_attr_interaction(
+                prompt_name=rule_name,
+                response=cached,
+                model=rule.get('Model', [self.DEFAULT_MODEL])[0]
+            )
+
+        logger.info(f"Using saved results for {len(rules) - len(remaining)} of {len(rules)} rules")
+        return remaining
+
     def _prepare_batch_prompt(self, batch: List[Tuple[str, Dict]]) -> Tuple[str, List]:
         """
         Prepare a combined prompt for batch evaluation with improved formatting.
@@ -407,96 +1060,102 @@ class DocumentEvaluator:
             Tuple[str, list]: Formatted prompt string and data dependencies
         """
         formatter = FieldFormatter()
-        prompt = ["Please evaluate the following attributes together:\n"]
         data_dependencies = []
-        
-        for rule_name, rule in batch:
-            # Add header with proper spacing
-            prompt.append(f"\n=========================== {rule_name} ===========================\n")
-            
-            # Core fields in consistent order
-            core_fields = [
-                ("Attribute Name", rule_name),
-                ("Type", rule.get('Type')),
-                ("Sub_Type", rule.get('Sub_Type')),
-                ("Value Type", rule.get('value_type')),
-                ("Weight", rule.get('Weight')),
-                ("is_contribute_rating_overall", rule.get('is_contribute_rating_overall')),
-                ("Description", rule.get('Description'))
-            ]
-            
-            # Format each core field
-            for field_name, value in core_fields:
-                formatted = formatter.format_field(field_name, value)
-                if formatted:
-                    prompt.append(formatted)
-
-            prompt.append('')
-
-            # Handle Specification separately
-            if 'Specification' in rule:
-                spec = rule['Specification']
-                formatted = formatter.format_field("Specification", spec)
-                if formatted:
-                    prompt.append(formatted)
-            
-            # Handle Data Dependencies
-            deps = rule.get('Data Dependency', [])
-            if deps:
-                formatted = formatter.format_field("Data Dependencies", deps)
-                if formatted:
-                    prompt.append(formatted)
-                data_dependencies.extend(deps)
-                
-            prompt.append('')  # Add blank line between attributes
+
+        if self.rulebook_in_prefix:
+            prompt = ["Please evaluate the following attributes together, as defined in the RULEBOOK:\n"]
+            prompt.extend(f"- {rule_name}" for rule_name, _ in batch)
+        else:
+            prompt = ["Please evaluate the following attributes together:\n"]
+            for rule_name, rule in batch:
+                prompt.extend(self._format_rule_definition(rule_name, rule, formatter))
+
+        for _, rule in batch:
+            data_dependencies.extend(self._get_rule_history(rule))
         
         prompt.append("\nPlease provide your evaluation in JSON format with results for each attribute.")
         
         return '\n'.join(prompt), data_dependencies
 
+    def _format_rule_definition(self, rule_name: str, rule: Dict[str, Any], formatter: FieldFormatter) -> List[str]:
+        """Prompt lines describing one rule"""
+        # Add header with proper spacing
+        lines = [f"\n=========================== {rule_name} ===========================\n"]
+        
+        # Core fields in consistent order
+        core_fields = [
+            ("Attribute Name", rule_name),
+            ("Type", rule.get('Type')),
+            ("Sub_Type", rule.get('Sub_Type')),
+            ("Value Type", rule.get('value_type')),
+            ("Weight", rule.get('Weight')),
+            ("is_contribute_rating_overall", rule.get('is_contribute_rating_overall')),
+            ("Description", rule.get('Description'))
+        ]
+        
+        # Format each core field
+        for field_name, value in core_fields:
+            formatted = formatter.format_field(field_name, value)
+            if formatted:
+                lines.append(formatted)
+
+        lines.append('')
+
+        # Handle Specification separately
+        if 'Specification' in rule:
+            spec = rule['Specification']
+            formatted = formatter.format_field("Specification", spec)
+            if formatted:
+                lines.append(formatted)
+        
+        # Handle Data Dependencies
+        deps = self._get_rule_history(rule)
+        if deps:
+            formatted = formatter.format_field("Data Dependencies", deps)
+            if formatted:
+                lines.append(formatted)
+            
+        lines.append('')  # Add blank line between attributes
+        return lines
+
     @backoff.on_exception(
         backoff.expo,
         Exception,
         max_tries=5,
-        max_time=300
+        max_time=300,
+        giveup=_is_circuit_open,
+        on_backoff=_record_rule_backoff
     )
-    def _evaluate_single_rule(self, rule_name: str, rule: Dict[str, Any], use_steps: bool = True) -> Dict:
-        """Evaluate a single rule"""
+    def _evaluate_single_rule(self, rule_name: str, rule: Dict[str, Any], use_steps: bool = True,
+                              llm: Optional[AI] = None) -> Dict:
+        """Evaluate a single rule, on `llm` if given, otherwise the evaluator's conversation"""
         logger.debug(f"Evaluating rule: {rule_name}")
         logger.debug(f"Rule: {rule}")
         logger.debug(f"Use steps: {use_steps}")
         
         if self.llm is None:
             self._init_llm()
+        llm = llm or self.llm
 
         # get Data Dependency (history) for the Rule
-        history_items = rule.get('Data Dependency', [])
+        history_items = self._get_rule_history(rule)
         logger.debug(f"history_items: {history_items}")
             
-        if "pre_clear" in rule.get('Hist Handling', []):
-            self.llm.clear_conversation()
+        if self._is_batchable(rule):
+            llm.clear_conversation()
         
         model = rule.get('Model', [self.DEFAULT_MODEL])[0]
-        
-        if use_steps:
-            matching_step = next(
-                (step for step in self.evaluation_steps.values()
-                 if step.get('Type') == 'Prompt' and 
-                 step.get('Stage') == rule.get('Stage', 1) and
-                 step.get('Type') == rule.get('Type')),
-                None
-            )
-            
-            prompt = matching_step.get('Instruction', '') if matching_step else self._prepare_single_rule_prompt(rule_name, rule)
-        else:
-            prompt = self._prepare_single_rule_prompt(rule_name, rule)
+        prompt = self._get_single_rule_prompt(rule_name, rule, use_steps)
             
         try:
-            response = self.llm.generate_response(prompt, model=model, prompt_name=rule_name, history=history_items)
+            response = self._generate_response(llm, prompt, model, [rule_name], prompt_name=rule_name,
+                                               history=history_items)
             results = self._process_evaluation_response(response)
             
-            stage = self._get_rule_stage(rule)
-            self.stage_results[stage][rule_name] = results.get(rule_name, {})
+            if rule_name in results:
+                self._record_rule_result(rule_name, rule, results[rule_name])
+            else:
+                self._set_stage_result(self._get_rule_stage(rule), rule_name, {})
             
             return results
             
@@ -505,8 +1164,29 @@ class DocumentEvaluator:
             self._add_to_cannot_evaluate(rule_name, rule, str(e))
             raise
 
+    def _get_single_rule_prompt(self, rule_name: str, rule: Dict[str, Any], use_steps: bool = True) -> str:
+        """Prompt for a single rule: the matching evaluation step's instruction if there is one"""
+        if use_steps:
+            matching_step = next(
+                (step for step in self.evaluation_steps.values()
+                 if step.get('Type') == 'Prompt' and 
+                 step.get('Stage') == rule.get('Stage', 1) and
+                 step.get('Type') == rule.get('Type')),
+                None
+            )
+            
+            return matching_step.get('Instruction', '') if matching_step else self._prepare_single_rule_prompt(rule_name, rule)
+        return self._prepare_single_rule_prompt(rule_name, rule)
+
     def _prepare_single_rule_prompt(self, rule_name: str, rule: Dict[str, Any]) -> str:
         """Prepare evaluation prompt for a single rule"""
+        if self.rulebook_in_prefix:
+            return (
+                f"Please evaluate the following attribute, as defined in the RULEBOOK:\n\n"
+                f"Attribute Name: {rule_name}\n"
+                "\nPlease provide your evaluation in JSON format."
+            )
+
         cleaned_rule = InputTextCleaner.clean_dict_values(rule)
 
         prompt = (
@@ -526,6 +1206,10 @@ class DocumentEvaluator:
     def _process_evaluation_response(self, response: str) -> Dict[str, Any]:
         """
         Process and validate the evaluation response with comprehensive character cleaning.
+
+        The JSON object is located and parsed in one pass and only its strings are
+        cleaned; responses it cannot find an object in go through the slower
+        whole-text cleaning path.
         """
         try:
             # Log the raw response
@@ -534,49 +1218,61 @@ class DocumentEvaluator:
             logger.debug(repr(response))
             logger.debug("=" * 80)
 
-            # Clean and extract JSON content
-            cleaned_text = OutputTextCleaner.clean_text(response)
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', cleaned_text, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(1)
-            else:
-                json_start = cleaned_text.find('{')
-                json_end = cleaned_text.rfind('}')
-                if json_start != -1 and json_end != -1:
-                    json_text = cleaned_text[json_start:json_end + 1]
-                else:
-                    logger.warning("No JSON content found in response")
-                    json_text = ''
-                    # raise ValueError("No JSON content found in response")
-
-            # Parse JSON using safe loader
-            results = safe_json_loads(json_text)
-            cleaned_results = OutputTextCleaner.clean_dict_values(results)
-
-            # Process and validate the structure
-            processed_results = {}
-            for field_name, field_value in cleaned_results.items():
-                rule = self.evaluation_rules.get(field_name, {})
-                
-                if not isinstance(field_value, dict) or 'type' not in field_value:
-                    processed_results[field_name] = {
-                        "type": rule.get('Type', 'Core'),
-                        "sub_type": rule.get('Sub_Type', 'None'),
-                        "value": field_value,
-                        "eval": f"Evaluated from {field_name}",
-                        "source": ["document"],
-                        "source_detail": ["Document content"]
-                    }
-                else:
-                    processed_results[field_name] = field_value
+            results = ResponseJSONExtractor.extract_object(response)
+            if results is None:
+                logger.debug("No JSON object found directly; cleaning the whole response")
+                results = self._extract_cleaned_response_json(response)
 
-            return processed_results
+            return self._normalize_result_fields(results)
 
         except Exception as e:
             logger.error(f"Error processing evaluation response: {str(e)}")
             logger.error(f"Raw response that caused error: {repr(response)}")
             raise
 
+    def _extract_cleaned_response_json(self, response: str) -> Dict[str, Any]:
+        """Clean the whole response text, then parse the fenced JSON or the outermost braces"""
+        # Clean and extract JSON content
+        cleaned_text = OutputTextCleaner.clean_text(response)
+        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', cleaned_text, re.DOTALL)
+        if json_match:
+            json_text = json_match.group(1)
+        else:
+            json_start = cleaned_text.find('{')
+            json_end = cleaned_text.rfind('}')
+            if json_start != -1 and json_end != -1:
+                json_text = cleaned_text[json_start:json_end + 1]
+            else:
+                logger.warning("No JSON content found in response")
+                json_text = ''
+                # raise ValueError("No JSON content found in response")
+
+        # Parse JSON using safe loader
+        return safe_json_loads(json_text)
+
+    def _normalize_result_fields(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Clean parsed rule results and wrap bare values in the standard result structure"""
+        cleaned_results = OutputTextCleaner.clean_json_strings(results)
+
+        # Process and validate the structure
+        processed_results = {}
+        for field_name, field_value in cleaned_results.items():
+            rule = self.evaluation_rules.get(field_name, {})
+            
+            if not isinstance(field_value, dict) or 'type' not in field_value:
+                processed_results[field_name] = {
+                    "type": rule.get('Type', 'Core'),
+                    "sub_type": rule.get('Sub_Type', 'None'),
+                    "value": field_value,
+                    "eval": f"Evaluated from {field_name}",
+                    "source": ["document"],
+                    "source_detail": ["Document content"]
+                }
+            else:
+                processed_results[field_name] = field_value
+
+        return processed_results
+
     def _add_to_cannot_evaluate(self, rule_name: str, rule: Dict, reason: str) -> None:
         """Add a rule to cannot evaluate list"""
         cannot_evaluate_item = {
@@ -591,6 +1287,7 @@ class DocumentEvaluator:
             self.stage_results[stage]['_meta_cant_be_evaluated_df'] = []
             
         self.stage_results[stage]['_meta_cant_be_evaluated_df'].append(cannot_evaluate_item)
+        self._combined_evaluation = None
         logger.warning(f"Rule {rule_name} cannot be evaluated: {reason}")
 
 
@@ -600,32 +1297,64 @@ class DocumentEvaluator:
         max_tries=3,
         max_time=300
     )
-    def load_document(self, document_path: str) -> bool:
-        """Load and index a document document"""
+    def load_document(self, document_path: str, documents: Optional[List[Document]] = None,
+                      content_hash: Optional[str] = None) -> bool:
+        """
+        Load a document; the vector index is built lazily unless build_index is set
+
+        Args:
+            document_path: Path of the document file
+            documents: Text already extracted from the file; extracted here if not given
+            content_hash: Hash of the file's bytes, if already computed (see _hash_document_file)
+
+        Returns:
+            True if the document was loaded
+        """
         try:
-            documents = SimpleDirectoryReader(input_files=[document_path]).load_data()
-            self.document_index = VectorStoreIndex.from_documents(documents)
-            self.document_text = "\n".join([doc.text for doc in documents])
-            self.current_document_path = document_path
+            if documents is None:
+                documents = self.text_extractor.extract(document_path, content_hash)
+            self._set_document(document_path, documents, content_hash)
+
+            if self.build_index:
+                self.document_index = VectorStoreIndex.from_documents(documents)
             
             # Initialize LLM if needed
             self._init_llm()
             
-            logger.info(f"Successfully loaded and indexed document from {document_path}")
+            logger.info(f"Successfully loaded document from {document_path}")
             return True
             
         except Exception as e:
             logger.error(f"Error loading document {document_path}: {str(e)}")
             return False
 
+    def _set_document(self, document_path: str, documents: List[Document], content_hash: Optional[str] = None) -> None:
+        """Make extracted documents the current document, without building an index or client"""
+        self.documents = documents
+        self.document_index = None
+        self.document_text = "\n".join([doc.text for doc in documents])
+        self.document_hash = RuleResultCache.hash_text(self.document_text)
+        self.current_document_path = document_path
+
+        if self.checkpoint is not None:
+            self.document_key = content_hash or DocumentTextCache.hash_file(document_path)
+
+    def _hash_document_file(self, file_path: Path) -> Optional[str]:
+        """Hash of a document file's bytes, its key in the checkpoint and text cache; None if neither is used"""
+        if self.checkpoint is None and self.text_cache is None:
+            return None
+        return DocumentTextCache.hash_file(str(file_path))
+
     def _init_llm(self) -> None:
         """Initialize the LLM client"""
         if not self.document_text:
             raise ValueError("Document text must be loaded before initializing LLM")
             
         if self.llm is None:
-            system_instructions = self._get_base_instructions()
-            self.llm = self._get_ai(system_instructions=system_instructions)
+            segments = self._get_system_prompt_segments()
+            system_instructions = ''.join(segments)
+            self.system_instruction_tokens = self._estimate_tokens(system_instructions)
+            self.llm = self._get_ai(system_instructions=system_instructions, system_instruction_segments=segments)
 
     def evaluate_document(self, use_steps: bool = True) -> Dict:
         """Perform full document evaluation using appropriate strategies"""
@@ -634,56 +1363,48 @@ class DocumentEvaluator:
         if not self.document_text:
             raise ValueError("No document has been loaded. Please load a document to be evaluated first.")
             
-        self.stage_results = self._init_stage_results()
+        self._reset_stage_results()
         
         if self.llm:
             self.llm.clear_conversation()
 
         try:
-            sorted_rules = self._sort_rules_by_stage_and_order()
-            
-            for stage in [1, 2, 3]:
-                stage_rules = [
-                    (name, rule) for name, rule in sorted_rules
-                    if self._get_rule_stage(rule) == stage
-                ]
-                
-                if not stage_rules:
-                    continue
-                    
-                # Determine which rules can be batched
-                batchable_rules = [
-                    (name, rule) for name, rule in stage_rules
-                    if "pre_clear" in rule.get('Hist Handling', [])
-                ]
-
-                # TODO: Looks like I need to add other Hist Handling values to make more rules batchable.
-                
-                non_batchable_rules = [
-                    (name, rule) for name, rule in stage_rules
-                    if (name, rule) not in batchable_rules
-                ]
-                
-                # Process batchable rules
-                if batchable_rules:
-                    batch_results = self.batch_strategy.process_rules(batchable_rules, stage)
-                    self._update_stage_results(batch_results, stage)
-                
-                # Process non-batchable rules
-                if non_batchable_rules:
-                    individual_results = self.individual_strategy.process_rules(non_batchable_rules, stage)
-                    self._update_stage_results(individual_results, stage)
-                
-                time.sleep(3)  # Delay between stages
+            # Rules and batches start as soon as their Data Dependency prerequisites
+            # have results instead of waiting for the whole previous stage
+            self.scheduler = self._create_scheduler()
+            self.scheduler.run(self._plan_evaluation_tasks())
+            self.size_estimator.save()
+            self._log_token_usage()
             
             return self.get_combined_evaluation()
             
         except Exception as e:
             logger.error(f"Error during document evaluation: {str(e)}", exc_info=True)
             raise
+        finally:
+            # Failed documents are summarized too, which also frees their totals
+            self.telemetry.record_document(self.current_document_path)
 
         #TODO: Publish history for debugging
 
+    def _create_scheduler(self) -> DependencyScheduler:
+        """Scheduler for one document's batches and individual rules"""
+        return DependencyScheduler(max_workers=self.max_rule_workers,
+                                   group_limits={'individual': self.max_individual_workers})
+
+    def _plan_evaluation_tasks(self) -> List[ScheduledTask]:
+        """Apply saved results and plan tasks for the rules still to evaluate"""
+        sorted_rules = self._apply_cached_results(self._sort_rules_by_stage_and_order())
+            
+        # Rules that don't continue the conversation can be batched
+        batchable_rules = [(name, rule) for name, rule in sorted_rules if self._is_batchable(rule)]
+        non_batchable_rules = [(name, rule) for name, rule in sorted_rules if not self._is_batchable(rule)]
+
+        return (
+            self.batch_strategy.plan_tasks(batchable_rules) +
+            self.individual_strategy.plan_tasks(non_batchable_rules)
+        )
+
     def _update_stage_results(self, results: Dict[str, Any], stage: int) -> None:
         """Update stage results with new evaluation results"""
         for rule_name, result in results.items():
@@ -691,7 +1412,7 @@ class DocumentEvaluator:
                 logger.error(f"Invalid stage {stage} for rule {rule_name}")
                 continue
                 
-            self.stage_results[stage][rule_name] = result
+            self._set_stage_result(stage, rule_name, result)
             logger.debug(f"Added result for {rule_name} to stage {stage}")
 
     def get_overall_score(self) -> float:
@@ -734,8 +1455,56 @@ class DocumentEvaluator:
         
         return final_score
 
+    def get_token_usage(self) -> Dict[str, Any]:
+        """
+        Token usage of the current document's evaluation calls.
+
+        Returns:
+            Call and token totals reported by the provider, with the share of
+            prompt tokens served from its prompt cache; empty if nothing was called
+        """
+        usage = self.llm.get_token_usage_stats() if self.llm else {}
+        if not usage:
+            return {}
+
+        prompt_tokens = usage.get('prompt_tokens', 0)
+        return {
+            **usage,
+            'cache_hit_rate': round(usage.get('cached_prompt_tokens', 0) / prompt_tokens, 4) if prompt_tokens else 0.0
+        }
+
+    def _log_token_usage(self) -> None:
+        """Log the document's token usage and prompt cache hit rate"""
+        usage = self.get_token_usage()
+        if not usage:
+            return
+
+        logger.info(f"Token usage for {self.current_document_path}: {usage.get('calls', 0)} calls, "
+                    f"{usage.get('prompt_tokens', 0)} prompt tokens "
+                    f"({usage['cache_hit_rate']:.1%} from prompt cache), "
+                    f"{usage.get('completion_tokens', 0)} completion tokens")
+
+    def _get_source_text_metadata(self) -> Dict[str, str]:
+        """The document text for the evaluation metadata, or its reference in the source text store"""
+        if self.source_text_store is None:
+            return {"source_txt": self.document_text}
+
+        content_hash = self.source_text_store.put(self.document_text, self.document_hash)
+        return {SourceTextStore.REFERENCE_KEY: content_hash}
+
     def get_combined_evaluation(self) -> Dict:
-        """Combine all stage results into a single evaluation result"""
+        """
+        Combine all stage results into a single evaluation result.
+
+        The result is memoized until the stage results change, so repeated
+        calls for the same evaluation return the same (shared) dictionary.
+        """
+        if self._combined_evaluation is None:
+            self._combined_evaluation = self._build_combined_evaluation()
+        return self._combined_evaluation
+
+    def _build_combined_evaluation(self) -> Dict:
+        """Build the combined evaluation from the current stage results"""
         try:
             overall_score = self.get_overall_score()
         except Exception as e:
@@ -780,7 +1549,9 @@ class DocumentEvaluator:
             "metadata": {
                 "evaluation_date": datetime.now().isoformat(),
                 "source_file": str(self.current_document_path),
-                "source_txt": self.document_text
+                **self._get_source_text_metadata(),
+                "token_usage": self.get_token_usage(),
+                **self._get_duplicate_metadata()
             },
             "overall_evaluation": {
                 "score": round(overall_score, 2),
@@ -810,64 +1581,364 @@ class DocumentEvaluator:
     def _reset_evaluator_state(self):
         """Fully reset all evaluator state between documents"""
         self.document_text = None
+        self.document_hash = None
+        self.document_key = None
+        self.documents = None
         self.document_index = None
         self.current_document_path = None
-        self.stage_results = self._init_stage_results()
+        self._reset_stage_results()
         
         self.llm = None
-        
-        # Clear any cached data dependencies
-        if hasattr(self, 'evaluation_rules'):
-            # Reset any accumulated history in rules
-            for rule in self.evaluation_rules.values():
-                if 'Data Dependency' in rule:
-                    rule['Data Dependency'] = []
+        self.system_instruction_tokens = 0
+        self.scheduler = None
+
+
+    def _create_worker(self) -> 'DocumentEvaluator':
+        """
+        Create an evaluator with its own per-document state for concurrent use.
+
+        The worker shares the loaded evaluation steps and output directory but
+        owns its document text, stage results, LLM client and a private copy of
+        the evaluation rules, so documents evaluated in parallel never touch
+        each other's state.
+        """
+        worker = copy.copy(self)
+        worker.evaluation_rules = copy.deepcopy(self.evaluation_rules)
+        worker._reset_evaluator_state()
+
+        worker.batch_strategy = BatchEvaluationStrategy(worker)
+        worker.individual_strategy = IndividualEvaluationStrategy(worker)
+        return worker
+
+    def _evaluate_document_file(self, file_path: Path, documents: Optional[List[Document]] = None,
+                                content_hash: Optional[str] = None) -> Optional[Dict]:
+        """Load, evaluate and export a single document file, optionally with its text and hash already computed"""
+        logger.info(f"Processing document: {file_path}")
+
+        # Reset state for new document
+        self._reset_evaluator_state()
+
+        # Hashed once for the checkpoint and the text cache
+        if content_hash is None:
+            content_hash = self._hash_document_file(file_path)
+        if self._skip_if_exported(file_path, content_hash):
+            return None
+
+        if not self.load_document(str(file_path), documents, content_hash):
+            logger.error(f"Failed to load document: {file_path}")
+            return None
+
+        evaluation_result = self.evaluate_document()
+
+        preferred_name = self._get_preferred_name()
+        output_path = self.output_dir / f"{preferred_name}_evaluation.json"
+        self.export_results(str(output_path), evaluation_result)
+
+        return evaluation_result
+
+    def _skip_if_exported(self, file_path: Path, content_hash: Optional[str] = None) -> bool:
+        """
+        Move a document the checkpoint already exported to processed and report whether it was skipped
+
+        Only an export evaluated with the current rulebook, steps and models
+        counts; a document added again after any of them changed is evaluated
+        again, its unchanged rules served from the result cache when cache_path is set.
+        """
+        if self.checkpoint is None or not self.checkpoint.is_exported(
+                content_hash or DocumentTextCache.hash_file(str(file_path)), self.evaluation_fingerprint):
+            return False
+
+        logger.info(f"Skipping already exported document: {file_path}")
+        self._move_to_processed(file_path)
+        return True
+
+    def _hash_pending_documents(self, document_files: List[Path]) -> List[Tuple[Path, Optional[str]]]:
+        """
+        Hash each document file once and drop the ones the checkpoint already exported
+
+        The hash travels with its file through deduplication, text extraction
+        and evaluation, so none of them hashes it again. A file that cannot be
+        read is kept without a hash, so its evaluation reports the error.
+        """
+        pending = []
+        for file_path in document_files:
+            try:
+                content_hash = self._hash_document_file(file_path)
+            except OSError as e:
+                logger.warning(f"Could not hash {file_path}: {str(e)}")
+                pending.append((file_path, None))
+                continue
+
+            if not self._skip_if_exported(file_path, content_hash):
+                pending.append((file_path, content_hash))
+        return pending
+
+    def _iter_document_files(self, pending: List[Tuple[Path, Optional[str]]], queue_size: int,
+                             extracted: Optional[Dict[Path, List[Document]]] = None
+                             ) -> Iterator[Tuple[Path, Optional[str], Optional[List[Document]]]]:
+        """
+        Yield each document file with its hash and extracted text, or None when it is extracted on load
+
+        With extract_workers set, text is extracted in a process pool ahead of
+        evaluation and handed over through a queue of at most queue_size
+        documents. pending comes from _hash_pending_documents, so files the
+        checkpoint already exported are never parsed. Text deduplication
+        already extracted is passed as extracted and handed over instead,
+        without extracting anything again.
+        """
+        if extracted is not None:
+            for file_path, content_hash in pending:
+                yield file_path, content_hash, extracted.pop(file_path, None)
+            return
+
+        if not self.extract_workers:
+            for file_path, content_hash in pending:
+                yield file_path, content_hash, None
+            return
+
+        content_hashes = dict(pending)
+        for extracted in self.text_extractor.iter_extracted(list(content_hashes), queue_size=queue_size,
+                                                            content_hashes=content_hashes):
+            if extracted.documents is None:
+                logger.warning(f"Pre-extraction failed for {extracted.path}, loading it directly: {extracted.error}")
+            yield extracted.path, content_hashes[extracted.path], extracted.documents
+
+    def _get_duplicate_metadata(self) -> Dict[str, Any]:
+        """Metadata linking the current document's evaluation to the duplicates it stands in for"""
+        group = self.duplicate_groups.get(str(self.current_document_path))
+        if group is None:
+            return {}
+        return {"duplicate_files": group.to_dict()["duplicates"]}
+
+    def _deduplicate_documents(self, pending: List[Tuple[Path, Optional[str]]]
+                               ) -> Tuple[List[Tuple[Path, Optional[str]]], Dict[Path, List[Document]]]:
+        """
+        Fingerprint the documents and drop all but the canonical one of each duplicate group
+
+        Takes the (file, hash) pairs of _hash_pending_documents and returns
+        those left to evaluate, with the text extracted for them. With
+        text_cache_path set the text is not kept, since loading a document
+        reads it back from the cache; otherwise it is kept until each document
+        is evaluated, so no file is parsed twice.
+        """
+        deduplicator = DocumentDeduplicator(self.dedupe_threshold)
+        extracted: Dict[Path, List[Document]] = {}
+
+        for file_path, content_hash, documents in self._iter_document_files(pending,
+                                                                            queue_size=self.extract_workers or 1):
+            try:
+                if documents is None:
+                    documents = self.text_extractor.extract(str(file_path), content_hash)
+                deduplicator.add(file_path, "\n".join(doc.text for doc in documents))
+                if self.text_cache is None:
+                    extracted[file_path] = documents
+            except Exception as e:
+                logger.warning(f"Could not fingerprint {file_path}, evaluating it without deduplication: {str(e)}")
+
+        groups = deduplicator.find_groups()
+        self.duplicate_groups = {str(group.canonical): group for group in groups}
+
+        duplicates = {path for group in groups for path, _, _ in group.duplicates}
+        for group in groups:
+            logger.info(f"Evaluating {group.canonical.name} in place of "
+                        f"{', '.join(path.name for path, _, _ in group.duplicates)}")
+            for path, _, _ in group.duplicates:
+                extracted.pop(path, None)
+
+        return [(f, content_hash) for f, content_hash in pending if f not in duplicates], extracted
+
+    def _resolve_duplicates(self, evaluated: Set[str]) -> None:
+        """
+        Move duplicates whose canonical document was evaluated to processed and write a report
+
+        Args:
+            evaluated: Source file paths of the documents evaluated in this run
+
+        Duplicates of a canonical document that failed are left in place so the
+        next run picks them up again.
+        """
+        if not self.duplicate_groups:
+            return
+
+        report = []
+        for canonical, group in self.duplicate_groups.items():
+            entry = group.to_dict()
+            entry["canonical_evaluated"] = canonical in evaluated
+            if entry["canonical_evaluated"]:
+                for path, _, _ in group.duplicates:
+                    if path.exists():
+                        self._move_to_processed(path)
+            report.append(entry)
+
+        report_path = self.output_dir / f"duplicate_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(safe_json_dumps({"threshold": self.dedupe_threshold, "groups": report}, indent=2))
+
+        skipped = sum(len(entry["duplicates"]) for entry in report if entry["canonical_evaluated"])
+        logger.info(f"Skipped {skipped} duplicate document(s); report written to {report_path}")
+        self.duplicate_groups = {}
+
+    def evaluate_directory(self, document_dir: str, max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Evaluate all supported document files in directory
+
+        Every combined evaluation is kept until the run ends; use
+        iter_evaluate_directory for large directories.
+
+        Args:
+            document_dir: Directory containing the documents to evaluate
+            max_workers: Number of documents to evaluate concurrently. Defaults to
+                the value given at construction time.
+
+        Returns:
+            List of combined evaluations, in order of completion
+        """
+        return list(self.iter_evaluate_directory(document_dir, max_workers))
+
+    def estimate_directory(self, document_dir: str, pricing: Optional[Dict[str, Dict[str, float]]] = None,
+                           concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Dry run of evaluate_directory: projected calls, tokens, cost per model and wall time
+
+        No provider is contacted; see EvaluationCostEstimator.
 
+        Args:
+            document_dir: Directory containing the documents to evaluate
+            pricing: USD per million tokens by model, overriding EvaluationCostEstimator.MODEL_PRICING
+            concurrency: Calls in flight at once; defaults to what this evaluator allows
+
+        Returns:
+            Totals per model and overall, and the projected wall time in seconds
+        """
+        return EvaluationCostEstimator(self, pricing=pricing, concurrency=concurrency).estimate_directory(document_dir)
 
-    def evaluate_directory(self, document_dir: str) -> List[Dict]:
-        """Evaluate all supported document files in directory"""
+    def _list_document_files(self, document_dir: str) -> List[Path]:
+        """Supported document files in a directory"""
         document_dir_path = Path(document_dir)
         if not document_dir_path.is_dir():
             raise NotADirectoryError(f"{document_dir} is not a directory")
 
-        results = []
-        document_files = [
-            f for f in document_dir_path.iterdir()
-            if self._is_supported_file(f)
-        ]
-        
-        logger.info(f"Found {len(document_files)} supported document files to process")
-        
-        for file_path in document_files:
-            logger.info(f"Processing document: {file_path}")
-            
-            try:
-                # Reset state for new document
-                # Use the new reset method
-                self._reset_evaluator_state()
-                
-                self.stage_results = self._init_stage_results()
-                
-                if self.llm:
-                    self.llm.clear_conversation()
-                
-                if self.load_document(str(file_path)):
-                    evaluation_result = self.evaluate_document()
-                    results.append(evaluation_result)
+        return [f for f in document_dir_path.iterdir() if self._is_supported_file(f)]
 
-                    preferred_name = self._get_preferred_name()
-                    output_path = self.output_dir / f"{preferred_name}_evaluation.json"
-                    self.export_results(str(output_path))
-                    
-                    time.sleep(2)
-                else:
-                    logger.error(f"Failed to load document: {file_path}")
-                    
+    def iter_evaluate_directory(self, document_dir: str, max_workers: Optional[int] = None,
+                                on_result: Optional[Callable[[Dict], None]] = None,
+                                on_error: Optional[Callable[[Path, Exception], None]] = None) -> Iterator[Dict]:
+        """
+        Evaluate all supported document files in directory, yielding each result once it is exported
+
+        Nothing is kept once a result has been yielded, so memory use does not
+        grow with the number of documents. If the caller stops early, documents
+        already being evaluated are still finished and exported.
+
+        Args:
+            document_dir: Directory containing the documents to evaluate
+            max_workers: Number of documents to evaluate concurrently. Defaults to
+                the value given at construction time.
+            on_result: Called with each combined evaluation once it is exported
+            on_error: Called with the file path and exception of each document that failed
+
+        Yields:
+            Combined evaluations, in order of completion
+        """
+        document_files = self._list_document_files(document_dir)
+        max_workers = max(1, int(max_workers or self.max_workers))
+
+        logger.info(f"Found {len(document_files)} supported document files to process "
+                    f"using {max_workers} worker(s)")
+
+        pending = self._hash_pending_documents(document_files)
+        extracted = None
+        if self.dedupe_threshold is not None:
+            pending, extracted = self._deduplicate_documents(pending)
+
+        evaluated: Set[str] = set()
+        try:
+            if max_workers == 1:
+                for file_path, content_hash, documents in self._iter_document_files(pending, 2, extracted):
+                    try:
+                        evaluation_result = self._evaluate_document_file(file_path, documents, content_hash)
+                    except Exception as e:
+                        self._handle_document_error(file_path, e, on_error)
+                        continue
+
+                    if evaluation_result is not None:
+                        self._handle_document_result(evaluation_result, evaluated, on_result)
+                        yield evaluation_result
+
+            else:
+                # Each document gets its own worker; results are exported as each one completes
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {}
+                    try:
+                        for file_path, content_hash, documents in self._iter_document_files(pending, max_workers,
+                                                                                            extracted):
+                            # Only take the next document once a worker is free, so extracted
+                            # text waits in the bounded extraction queue rather than here
+                            if len(futures) >= max_workers:
+                                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                                yield from self._collect_document_results(futures, done, evaluated,
+                                                                          on_result, on_error)
+
+                            worker = self._create_worker()
+                            futures[executor.submit(worker._evaluate_document_file, file_path, documents,
+                                                    content_hash)] = file_path
+
+                        yield from self._collect_document_results(futures, as_completed(list(futures)), evaluated,
+                                                                  on_result, on_error)
+                    finally:
+                        # Documents in flight when the caller stopped early are exported regardless
+                        for _ in self._collect_document_results(futures, as_completed(list(futures)), evaluated,
+                                                                on_result, on_error):
+                            pass
+        finally:
+            self._resolve_duplicates(evaluated)
+            self._log_telemetry_summary()
+
+    def _collect_document_results(self, futures: Dict, done, evaluated: Set[str],
+                                  on_result: Optional[Callable[[Dict], None]],
+                                  on_error: Optional[Callable[[Path, Exception], None]]) -> Iterator[Dict]:
+        """Yield the results of finished document futures, removing them from futures"""
+        for future in done:
+            file_path = futures.pop(future)
+            try:
+                evaluation_result = future.result()
             except Exception as e:
-                logger.error(f"Error processing document {file_path}: {str(e)}", exc_info=True)
+                self._handle_document_error(file_path, e, on_error)
                 continue
 
-        return results
+            if evaluation_result is not None:
+                self._handle_document_result(evaluation_result, evaluated, on_result)
+                yield evaluation_result
+
+    @staticmethod
+    def _handle_document_result(evaluation_result: Dict, evaluated: Set[str],
+                                on_result: Optional[Callable[[Dict], None]]) -> None:
+        """Note an exported document and pass its result to the callback"""
+        evaluated.add(evaluation_result.get('metadata', {}).get('source_file'))
+        if on_result is not None:
+            try:
+                on_result(evaluation_result)
+            except Exception as e:
+                logger.error(f"Result callback failed: {str(e)}", exc_info=True)
+
+    @staticmethod
+    def _handle_document_error(file_path: Path, error: Exception,
+                               on_error: Optional[Callable[[Path, Exception], None]]) -> None:
+        """Log a document that failed and pass it to the callback"""
+        logger.error(f"Error processing document {file_path}: {str(error)}", exc_info=error)
+        if on_error is not None:
+            try:
+                on_error(file_path, error)
+            except Exception as e:
+                logger.error(f"Error callback failed: {str(e)}", exc_info=True)
+
+    def _log_telemetry_summary(self) -> None:
+        """Write the run's telemetry summary and log it as a table"""
+        logger.info(f"LLM call summary:\n{self.telemetry.write_summary()}")
+
+        for model, stats in get_circuit_breaker_stats().items():
+            if stats['trips'] or stats['rejected_calls'] or stats['rejected_retries']:
+                logger.warning(f"Circuit breaker for {model}: {stats}")
 
     def _get_preferred_name(self) -> str:
         """Extract preferred name from evaluation results or generate fallback"""
@@ -879,34 +1950,47 @@ class DocumentEvaluator:
         safe_name = "".join(c for c in preferred_name if c.isalnum() or c in (' ', '-', '_')).strip()
         return safe_name.replace(' ', '_')
 
-    def export_results(self, output_path: str) -> None:
-        """Export evaluation results and move processed documents"""
+    def export_results(self, output_path: str, combined_results: Optional[Dict] = None) -> None:
+        """
+        Export evaluation results and move processed documents
+
+        Args:
+            output_path: Path of the JSON file to write
+            combined_results: Already built combined evaluation; built if not given
+        """
         try:
-            combined_results = self.get_combined_evaluation()
+            if combined_results is None:
+                combined_results = self.get_combined_evaluation()
             
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(safe_json_dumps(combined_results, indent=2))
             logger.info(f"Results exported to {output_path}")
+
+            if self.checkpoint is not None and self.document_key:
+                self.checkpoint.record_exported(self.document_key, output_path, self.evaluation_fingerprint)
             
             if self.current_document_path:
-                document_path = Path(self.current_document_path)
-                processed_dir = document_path.parent / 'processed'
-                processed_dir.mkdir(parents=True, exist_ok=True)
-                
-                dest_path = processed_dir / document_path.name
-                counter = 1
-                while dest_path.exists():
-                    new_name = f"{document_path.stem}_{counter}{document_path.suffix}"
-                    dest_path = processed_dir / new_name
-                    counter += 1
-                
-                shutil.move(str(document_path), str(dest_path))
-                logger.info(f"Moved processed document to {dest_path}")
+                self._move_to_processed(Path(self.current_document_path))
                 
         except Exception as e:
             logger.error(f"Error exporting results: {str(e)}", exc_info=True)
             raise
 
+    def _move_to_processed(self, document_path: Path) -> None:
+        """Move a document into the 'processed' folder next to it"""
+        processed_dir = document_path.parent / 'processed'
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        
+        dest_path = processed_dir / document_path.name
+        counter = 1
+        while dest_path.exists():
+            new_name = f"{document_path.stem}_{counter}{document_path.suffix}"
+            dest_path = processed_dir / new_name
+            counter += 1
+        
+        shutil.move(str(document_path), str(dest_path))
+        logger.info(f"Moved processed document to {dest_path}")
+
     def _is_supported_file(self, file_path: Path) -> bool:
         """Check if file is a supported document format"""
         return file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from llama_index.core.schema import Document
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentTextCache:
+    """On-disk SQLite cache of extracted document text, keyed by the file's content hash."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS document_texts ("
+            "  content_hash TEXT PRIMARY KEY,"
+            "  file_name TEXT NOT NULL,"
+            "  documents TEXT NOT NULL,"
+            "  created_at TEXT DEFAULT CURRENT_TIMESTAMP"
+            ")"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        logger.info(f"Document text cache opened at {self.db_path}")
+
+    @staticmethod
+    def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+        """SHA-256 hex digest of a file's bytes"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def contains(self, content_hash: str) -> bool:
+        """Whether text for a content hash is cached; a miss is counted here, a hit when it is read"""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT 1 FROM document_texts WHERE content_hash = ?", (content_hash,)
+            ).fetchone() is not None
+
+            if not found:
+                self.misses += 1
+            return found
+
+    def get(self, content_hash: str, file_path: Optional[str] = None) -> Optional[List[Document]]:
+        """
+        Return the cached documents for a content hash, or None.
+
+        Args:
+            content_hash: Hash of the file's bytes (see hash_file)
+            file_path: Current path of the file; replaces the path recorded when the
+                text was extracted, since the same content may since have moved
+
+        Returns:
+            The extracted documents, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT documents FROM document_texts WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        documents = [Document.from_json(doc_json) for doc_json in json.loads(row[0])]
+        if file_path:
+            for doc in documents:
+                if 'file_path' in doc.metadata:
+                    doc.metadata['file_path'] = file_path
+                if 'file_name' in doc.metadata:
+                    doc.metadata['file_name'] = Path(file_path).name
+        return documents
+
+    def set(self, content_hash: str, file_name: str, documents: List[Document]) -> None:
+        """Store the documents extracted from a file, replacing any previous entry"""
+        payload = json.dumps([doc.to_json() for doc in documents])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO document_texts (content_hash, file_name, documents) VALUES (?, ?, ?)",
+                (content_hash, file_name, payload)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
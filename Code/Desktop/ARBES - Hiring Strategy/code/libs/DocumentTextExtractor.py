@@ -0,0 +1,181 @@
+import queue
+import threading
+import logging
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from llama_index.core.readers import SimpleDirectoryReader
+from llama_index.core.schema import Document
+
+from libs.DocumentTextCache import DocumentTextCache
+
+logger = logging.getLogger(__name__)
+
+
+def _read_documents(file_path: str) -> List[str]:
+    """Parse one file into serialized documents; runs in a worker process"""
+    return [doc.to_json() for doc in SimpleDirectoryReader(input_files=[file_path]).load_data()]
+
+
+@dataclass
+class ExtractedDocument:
+    """Text extracted from one file ahead of evaluation"""
+    path: Path
+    content_hash: Optional[str]
+    documents: Optional[List[Document]]
+    error: Optional[str] = None
+
+
+class DocumentTextExtractor:
+    """
+    Extracts document text in a process pool ahead of evaluation.
+
+    Files are looked up in the text cache by content hash first; only misses
+    are parsed, at most max_processes at a time, and their text is cached.
+    Results are handed over through a bounded queue in completion order, so
+    parsing overlaps with evaluation while only a few extracted texts are held
+    in memory at once. A file that fails to parse is still handed over, without
+    documents, so the caller can fall back to loading it itself.
+    """
+
+    def __init__(self, cache: Optional[DocumentTextCache] = None, max_processes: int = 2):
+        """
+        Args:
+            cache: Text cache to read from and fill; extraction is uncached without one
+            max_processes: Files parsed at once
+        """
+        self.cache = cache
+        self.max_processes = max(1, int(max_processes))
+
+    def extract(self, file_path: str, content_hash: Optional[str] = None) -> List[Document]:
+        """Extract one file in this process, using and filling the cache; content_hash saves hashing it again"""
+        if self.cache is not None:
+            content_hash = content_hash or DocumentTextCache.hash_file(file_path)
+        else:
+            content_hash = None
+        if content_hash:
+            documents = self.cache.get(content_hash, file_path)
+            if documents is not None:
+                logger.debug(f"Text cache hit for {file_path}")
+                return documents
+
+        documents = SimpleDirectoryReader(input_files=[file_path]).load_data()
+        if content_hash:
+            self.cache.set(content_hash, Path(file_path).name, documents)
+        return documents
+
+    def iter_extracted(self, file_paths: List[Path], queue_size: int = 4,
+                       content_hashes: Optional[Dict[Path, Optional[str]]] = None) -> Iterator[ExtractedDocument]:
+        """
+        Extract files in the background and yield them as they become ready.
+
+        Args:
+            file_paths: Files to extract
+            queue_size: Extracted files held waiting for the consumer
+            content_hashes: Hashes already computed for some of the files, which are then not hashed again
+
+        Yields:
+            ExtractedDocument for every file, in completion order
+        """
+        ready: queue.Queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        stop = threading.Event()
+        finished = object()
+
+        def hand_over(item: object) -> bool:
+            # Blocks while the queue is full, unless the consumer has gone away
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                self._produce(file_paths, hand_over, stop, content_hashes or {})
+            except Exception as e:
+                logger.error(f"Document text extraction stopped: {str(e)}", exc_info=True)
+            finally:
+                hand_over(finished)
+
+        producer = threading.Thread(target=produce, name="document-text-extractor", daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                item = ready.get()
+                if item is finished:
+                    return
+                yield item
+        finally:
+            stop.set()
+
+    def _produce(self, file_paths: List[Path], hand_over, stop: threading.Event,
+                 content_hashes: Dict[Path, Optional[str]]) -> None:
+        """Parse cache misses in the process pool, handing over cache hits while it works"""
+        hits, misses = [], []
+        for file_path in file_paths:
+            try:
+                content_hash = None
+                if self.cache is not None:
+                    content_hash = content_hashes.get(file_path) or DocumentTextCache.hash_file(str(file_path))
+            except OSError as e:
+                if not hand_over(ExtractedDocument(file_path, None, None, str(e))):
+                    return
+                continue
+
+            if content_hash and self.cache.contains(content_hash):
+                hits.append((file_path, content_hash))
+            else:
+                misses.append((file_path, content_hash))
+
+        if misses:
+            logger.info(f"Extracting text from {len(misses)} document(s) with {self.max_processes} process(es), "
+                        f"{len(hits)} found in the text cache")
+
+        with ProcessPoolExecutor(max_workers=self.max_processes) if misses else nullcontext() as executor:
+            pending: Dict[Future, Tuple[Path, Optional[str]]] = {}
+            remaining = iter(misses)
+
+            def submit_more() -> None:
+                # Submit no more than the pool can work on, so finished texts never
+                # pile up in futures while the queue is full
+                while len(pending) < self.max_processes and not stop.is_set():
+                    miss = next(remaining, None)
+                    if miss is None:
+                        return
+                    pending[executor.submit(_read_documents, str(miss[0]))] = miss
+
+            if misses:
+                submit_more()
+
+            for file_path, content_hash in hits:
+                documents = self.cache.get(content_hash, str(file_path))
+                if not hand_over(ExtractedDocument(file_path, content_hash, documents)):
+                    return
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, content_hash = pending.pop(future)
+                    if not hand_over(self._collect(future, file_path, content_hash)):
+                        for other in pending:
+                            other.cancel()
+                        return
+                submit_more()
+
+    def _collect(self, future: Future, file_path: Path, content_hash: Optional[str]) -> ExtractedDocument:
+        """Turn a finished parse into an ExtractedDocument and cache its text"""
+        try:
+            documents = [Document.from_json(doc_json) for doc_json in future.result()]
+        except Exception as e:
+            logger.warning(f"Text extraction failed for {file_path}: {str(e)}")
+            return ExtractedDocument(file_path, content_hash, None, str(e))
+
+        if content_hash:
+            self.cache.set(content_hash, file_path.name, documents)
+        return ExtractedDocument(file_path, content_hash, documents)
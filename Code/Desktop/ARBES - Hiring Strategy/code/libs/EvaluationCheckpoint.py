@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationCheckpoint:
+    """
+    Append-only JSONL journal of per-document, per-rule evaluation progress.
+
+    Every completed rule and every exported document is appended as one JSON
+    line and flushed to disk, so a run that dies can be restarted and resume
+    where it left off. A partially written last line is cut off on load, so
+    the records appended after it start on a line of their own.
+
+    An export is recorded with the fingerprint of the rulebook, steps and
+    models it was evaluated with, so a document added again after any of
+    those changed is evaluated again rather than skipped.
+    """
+
+    def __init__(self, journal_path: str):
+        """
+        Open the journal, replaying any progress already recorded in it.
+
+        Args:
+            journal_path: Path to the JSONL journal file
+        """
+        self.journal_path = Path(journal_path)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._rules: Dict[str, Dict[str, Tuple[str, int, Any]]] = {}
+        self._exported: Dict[str, Tuple[Optional[str], str]] = {}
+        self._load()
+
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _truncate_torn_line(self) -> None:
+        """Cut the journal back to the end of its last complete line"""
+        with open(self.journal_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+
+            # Search backwards for the newline ending the last complete line
+            end = 0
+            position = size
+            while position > 0:
+                step = min(position, 1024 * 1024)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b'\n')
+                if newline != -1:
+                    end = position + newline + 1
+                    break
+
+            f.truncate(end)
+            logger.warning(f"Dropped {size - end} bytes of an incomplete last line in {self.journal_path}")
+
+    def _load(self) -> None:
+        """Replay the journal into memory"""
+        if not self.journal_path.exists():
+            return
+
+        self._truncate_torn_line()
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping incomplete checkpoint line {line_number} in {self.journal_path}")
+                    continue
+
+                document = entry.get('document')
+                if entry.get('event') == 'rule':
+                    self._rules.setdefault(document, {})[entry['rule']] = (
+                        entry.get('key'), entry.get('stage'), entry.get('result')
+                    )
+                elif entry.get('event') == 'exported':
+                    self._exported[document] = (entry.get('fingerprint'), entry.get('output'))
+                    # Rule results of an exported document are no longer needed
+                    self._rules.pop(document, None)
+
+        logger.info(f"Loaded checkpoint {self.journal_path}: {len(self._exported)} exported documents, "
+                    f"{len(self._rules)} partially evaluated documents")
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Append one entry and force it to disk"""
+        line = json.dumps(entry, ensure_ascii=True, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def record_rule(self, document: str, rule_name: str, key: str, stage: int, result: Any) -> None:
+        """
+        Record a completed rule.
+
+        Args:
+            document: Document key, the content hash of its file (see DocumentTextCache.hash_file)
+            rule_name: Name of the rule
+            key: Key identifying the rule definition/model/instructions used
+            stage: Stage the result belongs to
+            result: Parsed rule result
+        """
+        self._append({'event': 'rule', 'document': document, 'rule': rule_name,
+                      'key': key, 'stage': stage, 'result': result})
+        with self._lock:
+            self._rules.setdefault(document, {})[rule_name] = (key, stage, result)
+
+    def get_rule(self, document: str, rule_name: str, key: str) -> Optional[Any]:
+        """Return the recorded result for a rule if it was completed with the same key"""
+        with self._lock:
+            recorded = self._rules.get(document, {}).get(rule_name)
+
+        if recorded is None or recorded[0] != key:
+            return None
+        return recorded[2]
+
+    def record_exported(self, document: str, output_path: str, fingerprint: Optional[str] = None) -> None:
+        """
+        Record that a document's evaluation has been exported.
+
+        Args:
+            document: Document key
+            output_path: File the evaluation was written to
+            fingerprint: Fingerprint of the rulebook, steps and models it was evaluated with
+        """
+        self._append({'event': 'exported', 'document': document, 'output': str(output_path),
+                      'fingerprint': fingerprint})
+        with self._lock:
+            self._exported[document] = (fingerprint, str(output_path))
+            self._rules.pop(document, None)
+
+    def is_exported(self, document: str, fingerprint: Optional[str] = None) -> bool:
+        """Whether a document's evaluation has already been exported with the same fingerprint"""
+        with self._lock:
+            exported = self._exported.get(document)
+        return exported is not None and exported[0] == fingerprint
+
+    def close(self) -> None:
+        """Close the journal file"""
+        with self._lock:
+            self._file.close()
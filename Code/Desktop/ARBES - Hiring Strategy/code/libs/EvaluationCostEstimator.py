@@ -0,0 +1,225 @@
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from libs.DocumentDeduplicator import DocumentDeduplicator
+
+if TYPE_CHECKING:
+    from libs.DocumentEvaluator import DocumentEvaluator
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationCostEstimator:
+    """
+    Dry run of evaluate_directory: projects calls, tokens, cost and wall time.
+
+    Each document's text is extracted and the evaluator plans its calls exactly
+    as it would for a real run (checkpoint, duplicates, saved results, batch
+    packing, rules evaluated individually), but nothing is sent to a provider,
+    no client is created and no file is moved. Every call carries the whole
+    system prompt with the document text; all but the first call of a document
+    to each model are assumed to read it from the provider's prompt cache.
+
+    Output tokens come from the evaluator's size estimator, so they improve as
+    batch_hints_path collects observed sizes. Retries, failed batches and the
+    reasoning tokens of o-series models are not included.
+    """
+
+    # USD per million tokens; 'default' applies to models not listed
+    MODEL_PRICING: Dict[str, Dict[str, float]] = {
+        'default': {'input': 2.50, 'cached_input': 1.25, 'output': 10.00},
+        'gpt-4': {'input': 30.00, 'cached_input': 30.00, 'output': 60.00},
+        'gpt-4o': {'input': 2.50, 'cached_input': 1.25, 'output': 10.00},
+        'gpt-4o-mini': {'input': 0.15, 'cached_input': 0.075, 'output': 0.60},
+        'o1-preview': {'input': 15.00, 'cached_input': 7.50, 'output': 60.00},
+        'o1-mini': {'input': 3.00, 'cached_input': 1.50, 'output': 12.00}
+    }
+
+    # Latency model for one call: fixed overhead plus generation time
+    BASE_LATENCY_SECONDS = 2.0
+    SECONDS_PER_OUTPUT_TOKEN = 0.02
+
+    def __init__(self, evaluator: 'DocumentEvaluator', pricing: Optional[Dict[str, Dict[str, float]]] = None,
+                 concurrency: Optional[int] = None):
+        """
+        Args:
+            evaluator: Evaluator whose rules, settings and rate limits are used
+            pricing: Overrides for MODEL_PRICING, keyed by model
+            concurrency: Calls in flight at once; defaults to what the evaluator would allow
+        """
+        self.evaluator = evaluator
+        self.pricing = {**self.MODEL_PRICING, **(pricing or {})}
+        self.concurrency = max(1, int(concurrency or self._default_concurrency()))
+
+    def _default_concurrency(self) -> int:
+        """Calls the evaluator keeps in flight at once"""
+        if hasattr(self.evaluator, 'max_concurrent_requests'):
+            return min(self.evaluator.max_concurrent_requests,
+                       self.evaluator.max_concurrent_documents * self.evaluator.max_rule_workers)
+        return self.evaluator.max_workers * self.evaluator.max_rule_workers
+
+    def _load(self, file_path: Path, content_hash: Optional[str] = None) -> 'DocumentEvaluator':
+        """Worker with the document's text set, without creating a client"""
+        worker = self.evaluator._create_worker()
+        worker._set_document(str(file_path), worker.text_extractor.extract(str(file_path), content_hash), content_hash)
+        return worker
+
+    def plan_document(self, worker: 'DocumentEvaluator') -> List[Dict[str, Any]]:
+        """
+        Plan the calls evaluating the worker's document would make.
+
+        Returns:
+            One entry per call with its model, rules and estimated tokens
+        """
+        system_tokens = worker._estimate_tokens(''.join(worker._get_system_prompt_segments()))
+        rules = [(rule_name, rule) for rule_name, rule in worker._sort_rules_by_stage_and_order()
+                 if worker._get_saved_result(rule_name, rule) is None]
+
+        batches = worker._group_rules_for_batching([(n, r) for n, r in rules if worker._is_batchable(r)])
+        calls = []
+        for batch in batches:
+            prompt, history = worker._prepare_batch_prompt(batch)
+            calls.append(self._plan_call(worker, batch, prompt, history, system_tokens))
+
+        for rule_name, rule in rules:
+            if not worker._is_batchable(rule):
+                prompt = worker._get_single_rule_prompt(rule_name, rule)
+                calls.append(self._plan_call(worker, [(rule_name, rule)], prompt,
+                                             worker._get_rule_history(rule), system_tokens))
+
+        # The first call of a document to each model writes that model's prompt
+        # cache, the rest read it
+        cache_written = set()
+        for call in calls:
+            if call['model'] in cache_written:
+                call['cached_prompt_tokens'] = system_tokens
+            cache_written.add(call['model'])
+        return calls
+
+    def _plan_call(self, worker: 'DocumentEvaluator', rules: List[Tuple[str, Dict]], prompt: str,
+                   history: List[str], system_tokens: int) -> Dict[str, Any]:
+        """Token estimate for one planned call"""
+        # Data Dependency results are sent along as history
+        history_tokens = sum(
+            worker.size_estimator.estimate_output_tokens(name, worker.evaluation_rules.get(name, {}))
+            for name in set(history)
+        )
+        prompt_tokens = system_tokens + worker._estimate_tokens(prompt) + history_tokens
+
+        return {
+            'model': rules[0][1].get('Model', [worker.DEFAULT_MODEL])[0],
+            'rules': [rule_name for rule_name, _ in rules],
+            'prompt_tokens': prompt_tokens,
+            'cached_prompt_tokens': 0,
+            'output_tokens': sum(worker.size_estimator.estimate_output_tokens(n, r) for n, r in rules),
+            # What the rate limiter charges the call
+            'rate_limit_tokens': prompt_tokens + worker.EXPECTED_OUTPUT_TOKENS
+        }
+
+    def estimate_directory(self, document_dir: str) -> Dict[str, Any]:
+        """
+        Project the cost and duration of evaluating a directory.
+
+        Args:
+            document_dir: Directory containing the documents to evaluate
+
+        Returns:
+            Totals per model and overall, and the projected wall time in seconds
+        """
+        document_files = self.evaluator._list_document_files(document_dir)
+        deduplicator = DocumentDeduplicator(self.evaluator.dedupe_threshold) \
+            if self.evaluator.dedupe_threshold is not None else None
+        plans: Dict[Path, List[Dict[str, Any]]] = {}
+        skipped = 0
+
+        for file_path in document_files:
+            try:
+                content_hash = self.evaluator._hash_document_file(file_path)
+                if self.evaluator.checkpoint is not None and self.evaluator.checkpoint.is_exported(
+                        content_hash, self.evaluator.evaluation_fingerprint):
+                    skipped += 1
+                    continue
+
+                worker = self._load(file_path, content_hash)
+                plans[file_path] = self.plan_document(worker)
+            except Exception as e:
+                logger.warning(f"Could not plan {file_path}: {str(e)}")
+                skipped += 1
+                continue
+
+            if deduplicator is not None:
+                deduplicator.add(file_path, worker.document_text)
+
+        if deduplicator is not None:
+            for group in deduplicator.find_groups():
+                for path, _, _ in group.duplicates:
+                    plans.pop(path, None)
+                    skipped += 1
+
+        models: Dict[str, Dict[str, float]] = {}
+        for calls in plans.values():
+            for call in calls:
+                totals = models.setdefault(call['model'], {
+                    'calls': 0, 'rules': 0, 'prompt_tokens': 0, 'cached_prompt_tokens': 0,
+                    'output_tokens': 0, 'rate_limit_tokens': 0, 'latency': 0.0
+                })
+                totals['calls'] += 1
+                totals['rules'] += len(call['rules'])
+                for metric in ('prompt_tokens', 'cached_prompt_tokens', 'output_tokens', 'rate_limit_tokens'):
+                    totals[metric] += call[metric]
+                totals['latency'] += self.BASE_LATENCY_SECONDS + call['output_tokens'] * self.SECONDS_PER_OUTPUT_TOKEN
+
+        for model, totals in models.items():
+            totals['cost'] = self._cost(model, totals)
+            totals['rate_limited_seconds'] = self._rate_limited_seconds(model, totals)
+
+        latency = sum(totals['latency'] for totals in models.values())
+        wall_time = max([latency / self.concurrency] +
+                        [totals['rate_limited_seconds'] for totals in models.values()])
+
+        return {
+            'documents': len(plans),
+            'skipped_documents': skipped,
+            'concurrency': self.concurrency,
+            'models': models,
+            'totals': {
+                metric: sum(totals[metric] for totals in models.values())
+                for metric in ('calls', 'rules', 'prompt_tokens', 'cached_prompt_tokens', 'output_tokens', 'cost')
+            },
+            'wall_time_seconds': wall_time
+        }
+
+    def _cost(self, model: str, totals: Dict[str, float]) -> float:
+        """USD cost of a model's calls"""
+        prices = self.pricing.get(model, self.pricing['default'])
+        uncached = totals['prompt_tokens'] - totals['cached_prompt_tokens']
+        return (uncached * prices['input']
+                + totals['cached_prompt_tokens'] * prices.get('cached_input', prices['input'])
+                + totals['output_tokens'] * prices['output']) / 1_000_000
+
+    def _rate_limited_seconds(self, model: str, totals: Dict[str, float]) -> float:
+        """Shortest time the model's quota allows its calls to be made in"""
+        limits = self.evaluator.rate_limits.get(model, self.evaluator.rate_limits['default'])
+        return 60.0 * max(totals['calls'] / limits['requests_per_minute'],
+                          totals['rate_limit_tokens'] / limits['tokens_per_minute'])
+
+    @staticmethod
+    def format_report(estimate: Dict[str, Any]) -> str:
+        """Estimate as a table, one row per model"""
+        header = (f"{'model':<16} {'calls':>7} {'rules':>7} {'prompt tok':>12} {'cached':>12} "
+                  f"{'output tok':>11} {'cost $':>10} {'quota min':>10}")
+        lines = [header, '-' * len(header)]
+        for model, totals in sorted(estimate['models'].items()):
+            lines.append(f"{model:<16} {totals['calls']:>7} {totals['rules']:>7} {totals['prompt_tokens']:>12,} "
+                         f"{totals['cached_prompt_tokens']:>12,} {totals['output_tokens']:>11,} "
+                         f"{totals['cost']:>10.2f} {totals['rate_limited_seconds'] / 60:>10.1f}")
+
+        totals = estimate['totals']
+        lines.append('-' * len(header))
+        lines.append(f"{'total':<16} {totals['calls']:>7} {totals['rules']:>7} {totals['prompt_tokens']:>12,} "
+                     f"{totals['cached_prompt_tokens']:>12,} {totals['output_tokens']:>11,} {totals['cost']:>10.2f}")
+        lines.append(f"\n{estimate['documents']} document(s) to evaluate, {estimate['skipped_documents']} skipped; "
+                     f"projected wall time {estimate['wall_time_seconds'] / 3600:.2f} h "
+                     f"with {estimate['concurrency']} call(s) in flight")
+        return '\n'.join(lines)
@@ -0,0 +1,128 @@
+import threading
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict
+
+from libs.EvaluationJobQueue import EvaluationJob, EvaluationJobQueue
+
+if TYPE_CHECKING:
+    from libs.DocumentEvaluator import DocumentEvaluator
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationDaemon:
+    """
+    Watches folders for new documents and evaluates them from a durable job queue.
+
+    Each watched folder has its own evaluator, created once and kept warm, and
+    every job runs on a worker created from it, as evaluate_directory does.
+    Folders are polled; a file is queued once it has not been modified for
+    settle_seconds, so files still being copied in are left alone. Up to
+    concurrency documents are evaluated at once. Jobs survive restarts, and
+    documents that keep failing end up in the queue's dead-letter list.
+    """
+
+    def __init__(self, evaluators: Dict[str, 'DocumentEvaluator'], queue: EvaluationJobQueue,
+                 concurrency: int = 4, poll_seconds: float = 10, settle_seconds: float = 5):
+        """
+        Args:
+            evaluators: Evaluator for each watched folder, keyed by folder path
+            queue: Job queue shared by the folders
+            concurrency: Documents evaluated at once
+            poll_seconds: Seconds between scans of the watched folders
+            settle_seconds: Seconds a file must go unmodified before it is queued
+        """
+        self.evaluators = {str(Path(folder).resolve()): evaluator for folder, evaluator in evaluators.items()}
+        self.queue = queue
+        self.concurrency = max(1, int(concurrency))
+        self.poll_seconds = max(0.1, float(poll_seconds))
+        self.settle_seconds = max(0.0, float(settle_seconds))
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Stop taking new jobs; run returns once the running ones finish"""
+        self._stop.set()
+
+    def scan(self) -> int:
+        """Queue the settled documents in the watched folders; returns how many were new"""
+        queued = 0
+        now = time.time()
+        for folder, evaluator in self.evaluators.items():
+            folder_path = Path(folder)
+            if not folder_path.is_dir():
+                continue
+
+            for file_path in folder_path.iterdir():
+                try:
+                    if not file_path.is_file() or not evaluator._is_supported_file(file_path):
+                        continue
+                    if now - file_path.stat().st_mtime < self.settle_seconds:
+                        continue
+                    queued += self.queue.enqueue(file_path)
+                except OSError as e:
+                    # Moved or deleted while scanning
+                    logger.debug(f"Skipping {file_path}: {str(e)}")
+        return queued
+
+    def run(self) -> None:
+        """Scan and evaluate until stop is called"""
+        self.queue.requeue_running()
+        logger.info(f"Watching {', '.join(self.evaluators)} with {self.concurrency} worker(s)")
+
+        running: Dict[Future, EvaluationJob] = {}
+        next_scan = 0.0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while not self._stop.is_set():
+                if time.monotonic() >= next_scan:
+                    self.scan()
+                    next_scan = time.monotonic() + self.poll_seconds
+
+                while len(running) < self.concurrency:
+                    job = self.queue.claim()
+                    if job is None:
+                        break
+                    running[executor.submit(self._process, job)] = job
+
+                if running:
+                    done, _ = wait(running, timeout=self.poll_seconds, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        running.pop(future)
+                else:
+                    self._stop.wait(max(0.0, next_scan - time.monotonic()))
+
+            if running:
+                logger.info(f"Stopping; waiting for {len(running)} running job(s)")
+                wait(running)
+
+        for evaluator in self.evaluators.values():
+            evaluator._log_telemetry_summary()
+        logger.info(f"Stopped; jobs by status: {self.queue.counts()}")
+
+    def _process(self, job: EvaluationJob) -> None:
+        """Evaluate one job's document and record the outcome in the queue"""
+        if not job.file_path.exists():
+            logger.info(f"{job.file_path} is gone; dropping its job")
+            self.queue.complete(job)
+            return
+
+        evaluator = self.evaluators.get(str(job.file_path.parent.resolve()))
+        if evaluator is None:
+            self.queue.fail(job, "No evaluator for the document's folder")
+            return
+
+        try:
+            evaluator._create_worker()._evaluate_document_file(job.file_path)
+        except Exception as e:
+            logger.error(f"Error processing document {job.file_path}: {str(e)}", exc_info=True)
+            self.queue.fail(job, str(e))
+            return
+
+        # Evaluated documents (and ones the checkpoint already exported) are moved
+        # to processed; one still in place could not be loaded
+        if job.file_path.exists():
+            self.queue.fail(job, "Document could not be loaded")
+        else:
+            self.queue.complete(job)
@@ -0,0 +1,209 @@
+import sqlite3
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EvaluationJob:
+    """A document claimed for evaluation"""
+    id: int
+    file_path: Path
+    attempts: int
+
+
+class EvaluationJobQueue:
+    """
+    Durable SQLite queue of documents waiting for evaluation.
+
+    A document is queued once per version of the file (its path, size and
+    modification time). Jobs are claimed oldest first. A failed job is retried
+    after retry_seconds, doubling with each attempt, and after max_attempts it
+    moves to the dead-letter list, where it stays until it is retried or the
+    file changes. Jobs left running by a process that died are queued again
+    by requeue_running, or dead-lettered if they had used up their attempts,
+    so a document that kills the process is not retried forever.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    DEAD = 'dead'
+
+    def __init__(self, db_path: str, max_attempts: int = 3, retry_seconds: float = 60):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_attempts: Failed attempts after which a job is dead-lettered
+            retry_seconds: Delay before the first retry of a failed job
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_seconds = max(0.0, float(retry_seconds))
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "  id INTEGER PRIMARY KEY,"
+            "  file_path TEXT NOT NULL,"
+            "  file_version TEXT NOT NULL,"
+            "  status TEXT NOT NULL,"
+            "  attempts INTEGER NOT NULL DEFAULT 0,"
+            "  available_at REAL NOT NULL,"
+            "  last_error TEXT,"
+            "  created_at TEXT DEFAULT CURRENT_TIMESTAMP,"
+            "  updated_at TEXT DEFAULT CURRENT_TIMESTAMP,"
+            "  UNIQUE (file_path, file_version)"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at)")
+        self._conn.commit()
+        logger.info(f"Evaluation job queue opened at {self.db_path}")
+
+    @staticmethod
+    def file_version(file_path: Path) -> str:
+        """Size and modification time of a file, which change whenever it is replaced"""
+        stat = file_path.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def enqueue(self, file_path: Path) -> bool:
+        """
+        Queue a document unless this version of it has been queued before.
+
+        Returns:
+            True if a new job was queued
+        """
+        version = self.file_version(file_path)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (file_path, file_version, status, available_at) VALUES (?, ?, ?, ?)",
+                (str(file_path), version, self.QUEUED, time.time())
+            )
+            self._conn.commit()
+
+        if cursor.rowcount:
+            logger.info(f"Queued {file_path}")
+        return bool(cursor.rowcount)
+
+    def claim(self) -> Optional[EvaluationJob]:
+        """Mark the oldest job that is due as running and return it, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, file_path, attempts FROM jobs WHERE status = ? AND available_at <= ? "
+                "ORDER BY available_at, id LIMIT 1",
+                (self.QUEUED, time.time())
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (self.RUNNING, row[0])
+            )
+            self._conn.commit()
+
+        return EvaluationJob(id=row[0], file_path=Path(row[1]), attempts=row[2] + 1)
+
+    def complete(self, job: EvaluationJob) -> None:
+        """Mark a job as done"""
+        self._set_status(job.id, self.DONE, None, time.time())
+
+    def fail(self, job: EvaluationJob, error: str) -> bool:
+        """
+        Record a failed attempt, queueing the job for a retry or dead-lettering it.
+
+        Returns:
+            True if the job was dead-lettered
+        """
+        if job.attempts >= self.max_attempts:
+            self._set_status(job.id, self.DEAD, error, time.time())
+            logger.error(f"Dead-lettered {job.file_path} after {job.attempts} attempt(s): {error}")
+            return True
+
+        delay = self.retry_seconds * 2 ** (job.attempts - 1)
+        self._set_status(job.id, self.QUEUED, error, time.time() + delay)
+        logger.warning(f"Attempt {job.attempts} for {job.file_path} failed, retrying in {delay:.0f}s: {error}")
+        return False
+
+    def _set_status(self, job_id: int, status: str, error: Optional[str], available_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, available_at = ?, updated_at = CURRENT_TIMESTAMP "
+                "WHERE id = ?",
+                (status, error, available_at, job_id)
+            )
+            self._conn.commit()
+
+    def requeue_running(self) -> int:
+        """
+        Recover the jobs a previous process left running: dead-letter those that had
+        used up their attempts and queue the rest again.
+
+        Returns:
+            Number of jobs queued again
+        """
+        now = time.time()
+        with self._lock:
+            dead = self._conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, available_at = ?, updated_at = CURRENT_TIMESTAMP "
+                "WHERE status = ? AND attempts >= ?",
+                (self.DEAD, "Process stopped while the job was running", now, self.RUNNING, self.max_attempts)
+            ).rowcount
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, updated_at = CURRENT_TIMESTAMP WHERE status = ?",
+                (self.QUEUED, now, self.RUNNING)
+            ).rowcount
+            self._conn.commit()
+
+        if dead:
+            logger.error(f"Dead-lettered {dead} job(s) a previous process stopped on after their last attempt")
+        if requeued:
+            logger.warning(f"Requeued {requeued} job(s) left running by a previous process")
+        return requeued
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """Dead-lettered jobs, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, file_path, attempts, last_error, updated_at FROM jobs WHERE status = ? ORDER BY id",
+                (self.DEAD,)
+            ).fetchall()
+
+        return [
+            {"id": row[0], "file_path": row[1], "attempts": row[2], "last_error": row[3], "updated_at": row[4]}
+            for row in rows
+        ]
+
+    def retry_dead(self, job_id: Optional[int] = None) -> int:
+        """Queue dead-lettered jobs again with their attempts reset; all of them unless job_id is given"""
+        query = "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, updated_at = CURRENT_TIMESTAMP WHERE status = ?"
+        params: List[Any] = [self.QUEUED, time.time(), self.DEAD]
+        if job_id is not None:
+            query += " AND id = ?"
+            params.append(job_id)
+
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            self._conn.commit()
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationTelemetry:
+    """
+    Per-call LLM telemetry for evaluation runs.
+
+    Every call attempt is recorded with its model, prompt names, token usage as
+    reported by the API, latency, the retries and backoff wait that preceded it,
+    and the time spent waiting on the rate limiter. Calls are aggregated per
+    rule, batch, model, document and run as they are recorded, and are written
+    to an optional JSONL file together with a summary per document and per run.
+
+    A batch call counts as a call of each of its rules in the per-rule totals,
+    with its tokens and times split evenly between them. A document's totals
+    are only kept until its summary is recorded, so memory stays flat over
+    long runs.
+    """
+
+    METRICS = ('calls', 'failures', 'prompt_tokens', 'cached_prompt_tokens', 'completion_tokens',
+               'latency', 'retries', 'backoff_wait', 'rate_limit_wait')
+    # Counted in full for every rule of a batch call; the other metrics are split
+    COUNTS = ('calls', 'failures', 'retries')
+
+    def __init__(self, metrics_path: Optional[str] = None):
+        """
+        Initialize telemetry.
+
+        Args:
+            metrics_path: Optional JSONL file the call and summary events are appended to
+        """
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self._lock = threading.Lock()
+        self._file = None
+        if self.metrics_path:
+            self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.metrics_path, 'a', encoding='utf-8')
+
+        self.started = time.time()
+        self.totals: Dict[str, Dict[str, Any]] = {'rule': {}, 'batch': {}, 'model': {}, 'document': {}}
+        self.run_totals = self._empty_totals()
+        self.documents_recorded = 0
+        self._pending_retries: Dict[Tuple[str, Tuple[str, ...]], List[float]] = {}
+
+    @classmethod
+    def _empty_totals(cls) -> Dict[str, float]:
+        return {metric: 0 for metric in cls.METRICS}
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Append one event to the JSONL file; call with the lock held"""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(entry, ensure_ascii=True, default=str) + '\n')
+        self._file.flush()
+
+    @classmethod
+    def _add(cls, totals: Dict[str, float], values: Dict[str, float], share: float = 1.0) -> None:
+        for metric, value in values.items():
+            totals[metric] += value if share == 1.0 or metric in cls.COUNTS else value * share
+
+    def record_backoff(self, document: Optional[str], prompt_names: Sequence[str], wait: float) -> None:
+        """
+        Record a retry about to happen after a failed call.
+
+        The retry count and wait are attached to the next call recorded for the
+        same document and prompt names.
+
+        Args:
+            document: Document being evaluated
+            prompt_names: Rule names the failed call covered
+            wait: Seconds backoff waits before retrying
+        """
+        key = (str(document), tuple(prompt_names))
+        with self._lock:
+            pending = self._pending_retries.setdefault(key, [0, 0.0])
+            pending[0] += 1
+            pending[1] += wait
+
+    def record_call(self, document: Optional[str], prompt_names: Sequence[str], model: str,
+                    usage: Optional[Dict[str, int]], latency: float, rate_limit_wait: float = 0.0,
+                    error: Optional[str] = None) -> None:
+        """
+        Record one call attempt.
+
+        Args:
+            document: Document being evaluated
+            prompt_names: Rule names the call covers
+            model: Model or deployment called
+            usage: Token usage reported by the API for this call, if any
+            latency: Seconds from sending the request to having the full response
+            rate_limit_wait: Seconds spent waiting on the rate limiter before the call
+            error: Error message if the call failed
+        """
+        prompt_names = tuple(prompt_names)
+        usage = usage or {}
+
+        with self._lock:
+            retries, backoff_wait = self._pending_retries.pop((str(document), prompt_names), (0, 0.0))
+
+            values = {
+                'calls': 1,
+                'failures': 1 if error else 0,
+                'prompt_tokens': usage.get('prompt_tokens', 0),
+                'cached_prompt_tokens': usage.get('cached_prompt_tokens', 0),
+                'completion_tokens': usage.get('completion_tokens', 0),
+                'latency': latency,
+                'retries': retries,
+                'backoff_wait': backoff_wait,
+                'rate_limit_wait': rate_limit_wait
+            }
+
+            self._add(self.run_totals, values)
+            self._add(self.totals['model'].setdefault(model, self._empty_totals()), values)
+            self._add(self.totals['document'].setdefault(str(document), self._empty_totals()), values)
+            if len(prompt_names) > 1:
+                self._add(self.totals['batch'].setdefault(prompt_names, self._empty_totals()), values)
+            for name in prompt_names:
+                self._add(self.totals['rule'].setdefault(name, self._empty_totals()), values,
+                          share=1 / len(prompt_names))
+
+            self._write({
+                'event': 'call',
+                'timestamp': time.time(),
+                'document': document,
+                'prompt_names': list(prompt_names),
+                'model': model,
+                **{metric: value for metric, value in values.items() if metric not in ('calls', 'failures')},
+                'error': error
+            })
+
+    def get_document_totals(self, document: Optional[str]) -> Dict[str, float]:
+        """Totals of the calls recorded for a document"""
+        with self._lock:
+            return dict(self.totals['document'].get(str(document), self._empty_totals()))
+
+    def record_document(self, document: Optional[str]) -> Dict[str, float]:
+        """Write the summary of a finished document and return its totals, which are then dropped"""
+        with self._lock:
+            totals = self.totals['document'].pop(str(document), None) or self._empty_totals()
+            for key in [key for key in self._pending_retries if key[0] == str(document)]:
+                del self._pending_retries[key]
+            self.documents_recorded += 1
+            self._write({'event': 'document', 'timestamp': time.time(), 'document': document, **totals})
+        return totals
+
+    def write_summary(self) -> str:
+        """Write the run summary event and return the summary table"""
+        with self._lock:
+            self._write({
+                'event': 'run',
+                'timestamp': time.time(),
+                'elapsed': time.time() - self.started,
+                'documents': self.documents_recorded,
+                **self.run_totals,
+                'by_model': self.totals['model']
+            })
+        return self.format_summary_table()
+
+    def format_summary_table(self) -> str:
+        """Text table of the totals per rule, per model and for the run"""
+        with self._lock:
+            rows = sorted(self.totals['rule'].items(), key=lambda item: -item[1]['latency'])
+            models = sorted(self.totals['model'].items())
+            run_totals = dict(self.run_totals)
+            documents = self.documents_recorded
+            batches = len(self.totals['batch'])
+
+        header = (f"{'':<45} {'calls':>6} {'fail':>5} {'prompt tok':>11} {'cached':>7} "
+                  f"{'output tok':>11} {'latency s':>10} {'avg s':>7} {'retries':>7} "
+                  f"{'backoff s':>10} {'rate wait s':>11}")
+
+        def line(name: str, totals: Dict[str, float]) -> str:
+            calls = totals['calls']
+            cached = totals['cached_prompt_tokens'] / totals['prompt_tokens'] if totals['prompt_tokens'] else 0
+            return (f"{name[:45]:<45} {calls:>6.0f} {totals['failures']:>5.0f} {totals['prompt_tokens']:>11.0f} "
+                    f"{cached:>7.1%} {totals['completion_tokens']:>11.0f} {totals['latency']:>10.1f} "
+                    f"{(totals['latency'] / calls if calls else 0):>7.2f} {totals['retries']:>7.0f} "
+                    f"{totals['backoff_wait']:>10.1f} {totals['rate_limit_wait']:>11.1f}")
+
+        separator = '-' * len(header)
+        lines = [header, separator]
+        lines.extend(line(name, totals) for name, totals in rows)
+        lines.append(separator)
+        lines.extend(line(f"model {model}", totals) for model, totals in models)
+        lines.append(separator)
+        lines.append(line(f"TOTAL ({documents} documents, {batches} batches)", run_totals))
+        return '\n'.join(lines)
+
+    def close(self) -> None:
+        """Close the JSONL file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,112 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object of rule results.
+
+    Text is fed in as it arrives, and every top-level member of the outer object
+    is returned by feed() as soon as its value is complete, without waiting for
+    the rest of the object. Anything before the first '{' (such as a ```json
+    fence) is skipped, and so is anything after the outer object closes.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.position = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.finished = False
+
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+
+        self.completed: Dict[str, Any] = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add streamed text.
+
+        Args:
+            chunk: Next piece of the response text
+
+        Returns:
+            (name, value) pairs of the top-level members completed by this chunk
+        """
+        self.buffer += chunk
+        completed = []
+
+        while self.position < len(self.buffer) and not self.finished:
+            char = self.buffer[self.position]
+
+            if not self.started:
+                if char == '{':
+                    self.started = True
+                    self.depth = 1
+
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(self.buffer[self._key_start:self.position + 1])
+                        self._key_start = None
+
+            elif char == '"':
+                self.in_string = True
+                # A string directly in the outer object, before a ':', is a member name
+                if self.depth == 1 and self._value_start is None:
+                    self._key_start = self.position
+
+            elif char == ':' and self.depth == 1 and self._value_start is None:
+                self._value_start = self.position + 1
+
+            elif char in '{[':
+                self.depth += 1
+
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 1:
+                    # A nested object/array value just closed
+                    self._complete_member(self.position + 1, completed)
+                elif self.depth == 0:
+                    self._complete_member(self.position, completed)
+                    self.finished = True
+
+            elif char == ',' and self.depth == 1:
+                self._complete_member(self.position, completed)
+
+            self.position += 1
+
+        return completed
+
+    def _complete_member(self, value_end: int, completed: List[Tuple[str, Any]]) -> None:
+        """Parse the pending member's value, if there is one, and add it to `completed`"""
+        if self._key is None or self._value_start is None:
+            return
+
+        key, raw_value = self._key, self.buffer[self._value_start:value_end].strip()
+        self._key = None
+        self._value_start = None
+
+        if not raw_value:
+            return
+
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Could not parse streamed value for {key}: {str(e)}")
+            return
+
+        self.completed[key] = value
+        completed.append((key, value))
@@ -0,0 +1,316 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MockLLMServer:
+    """
+    Local OpenAI/Azure OpenAI compatible chat completions endpoint for benchmarks.
+
+    Answers every request with a canned JSON evaluation of the rules the prompt
+    asks for, after a latency drawn from a log-normal distribution. Supports
+    streaming (including the usage chunk), optional 429 injection and a simple
+    prompt cache: a system prompt seen before reports its tokens as cached,
+    like Azure's automatic prefix caching.
+
+    Serves both /openai/deployments/<deployment>/chat/completions (Azure) and
+    /v1/chat/completions (OpenAI), and GET /stats with request counters.
+    """
+
+    CHARS_PER_TOKEN = 4
+    # Azure caches prompts of at least 1024 tokens, in 128 token increments
+    MIN_CACHED_TOKENS = 1024
+    CACHE_INCREMENT = 128
+    STREAM_CHUNK_CHARS = 40
+
+    SAMPLE_VALUES: Dict[str, Any] = {
+        'Boolean': True,
+        'Integer': 7,
+        'Decimal': 7.5,
+        'Text': 'Sample text',
+        'Dictionary': {'summary': 'Sample text'},
+        'List': ['Sample item']
+    }
+
+    def __init__(self, evaluation_rules_path: str, host: str = '127.0.0.1', port: int = 0,
+                 latency_median: float = 1.5, latency_sigma: float = 0.5,
+                 seconds_per_output_token: float = 0.0, rate_limit_error_rate: float = 0.0,
+                 retry_after: float = 1.0, seed: Optional[int] = None):
+        """
+        Initialize the server.
+
+        Args:
+            evaluation_rules_path: Rules JSON the canned answers are built from
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one
+            latency_median: Median seconds before a response starts
+            latency_sigma: Sigma of the log-normal latency distribution; 0 makes latency fixed
+            seconds_per_output_token: Additional generation time per output token
+            rate_limit_error_rate: Fraction of requests answered with a 429
+            retry_after: Seconds sent in the Retry-After header of injected 429s
+            seed: Random seed for reproducible latencies and errors
+        """
+        with open(evaluation_rules_path, 'r', encoding='utf-8') as f:
+            self.evaluation_rules: Dict[str, Dict[str, Any]] = json.load(f)
+
+        self.host = host
+        self.port = port
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.seconds_per_output_token = seconds_per_output_token
+        self.rate_limit_error_rate = rate_limit_error_rate
+        self.retry_after = retry_after
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seen_system_prompts = set()
+        self.stats: Dict[str, int] = {
+            'requests': 0, 'rate_limited': 0, 'streamed': 0,
+            'prompt_tokens': 0, 'cached_prompt_tokens': 0, 'completion_tokens': 0
+        }
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Start serving on a background thread and return the base URL"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Mock LLM server listening on {self.base_url}")
+        return self.base_url
+
+    def serve_forever(self) -> None:
+        """Serve on the current thread until interrupted"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        logger.info(f"Mock LLM server listening on {self.base_url}")
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop the server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+
+    # ------------------------------------------------------------------------------
+    # Canned answers
+    # ------------------------------------------------------------------------------
+
+    def _requested_rules(self, prompt: str) -> List[str]:
+        """Rules a prompt asks for: its attribute names, or the Stage/Type its step instruction names"""
+        # History sent along with the prompt mentions other rules
+        marker = 'Based on the conversation history above, please answer: '
+        if marker in prompt:
+            prompt = prompt.split(marker, 1)[1]
+
+        # "Attribute Name: x" in rule definitions, "- x" in prompts that refer to the rulebook
+        candidates = re.findall(r'Attribute Name:\s+(\S+)', prompt) + re.findall(r'^- (\S+)$', prompt, re.MULTILINE)
+        names = list(dict.fromkeys(name for name in candidates if name in self.evaluation_rules))
+        if names:
+            return names
+
+        stage = re.search(r"Stage field value is '(\d+)'", prompt)
+        rule_type = re.search(r"Type is '([^']+)'", prompt)
+        return [
+            name for name, rule in self.evaluation_rules.items()
+            if rule.get('Type') not in ('_meta', 'System Instruction')
+            and (not stage or str(rule.get('Stage', 1)) == stage.group(1))
+            and (not rule_type or rule.get('Type') == rule_type.group(1))
+        ]
+
+    @staticmethod
+    def _schema_fields(rule: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """(field, type) pairs of a list rule's entries, from its embedded_schema or Specification"""
+        fields = []
+        schema = rule.get('embedded_schema') or ''
+        spec_fields = [line for line in str(rule.get('Specification') or '').splitlines() if line.strip().startswith('--')]
+        for line in schema.splitlines() or spec_fields:
+            if ':' not in line:
+                continue
+            name, field_type = line.split(':', 1)
+            name = name.strip(' -').replace('\\_', '_').replace(' ', '_')
+            if name:
+                fields.append((name, field_type.strip().split(' ')[0] or 'Text'))
+        return fields
+
+    def _sample_value(self, rule: Dict[str, Any]) -> Any:
+        # List results (value_type List, or the *_df rules) are lists of entries
+        is_list = rule.get('value_type') == 'List' or str(rule.get('Name', '')).endswith('_df')
+        fields = self._schema_fields(rule) if is_list else []
+        if fields:
+            return [{name: self.SAMPLE_VALUES.get(field_type, 'Sample text') for name, field_type in fields}]
+        if is_list:
+            return self.SAMPLE_VALUES['List']
+        return self.SAMPLE_VALUES.get(rule.get('value_type'), 'Sample text')
+
+    def _answer(self, prompt: str) -> str:
+        """Canned JSON evaluation of the rules the prompt asks for"""
+        answer = {}
+        for name in self._requested_rules(prompt):
+            rule = self.evaluation_rules[name]
+            answer[name] = {
+                'type': rule.get('Type'),
+                'sub_type': rule.get('Sub_Type'),
+                'value': self._sample_value(rule),
+                'eval': f"Mock evaluation of {name}",
+                'source': ['resume'],
+                'source_detail': ['Mock section']
+            }
+        return "```json\n" + json.dumps(answer, indent=2) + "\n```"
+
+    # ------------------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------------------
+
+    def _sample_latency(self) -> float:
+        with self._lock:
+            if self.latency_sigma <= 0:
+                return self.latency_median
+            return self._random.lognormvariate(0, self.latency_sigma) * self.latency_median
+
+    def _should_rate_limit(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.rate_limit_error_rate
+
+    def _usage(self, messages: List[Dict[str, Any]], completion: str) -> Dict[str, Any]:
+        """Token usage for a request, treating a repeated system prompt as cached"""
+        system_prompt = next((m.get('content') or '' for m in messages if m.get('role') in ('system', 'assistant')), '')
+        prompt_tokens = sum(len(str(m.get('content') or '')) for m in messages) // self.CHARS_PER_TOKEN
+        system_tokens = len(system_prompt) // self.CHARS_PER_TOKEN
+
+        digest = hashlib.sha256(system_prompt.encode('utf-8')).hexdigest()
+        with self._lock:
+            seen = digest in self._seen_system_prompts
+            self._seen_system_prompts.add(digest)
+
+        cached = 0
+        if seen and system_tokens >= self.MIN_CACHED_TOKENS:
+            cached = system_tokens - system_tokens % self.CACHE_INCREMENT
+
+        completion_tokens = len(completion) // self.CHARS_PER_TOKEN
+        return {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'prompt_tokens_details': {'cached_tokens': cached}
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip('/') == '/stats':
+                    self._send_json(200, server.get_stats())
+                else:
+                    self._send_json(404, {'error': {'message': 'Not found'}})
+
+            def do_POST(self):
+                path = self.path.split('?', 1)[0]
+                if not path.endswith('/chat/completions'):
+                    self._send_json(404, {'error': {'message': 'Not found'}})
+                    return
+
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                deployment = re.search(r'/deployments/([^/]+)/', path)
+                model = deployment.group(1) if deployment else request.get('model', 'mock')
+                server._count(requests=1)
+
+                if server._should_rate_limit():
+                    server._count(rate_limited=1)
+                    self._send_json(429, {'error': {'code': '429', 'message': 'Rate limit exceeded (mock)'}},
+                                    headers={'Retry-After': str(server.retry_after),
+                                             'retry-after-ms': str(int(server.retry_after * 1000))})
+                    return
+
+                messages = request.get('messages', [])
+                prompt = str(messages[-1].get('content', '')) if messages else ''
+                completion = server._answer(prompt)
+                usage = server._usage(messages, completion)
+                server._count(prompt_tokens=usage['prompt_tokens'],
+                              cached_prompt_tokens=usage['prompt_tokens_details']['cached_tokens'],
+                              completion_tokens=usage['completion_tokens'])
+
+                time.sleep(server._sample_latency())
+                base = {'id': f"chatcmpl-mock-{time.time_ns()}", 'created': int(time.time()), 'model': model}
+
+                if request.get('stream'):
+                    server._count(streamed=1)
+                    self._stream(base, completion, usage if (request.get('stream_options') or {}).get('include_usage') else None)
+                    return
+
+                time.sleep(server.seconds_per_output_token * usage['completion_tokens'])
+                self._send_json(200, {
+                    **base,
+                    'object': 'chat.completion',
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': completion}}],
+                    'usage': usage
+                })
+
+            def _stream(self, base: Dict[str, Any], completion: str, usage: Optional[Dict[str, Any]]) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+
+                def send(chunk: Dict[str, Any]) -> None:
+                    self.wfile.write(f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', **chunk})}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+
+                step = server.STREAM_CHUNK_CHARS
+                for start in range(0, len(completion), step):
+                    piece = completion[start:start + step]
+                    time.sleep(server.seconds_per_output_token * len(piece) / server.CHARS_PER_TOKEN)
+                    send({'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]})
+
+                send({'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})
+                if usage is not None:
+                    send({'choices': [], 'usage': usage})
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
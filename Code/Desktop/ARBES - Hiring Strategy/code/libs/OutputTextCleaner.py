@@ -63,6 +63,18 @@ class OutputTextCleaner:
         '&apos;': "'",
     }
 
+    # CHAR_REPLACEMENTS split for speed: single characters are replaced in one
+    # str.translate pass, entities (which all start with '&') in order afterwards
+    _CHAR_TRANSLATION = str.maketrans({old: new for old, new in CHAR_REPLACEMENTS.items() if len(old) == 1})
+    _ENTITY_REPLACEMENTS = [(old, new) for old, new in CHAR_REPLACEMENTS.items() if len(old) > 1]
+
+    _WHITESPACE = re.compile(r'\s+')
+    _NEWLINE = re.compile(r'\s*\n\s*')
+    _SPACE_BEFORE_BRACE = re.compile(r'"\s+}')
+    _SPACE_BEFORE_COMMA = re.compile(r'"\s+,')
+    _SPACE_BEFORE_COLON = re.compile(r'\s+:')
+    _SPACE_AFTER_COLON = re.compile(r':\s+')
+
     @classmethod
     def clean_text(cls, text: str, aggressive: bool = False) -> str:
         """
@@ -82,12 +94,14 @@ class OutputTextCleaner:
         text = unicodedata.normalize('NFKC', text)
         
         # Step 2: Apply character replacements
-        for old, new in cls.CHAR_REPLACEMENTS.items():
-            text = text.replace(old, new)
+        text = text.translate(cls._CHAR_TRANSLATION)
+        if '&' in text:
+            for old, new in cls._ENTITY_REPLACEMENTS:
+                text = text.replace(old, new)
         
         # Step 3: Handle whitespace
-        text = re.sub(r'\s+', ' ', text)  # Collapse multiple whitespace
-        text = re.sub(r'\s*\n\s*', '\n', text)  # Clean up newlines
+        text = cls._WHITESPACE.sub(' ', text)  # Collapse multiple whitespace
+        text = cls._NEWLINE.sub('\n', text)  # Clean up newlines
         
         if aggressive:
             # Step 4: Remove all characters except allowed ones
@@ -100,10 +114,10 @@ class OutputTextCleaner:
             text = ''.join(c for c in text if c in allowed_chars)
         
         # Step 5: Clean up edge cases
-        text = re.sub(r'"\s+}', '"}', text)  # Remove spaces before closing braces
-        text = re.sub(r'"\s+,', '",', text)  # Remove spaces before commas
-        text = re.sub(r'\s+:', ':', text)    # Remove spaces before colons
-        text = re.sub(r':\s+', ': ', text)   # Normalize spaces after colons
+        text = cls._SPACE_BEFORE_BRACE.sub('"}', text)  # Remove spaces before closing braces
+        text = cls._SPACE_BEFORE_COMMA.sub('",', text)  # Remove spaces before commas
+        text = cls._SPACE_BEFORE_COLON.sub(':', text)    # Remove spaces before colons
+        text = cls._SPACE_AFTER_COLON.sub(': ', text)   # Normalize spaces after colons
         
         return text.strip()
 
@@ -137,4 +151,39 @@ class OutputTextCleaner:
                 ]
             else:
                 cleaned[key] = value
-        return cleaned
\ No newline at end of file
+        return cleaned
+
+    # A string with none of these is returned unchanged by clean_text (non-aggressive):
+    # characters outside printable ASCII, runs of whitespace, whitespace before a
+    # colon or after a quote, HTML entities, and leading/trailing whitespace
+    _NEEDS_CLEANING = re.compile(r'[^\x20-\x7e]|\s\s|\s:|"\s|&|^\s|\s$')
+
+    @classmethod
+    def clean_string(cls, text: str) -> str:
+        """clean_text, skipping the work for strings it would leave unchanged"""
+        if cls._NEEDS_CLEANING.search(text) is None:
+            return text
+        return cls.clean_text(text)
+
+    @classmethod
+    def clean_json_strings(cls, data: Any) -> Any:
+        """
+        Clean every string in parsed JSON: values at any depth, including lists
+        of lists, and dictionary keys.
+
+        Args:
+            data: Parsed JSON value
+
+        Returns:
+            The value with cleaned strings
+        """
+        if isinstance(data, str):
+            return cls.clean_string(data)
+        if isinstance(data, dict):
+            return {
+                (cls.clean_string(key) if isinstance(key, str) else key): cls.clean_json_strings(value)
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [cls.clean_json_strings(item) for item in data]
+        return data
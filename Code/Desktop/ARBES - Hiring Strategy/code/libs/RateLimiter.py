@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to a fixed capacity."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of units the bucket can hold
+            refill_per_second: Units added back to the bucket every second
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.available = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Add the units earned since the last refill"""
+        elapsed = max(0.0, now - self.updated_at)
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)"""
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Remove units from the bucket"""
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one model/deployment."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Maximum number of calls per minute
+            tokens_per_minute: Maximum number of (estimated) tokens per minute
+        """
+        self.requests_per_minute = int(requests_per_minute)
+        self.tokens_per_minute = int(tokens_per_minute)
+
+        self._requests = TokenBucket(self.requests_per_minute, self.requests_per_minute / 60.0)
+        self._tokens = TokenBucket(self.tokens_per_minute, self.tokens_per_minute / 60.0)
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Take one request and `tokens` tokens if they fit, otherwise return the seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+
+            wait = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+            if wait <= 0:
+                self._requests.consume(1)
+                self._tokens.consume(tokens)
+            return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until one request and `tokens` tokens fit within the quota.
+
+        Args:
+            tokens: Estimated number of tokens the call will use
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                if waited:
+                    logger.debug(f"Rate limiter released after waiting {waited:.2f}s")
+                return waited
+
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Like acquire, but waits with asyncio.sleep so the event loop keeps running"""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                if waited:
+                    logger.debug(f"Rate limiter released after waiting {waited:.2f}s")
+                return waited
+
+            await asyncio.sleep(wait)
+            waited += wait
+
+
+# Process-wide registry of limiters keyed by model/deployment name
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str,
+                     requests_per_minute: Optional[int] = None,
+                     tokens_per_minute: Optional[int] = None) -> RateLimiter:
+    """
+    Get the shared limiter for a model/deployment, creating it on first use.
+
+    Limits are only applied when the limiter is created; later callers share
+    the existing quota regardless of the limits they pass.
+
+    Args:
+        key: Model or deployment name
+        requests_per_minute: Requests-per-minute quota for a new limiter
+        tokens_per_minute: Tokens-per-minute quota for a new limiter
+
+    Returns:
+        RateLimiter shared by every caller in the process using the same key
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            if requests_per_minute is None or tokens_per_minute is None:
+                raise ValueError(f"Rate limits required to create limiter for '{key}'")
+
+            limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+            _rate_limiters[key] = limiter
+            logger.info(f"Created rate limiter for {key}: "
+                        f"{requests_per_minute} RPM, {tokens_per_minute} TPM")
+        return limiter
@@ -0,0 +1,78 @@
+import json
+import re
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseJSONExtractor:
+    """
+    Finds and parses the JSON object in an LLM response in one pass.
+
+    The object is looked for after the first ``` fence if there is one,
+    otherwise from the start of the text. Parsing starts at the first '{' and,
+    if the text there is not a valid object (a brace in prose, for example),
+    a brace-balanced scan skips to the end of that span and tries the next '{'.
+    Raw control characters inside strings are accepted.
+    """
+
+    # Strings (skipped whole, so braces inside them don't count) and braces
+    _TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+    _DECODER = json.JSONDecoder(strict=False)
+
+    # Brace spans tried before giving up
+    MAX_CANDIDATES = 20
+
+    @classmethod
+    def _balanced_end(cls, text: str, start: int) -> Optional[int]:
+        """Index just past the '}' that closes the '{' at `start`, or None if it never closes"""
+        depth = 0
+        for match in cls._TOKEN.finditer(text, start):
+            token = match.group()
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        return None
+
+    @classmethod
+    def extract_object(cls, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse the JSON object in a response.
+
+        Args:
+            text: Raw response text
+
+        Returns:
+            The parsed object, or None if the text has no valid JSON object
+        """
+        if not isinstance(text, str):
+            return None
+
+        fence = text.find('```')
+        start = text.find('{', fence) if fence != -1 else -1
+        if start == -1:
+            start = text.find('{')
+
+        for _ in range(cls.MAX_CANDIDATES):
+            if start == -1:
+                return None
+
+            try:
+                value, _ = cls._DECODER.raw_decode(text, start)
+                if isinstance(value, dict):
+                    return value
+            except json.JSONDecodeError:
+                pass
+
+            # Not an object here; continue after this brace span
+            end = cls._balanced_end(text, start)
+            if end is None:
+                return None
+            start = text.find('{', end)
+
+        logger.debug(f"No JSON object found in the first {cls.MAX_CANDIDATES} brace spans")
+        return None
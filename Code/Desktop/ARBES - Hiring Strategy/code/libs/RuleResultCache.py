@@ -0,0 +1,97 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RuleResultCache:
+    """On-disk SQLite cache of parsed rule evaluation results."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rule_results ("
+            "  cache_key TEXT PRIMARY KEY,"
+            "  rule_name TEXT NOT NULL,"
+            "  result TEXT NOT NULL,"
+            "  created_at TEXT DEFAULT CURRENT_TIMESTAMP"
+            ")"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        logger.info(f"Rule result cache opened at {self.db_path}")
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """SHA-256 hex digest of a text"""
+        return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_key(document_hash: str, rule_name: str, rule: Dict[str, Any],
+                 model: str, base_instructions: str) -> str:
+        """
+        Build the cache key for one rule evaluated against one document.
+
+        Args:
+            document_hash: Hash of the document text (see hash_text)
+            rule_name: Name of the rule
+            rule: Full rule definition
+            model: Model the rule is evaluated with
+            base_instructions: Base system instructions
+
+        Returns:
+            Hex digest identifying the evaluation
+        """
+        payload = json.dumps(
+            [document_hash, rule_name, rule, model, base_instructions],
+            sort_keys=True,
+            ensure_ascii=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        """Return the cached result for a key, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM rule_results WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, cache_key: str, rule_name: str, result: Any) -> None:
+        """Store the result for a key, replacing any previous entry"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rule_results (cache_key, rule_name, result) VALUES (?, ?, ?)",
+                (cache_key, rule_name, json.dumps(result, ensure_ascii=True, default=str))
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RuleSizeEstimator:
+    """
+    Estimates the output tokens a rule's result needs, refined by observed results.
+
+    Also remembers which rules break the batches they are in, so planning can
+    give them a batch of their own.
+    """
+
+    # Starting estimates of result size by rule value_type
+    OUTPUT_TOKENS_BY_VALUE_TYPE: Dict[str, int] = {
+        'Boolean': 80,
+        'Integer': 100,
+        'Decimal': 100,
+        'Text': 250,
+        'Dictionary': 600,
+        'List': 1200
+    }
+    DEFAULT_OUTPUT_TOKENS = 250
+
+    # Each field of an embedded_schema makes every list entry larger
+    EMBEDDED_SCHEMA_FIELD_TOKENS = 200
+
+    # Weight of a new observation in the running average
+    SMOOTHING = 0.3
+
+    # A rule breaks batches once it has MIN_BATCH_RUNS recorded outcomes and at
+    # least BREAKS_BATCHES_RATE of them were failures; counts are halved past
+    # MAX_BATCH_RUNS so old outcomes fade.
+    MIN_BATCH_RUNS = 3
+    BREAKS_BATCHES_RATE = 0.5
+    MAX_BATCH_RUNS = 50
+
+    def __init__(self, hints_path: Optional[str] = None, chars_per_token: int = 4):
+        """
+        Initialize the estimator.
+
+        Args:
+            hints_path: Optional JSON file where observed sizes are kept between runs
+            chars_per_token: Characters per token used to size observed results
+        """
+        self.hints_path = Path(hints_path) if hints_path else None
+        self.chars_per_token = chars_per_token
+        self._lock = threading.Lock()
+
+        hints = self._load_hints()
+        self.observed_output_tokens: Dict[str, float] = hints.get('observed_output_tokens', {})
+        self.batch_outcomes: Dict[str, Dict[str, float]] = hints.get('batch_outcomes', {})
+
+    def _load_hints(self) -> Dict[str, Any]:
+        """Load observed sizes and batch outcomes from the hints file"""
+        if not self.hints_path or not self.hints_path.exists():
+            return {}
+
+        try:
+            with open(self.hints_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable size hints file {self.hints_path}: {str(e)}")
+            return {}
+
+    def _hint_output_tokens(self, rule: Dict[str, Any]) -> int:
+        """Estimate output tokens from the rule definition alone"""
+        tokens = self.OUTPUT_TOKENS_BY_VALUE_TYPE.get(rule.get('value_type'), self.DEFAULT_OUTPUT_TOKENS)
+
+        embedded_schema = rule.get('embedded_schema')
+        if embedded_schema:
+            schema_fields = [line for line in str(embedded_schema).splitlines() if line.strip()]
+            tokens += len(schema_fields) * self.EMBEDDED_SCHEMA_FIELD_TOKENS
+
+        return tokens
+
+    def estimate_output_tokens(self, rule_name: str, rule: Dict[str, Any]) -> int:
+        """
+        Estimate the output tokens for a rule's result.
+
+        Args:
+            rule_name: Name of the rule
+            rule: Rule definition
+
+        Returns:
+            Observed running average if the rule has been seen before, otherwise
+            an estimate from value_type and embedded_schema
+        """
+        with self._lock:
+            observed = self.observed_output_tokens.get(rule_name)
+
+        if observed is not None:
+            return int(observed)
+        return self._hint_output_tokens(rule)
+
+    def record_output(self, rule_name: str, result: Any) -> None:
+        """Fold the size of an actual rule result into the running average"""
+        tokens = len(json.dumps(result, ensure_ascii=False, default=str)) / self.chars_per_token
+
+        with self._lock:
+            previous = self.observed_output_tokens.get(rule_name)
+            if previous is None:
+                self.observed_output_tokens[rule_name] = tokens
+            else:
+                self.observed_output_tokens[rule_name] = (
+                    (1 - self.SMOOTHING) * previous + self.SMOOTHING * tokens
+                )
+
+    def record_batch_outcome(self, rule_names: List[str], failed: bool) -> None:
+        """
+        Record how batching went for some rules.
+
+        Args:
+            rule_names: Rules that got a result from a batch, or that a batch failure was narrowed down to
+            failed: Whether the rules broke their batch
+        """
+        with self._lock:
+            for rule_name in rule_names:
+                outcome = self.batch_outcomes.setdefault(rule_name, {'runs': 0, 'failures': 0})
+                outcome['runs'] += 1
+                outcome['failures'] += int(failed)
+                if outcome['runs'] > self.MAX_BATCH_RUNS:
+                    outcome['runs'] /= 2
+                    outcome['failures'] /= 2
+
+    def breaks_batches(self, rule_name: str) -> bool:
+        """Whether a rule chronically breaks the batches it is in"""
+        with self._lock:
+            outcome = self.batch_outcomes.get(rule_name)
+
+        return (outcome is not None
+                and outcome['runs'] >= self.MIN_BATCH_RUNS
+                and outcome.get('failures', 0) >= self.BREAKS_BATCHES_RATE * outcome['runs'])
+
+    def save(self) -> None:
+        """Write observed sizes and batch outcomes to the hints file, if one is configured"""
+        if not self.hints_path:
+            return
+
+        with self._lock:
+            data = {
+                'observed_output_tokens': dict(self.observed_output_tokens),
+                'batch_outcomes': {name: dict(outcome) for name, outcome in self.batch_outcomes.items()}
+            }
+
+        self.hints_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.hints_path.with_name(
+            f"{self.hints_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.hints_path)
@@ -0,0 +1,88 @@
+import gzip
+import os
+import tempfile
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from libs.RuleResultCache import RuleResultCache
+
+logger = logging.getLogger(__name__)
+
+
+class SourceTextStore:
+    """
+    Content-addressed store of document text, one gzip file per distinct text.
+
+    Texts are keyed by the SHA-256 of the text (the evaluator's document_hash),
+    so a document evaluated again, or a duplicate of it, is stored only once.
+    Files live at <store_dir>/<first two hex digits>/<hash>.txt.gz and are
+    written atomically, so concurrent writers of the same text are harmless.
+    """
+
+    # Metadata key holding the hash reference in place of source_txt
+    REFERENCE_KEY = 'source_txt_sha256'
+
+    def __init__(self, store_dir: str, compress_level: int = 6):
+        """
+        Args:
+            store_dir: Directory holding the compressed texts
+            compress_level: gzip compression level (1-9)
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.compress_level = compress_level
+        logger.info(f"Source text store opened at {self.store_dir}")
+
+    def path_for(self, content_hash: str) -> Path:
+        """File a text with this hash is stored in"""
+        return self.store_dir / content_hash[:2] / f"{content_hash}.txt.gz"
+
+    def contains(self, content_hash: str) -> bool:
+        """Whether a text with this hash is stored"""
+        return self.path_for(content_hash).exists()
+
+    def put(self, text: str, content_hash: Optional[str] = None) -> str:
+        """
+        Store a text unless it is already stored.
+
+        Args:
+            text: Text to store
+            content_hash: Its hash if already computed (see RuleResultCache.hash_text)
+
+        Returns:
+            The text's hash, to be kept as its reference
+        """
+        content_hash = content_hash or RuleResultCache.hash_text(text)
+        path = self.path_for(content_hash)
+        if path.exists():
+            return content_hash
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress((text or '').encode('utf-8'), compresslevel=self.compress_level))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        logger.debug(f"Stored source text {content_hash}")
+        return content_hash
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Return the text stored under a hash, or None if it is not stored"""
+        try:
+            with open(self.path_for(content_hash), 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except FileNotFoundError:
+            return None
+
+    def resolve(self, metadata: Dict[str, Any]) -> Optional[str]:
+        """Source text of an evaluation's metadata, whether embedded or referenced"""
+        if 'source_txt' in metadata:
+            return metadata['source_txt']
+        if self.REFERENCE_KEY in metadata:
+            return self.get(metadata[self.REFERENCE_KEY])
+        return None
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# Tests run against the code directory's libs/ and the shared lib/AI providers
+CODE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, CODE_DIR)
+sys.path.append(os.path.abspath(os.path.join(CODE_DIR, '..', '..', '..')))
+
+
+@pytest.fixture
+def rule_files():
+    """The rules and steps the evaluator scripts use"""
+    return (os.path.join(CODE_DIR, 'candidate_evaluation_rules.json'),
+            os.path.join(CODE_DIR, 'evaluation_steps.json'))
@@ -0,0 +1,57 @@
+import json
+import re
+from typing import Any, Dict, Iterable
+
+
+class ScriptedLLM:
+    """
+    Stand-in for an FFAI conversation.
+
+    Each call takes the next scripted outcome, if any: an exception is raised,
+    a string is returned and a callable gets the conversation and the
+    prompt and returns the response. Once the script is used up, every rule named in the prompt is
+    answered with a fenced JSON result. Forks share the script and prompts.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]], script: Iterable[Any] = ()):
+        self.rules = rules
+        self.script = list(script)
+        self.prompts = []
+
+    def answer(self, prompt: str, leave_out: Iterable[str] = ()) -> str:
+        """Fenced JSON result for every rule named in the prompt, except those in leave_out"""
+        results = {
+            name: {"type": rule.get('Type'), "value": "text", "eval": "ok"}
+            for name, rule in self.rules.items()
+            if not name.startswith('_') and name not in leave_out
+            and re.search(r'\b%s\b' % re.escape(name), prompt)
+        }
+        return "```json\n" + json.dumps(results) + "\n```"
+
+    def generate_response(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        if not self.script:
+            return self.answer(prompt)
+
+        outcome = self.script.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome(self, prompt) if callable(outcome) else outcome
+
+    async def generate_response_async(self, prompt: str, **kwargs) -> str:
+        return self.generate_response(prompt, **kwargs)
+
+    def fork(self) -> 'ScriptedLLM':
+        return self
+
+    def clear_conversation(self) -> None:
+        pass
+
+    def add_prompt_attr_interaction(self, prompt_name: str, response: Any, model: str = None) -> None:
+        pass
+
+    def get_last_usage(self):
+        return None
+
+    def get_token_usage_stats(self) -> Dict[str, int]:
+        return {}
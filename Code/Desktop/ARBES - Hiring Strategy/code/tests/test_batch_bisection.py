@@ -0,0 +1,79 @@
+import asyncio
+import uuid
+
+import httpx
+import openai
+import pytest
+from llama_index.core.schema import Document
+
+from fakes import ScriptedLLM
+from libs.AsyncDocumentEvaluator import AsyncDocumentEvaluator
+from libs.DocumentEvaluator import DocumentEvaluator
+
+RULES = ('email_address', 'residence_state', 'residence_country')
+TRUNCATED = '```json\n{"email_address": {"type": "Basic", "value": "jane@'
+
+
+def service_unavailable() -> RuntimeError:
+    response = httpx.Response(503, request=httpx.Request('POST', 'https://example.invalid'))
+    error = openai.InternalServerError("Error code: 503", response=response, body=None)
+    try:
+        raise RuntimeError(f"Error generating response from Azure OpenAI: {str(error)}") from error
+    except RuntimeError as wrapped:
+        return wrapped
+
+
+@pytest.fixture(params=['sync', 'async'])
+def evaluate(request, tmp_path, rule_files):
+    """Evaluate the RULES batch on a scripted conversation; returns the evaluator"""
+    evaluator_class = AsyncDocumentEvaluator if request.param == 'async' else DocumentEvaluator
+
+    def run(script, rules=RULES):
+        evaluator = evaluator_class(*rule_files, str(tmp_path))
+        evaluator._set_document('resume.txt', [Document(text="Jane Doe, Python engineer")])
+        evaluator.llm = ScriptedLLM(evaluator.evaluation_rules, script)
+        batch = [(name, evaluator.evaluation_rules[name]) for name in rules]
+        model = f"test-{uuid.uuid4()}"
+
+        if request.param == 'async':
+            results = asyncio.run(evaluator._evaluate_batch_async(batch, model, llm=evaluator.llm))
+        else:
+            results = evaluator._evaluate_batch(batch, model, llm=evaluator.llm)
+        assert set(results) == set(rules)
+        return evaluator
+
+    return run
+
+
+def failures(evaluator, rule_name):
+    return evaluator.size_estimator.batch_outcomes.get(rule_name, {}).get('failures', 0)
+
+
+def test_rule_isolated_by_bisection_is_blamed(evaluate):
+    # The batch and then the half holding only email_address come back cut off
+    evaluator = evaluate([TRUNCATED, TRUNCATED])
+
+    assert failures(evaluator, 'email_address') == 1
+    assert failures(evaluator, 'residence_state') == 0
+    assert failures(evaluator, 'residence_country') == 0
+
+
+def leave_out_email(llm, prompt):
+    return llm.answer(prompt, leave_out=['email_address'])
+
+
+def test_rule_left_out_after_bisection_is_blamed(evaluate):
+    evaluator = evaluate([TRUNCATED, leave_out_email])
+    assert failures(evaluator, 'email_address') == 1
+
+
+def test_service_errors_are_not_blamed(evaluate):
+    evaluator = evaluate([service_unavailable(), service_unavailable()])
+
+    for rule_name in RULES:
+        assert failures(evaluator, rule_name) == 0
+
+
+def test_rule_left_out_of_unbisected_batch_is_not_blamed(evaluate):
+    evaluator = evaluate([leave_out_email], rules=('email_address', 'residence_state'))
+    assert failures(evaluator, 'email_address') == 0
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+import openai
+import pytest
+from llama_index.core.schema import Document
+
+from fakes import ScriptedLLM
+from libs.AsyncDocumentEvaluator import AsyncDocumentEvaluator
+from libs.CircuitBreaker import CircuitBreaker, is_rate_limit_error, is_service_error
+from libs.DocumentEvaluator import DocumentEvaluator
+
+REQUEST = httpx.Request('POST', 'https://example.invalid/chat/completions')
+BREAKER_SETTINGS = {'min_calls': 3, 'failure_rate': 0.5, 'open_wait': 0}
+
+
+def status_error(status_code: int) -> openai.APIStatusError:
+    response = httpx.Response(status_code, request=REQUEST)
+    error_class = {429: openai.RateLimitError, 500: openai.InternalServerError}.get(status_code, openai.APIStatusError)
+    return error_class(f"Error code: {status_code}", response=response, body=None)
+
+
+def wrapped(error: Exception) -> RuntimeError:
+    """An error as the Azure client raises it"""
+    try:
+        raise error
+    except Exception as e:
+        try:
+            raise RuntimeError(f"Error generating response from Azure OpenAI: {str(e)}") from e
+        except RuntimeError as outer:
+            return outer
+
+
+class FailingLLM:
+    """Conversation whose calls all raise the same error"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def generate_response(self, **kwargs):
+        raise self.error
+
+    async def generate_response_async(self, **kwargs):
+        raise self.error
+
+    def get_last_usage(self):
+        return None
+
+
+@pytest.fixture
+def evaluator(tmp_path, rule_files):
+    return DocumentEvaluator(*rule_files, str(tmp_path),
+                             circuit_breaker=BREAKER_SETTINGS)
+
+
+@pytest.fixture
+def async_evaluator(tmp_path, rule_files):
+    return AsyncDocumentEvaluator(*rule_files, str(tmp_path),
+                                  circuit_breaker=BREAKER_SETTINGS)
+
+
+@pytest.mark.parametrize('error', [
+    wrapped(openai.APITimeoutError(request=REQUEST)),
+    wrapped(openai.APIConnectionError(request=REQUEST)),
+    wrapped(status_error(429)),
+    wrapped(status_error(500)),
+    wrapped(status_error(503)),
+])
+def test_service_errors(error):
+    assert is_service_error(error)
+
+
+@pytest.mark.parametrize('error', [
+    json.JSONDecodeError('Expecting value', '```json\n{"a": ', 12),
+    ValueError("Empty response received from LLM"),
+    wrapped(status_error(400)),
+    RuntimeError("Error generating response from Azure OpenAI: bad things"),
+])
+def test_response_errors_are_not_service_errors(error):
+    assert not is_service_error(error)
+
+
+def test_rate_limit_error_seen_through_wrapper():
+    assert is_rate_limit_error(wrapped(status_error(429)))
+    assert not is_rate_limit_error(wrapped(status_error(503)))
+    assert not is_rate_limit_error(RuntimeError("429 mentioned in a message"))
+
+
+def test_parse_errors_do_not_open_circuit(evaluator):
+    model = f"test-{uuid.uuid4()}"
+    llm = FailingLLM(json.JSONDecodeError('Expecting value', '```json\n{"a": ', 12))
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            evaluator._generate_response(llm, 'prompt', model, ['rule'])
+
+    assert evaluator._get_circuit_breaker(model).state == CircuitBreaker.CLOSED
+
+
+def test_service_errors_open_circuit(evaluator):
+    model = f"test-{uuid.uuid4()}"
+    llm = FailingLLM(wrapped(status_error(503)))
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            evaluator._generate_response(llm, 'prompt', model, ['rule'])
+
+    assert evaluator._get_circuit_breaker(model).state == CircuitBreaker.OPEN
+
+
+def test_async_classification(async_evaluator):
+    parse_model, service_model = f"test-{uuid.uuid4()}", f"test-{uuid.uuid4()}"
+
+    async def run():
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                await async_evaluator._generate_response_async(
+                    'prompt', parse_model, prompt_name='rule', llm=FailingLLM(ValueError("Unparseable")))
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await async_evaluator._generate_response_async(
+                    'prompt', service_model, prompt_name='rule', llm=FailingLLM(wrapped(status_error(500))))
+
+    asyncio.run(run())
+    assert async_evaluator._get_circuit_breaker(parse_model).state == CircuitBreaker.CLOSED
+    assert async_evaluator._get_circuit_breaker(service_model).state == CircuitBreaker.OPEN
+
+
+@pytest.mark.parametrize('evaluator_fixture', ['evaluator', 'async_evaluator'])
+def test_batch_retried_after_rate_limit(request, evaluator_fixture):
+    evaluator = request.getfixturevalue(evaluator_fixture)
+    evaluator._set_document('resume.txt', [Document(text="Jane Doe, Python engineer")])
+    batch = [(name, evaluator.evaluation_rules[name]) for name in ('email_address', 'residence_state')]
+    llm = ScriptedLLM(evaluator.evaluation_rules, [wrapped(status_error(429))])
+    model = f"test-{uuid.uuid4()}"
+
+    if evaluator_fixture == 'async_evaluator':
+        results = asyncio.run(evaluator._evaluate_batch_async(batch, model, llm=llm))
+    else:
+        results = evaluator._evaluate_batch(batch, model, llm=llm)
+
+    # The whole batch is sent again instead of being bisected
+    assert set(results) == {'email_address', 'residence_state'}
+    assert len(llm.prompts) == 2
@@ -0,0 +1,35 @@
+import pytest
+
+import libs.DocumentTextExtractor as text_extractor
+from fakes import ScriptedLLM
+from libs.AsyncDocumentEvaluator import AsyncDocumentEvaluator
+from libs.DocumentEvaluator import DocumentEvaluator
+
+JANE = "Jane Doe, Python engineer who built data pipelines and APIs for ten years at Acme Corp"
+
+
+@pytest.mark.parametrize('evaluator_class', [DocumentEvaluator, AsyncDocumentEvaluator])
+def test_text_extracted_for_dedupe_is_reused(tmp_path, rule_files, monkeypatch, evaluator_class):
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'jane.txt').write_text(JANE)
+    (docs / 'jane_copy.txt').write_text(JANE)
+    (docs / 'john.txt').write_text("John Roe, data analyst with ten years of SQL")
+    monkeypatch.setattr(DocumentEvaluator, '_get_ai', lambda evaluator, **kwargs: ScriptedLLM(evaluator.evaluation_rules))
+
+    pools = []
+    process_pool = text_extractor.ProcessPoolExecutor
+
+    def counting_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return process_pool(*args, **kwargs)
+
+    monkeypatch.setattr(text_extractor, 'ProcessPoolExecutor', counting_pool)
+
+    # No text cache, so only keeping the text saves parsing every file twice
+    evaluator = evaluator_class(*rule_files, str(tmp_path / 'out'), extract_workers=2, dedupe_threshold=1.0)
+    results = evaluator.evaluate_directory(str(docs))
+
+    assert len(results) == 2
+    assert len(pools) == 1
+    assert not (docs / 'jane.txt').exists() and not (docs / 'jane_copy.txt').exists()
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import shutil
+import traceback
+from pathlib import Path
+
+import pytest
+
+from fakes import ScriptedLLM
+from libs.AsyncDocumentEvaluator import AsyncDocumentEvaluator
+from libs.DocumentEvaluator import DocumentEvaluator
+from libs.DocumentTextCache import DocumentTextCache
+from libs.EvaluationCheckpoint import EvaluationCheckpoint
+
+
+def test_records_survive_reopen(tmp_path):
+    journal = tmp_path / 'checkpoint.jsonl'
+    checkpoint = EvaluationCheckpoint(str(journal))
+    checkpoint.record_rule('doc', 'r1', 'k1', 1, {'value': 1})
+    checkpoint.record_exported('other', 'out.json')
+    checkpoint.close()
+
+    reloaded = EvaluationCheckpoint(str(journal))
+    assert reloaded.get_rule('doc', 'r1', 'k1') == {'value': 1}
+    assert reloaded.get_rule('doc', 'r1', 'changed') is None
+    assert reloaded.is_exported('other')
+    reloaded.close()
+
+
+def test_record_after_torn_line_is_kept(tmp_path):
+    journal = tmp_path / 'checkpoint.jsonl'
+    checkpoint = EvaluationCheckpoint(str(journal))
+    checkpoint.record_rule('doc', 'r1', 'k1', 1, {'value': 1})
+    checkpoint.close()
+
+    # A run that died halfway through writing a line
+    with open(journal, 'a', encoding='utf-8') as f:
+        f.write('{"event": "rule", "document": "doc", "ru')
+
+    checkpoint = EvaluationCheckpoint(str(journal))
+    checkpoint.record_rule('doc', 'r2', 'k2', 1, {'value': 2})
+    checkpoint.record_exported('doc2', 'out.json')
+    checkpoint.close()
+
+    reloaded = EvaluationCheckpoint(str(journal))
+    assert reloaded.get_rule('doc', 'r1', 'k1') == {'value': 1}
+    assert reloaded.get_rule('doc', 'r2', 'k2') == {'value': 2}
+    assert reloaded.is_exported('doc2')
+    assert journal.read_text(encoding='utf-8').endswith('\n')
+    reloaded.close()
+
+
+def test_torn_only_line_empties_journal(tmp_path):
+    journal = tmp_path / 'checkpoint.jsonl'
+    journal.write_text('{"event": "expo', encoding='utf-8')
+
+    checkpoint = EvaluationCheckpoint(str(journal))
+    checkpoint.record_exported('doc', 'out.json')
+    checkpoint.close()
+
+    assert EvaluationCheckpoint(str(journal)).is_exported('doc')
+
+
+def test_document_file_hashed_once(tmp_path, rule_files, monkeypatch):
+    resume = tmp_path / 'resume.txt'
+    resume.write_text("Jane Doe, Python engineer")
+    evaluator = DocumentEvaluator(*rule_files, str(tmp_path / 'out'),
+                                  checkpoint_path=str(tmp_path / 'checkpoint.jsonl'),
+                                  text_cache_path=str(tmp_path / 'text_cache.db'))
+
+    hashed = []
+    sha256 = hashlib.sha256
+
+    def counting_sha256(*args):
+        hashed.append(traceback.extract_stack(limit=2)[0].name)
+        return sha256(*args)
+
+    monkeypatch.setattr(hashlib, 'sha256', counting_sha256)
+    monkeypatch.setattr(evaluator, 'evaluate_document', lambda: {})
+    monkeypatch.setattr(evaluator, 'export_results', lambda *args: None)
+
+    evaluator._evaluate_document_file(resume)
+
+    # The file's bytes are hashed once; hash_text hashes the extracted text
+    assert [name for name in hashed if name != 'hash_text'] == ['hash_file']
+    monkeypatch.undo()
+    assert evaluator.document_key == DocumentTextCache.hash_file(str(resume))
+
+
+@pytest.mark.parametrize('evaluator_class', [DocumentEvaluator, AsyncDocumentEvaluator])
+def test_directory_files_hashed_once(tmp_path, rule_files, monkeypatch, evaluator_class):
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'jane.txt').write_text("Jane Doe, Python engineer")
+    (docs / 'john.txt').write_text("John Roe, data analyst with ten years of SQL")
+    monkeypatch.setattr(DocumentEvaluator, '_get_ai', lambda evaluator, **kwargs: ScriptedLLM(evaluator.evaluation_rules))
+
+    evaluator = evaluator_class(*rule_files, str(tmp_path / 'out'),
+                                checkpoint_path=str(tmp_path / 'checkpoint.jsonl'),
+                                text_cache_path=str(tmp_path / 'text_cache.db'),
+                                extract_workers=2, dedupe_threshold=0.9)
+
+    hashed = []
+    hash_file = DocumentTextCache.hash_file
+    monkeypatch.setattr(DocumentTextCache, 'hash_file',
+                        staticmethod(lambda file_path, *args: hashed.append(file_path) or hash_file(file_path, *args)))
+
+    assert len(evaluator.evaluate_directory(str(docs))) == 2
+    assert sorted(hashed) == sorted(str(docs / name) for name in ('jane.txt', 'john.txt'))
+
+
+def test_document_added_again_after_rule_change_is_evaluated(tmp_path, rule_files, monkeypatch):
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'resume.txt').write_text("Jane Doe, Python engineer")
+    prompts = []
+
+    def scripted_ai(evaluator, **kwargs):
+        llm = ScriptedLLM(evaluator.evaluation_rules)
+        llm.prompts = prompts
+        return llm
+
+    monkeypatch.setattr(DocumentEvaluator, '_get_ai', scripted_ai)
+
+    def run(rules_path):
+        evaluator = DocumentEvaluator(rules_path, rule_files[1], str(tmp_path / 'out'),
+                                      cache_path=str(tmp_path / 'rules.sqlite'),
+                                      checkpoint_path=str(tmp_path / 'checkpoint.jsonl'))
+        prompts.clear()
+        results = evaluator.evaluate_directory(str(docs))
+        evaluator.checkpoint.close()
+        return len(results), len(prompts)
+
+    exported, calls = run(rule_files[0])
+    assert exported == 1 and calls > 0
+
+    # Unchanged rulebook: the document put back is skipped
+    shutil.copy(docs / 'processed' / 'resume.txt', docs / 'resume.txt')
+    assert run(rule_files[0]) == (0, 0)
+
+    # One rule changed: evaluated again, the unchanged rules coming from the result cache
+    rules = json.loads(Path(rule_files[0]).read_text(encoding='utf-8'))
+    rules['email_address']['Description'] += ' (work address preferred)'
+    changed_rules = tmp_path / 'rules.json'
+    changed_rules.write_text(json.dumps(rules), encoding='utf-8')
+    shutil.copy(docs / 'processed' / 'resume.txt', docs / 'resume.txt')
+
+    exported, recalls = run(str(changed_rules))
+    assert exported == 1
+    assert 0 < recalls < calls
@@ -0,0 +1,73 @@
+import pytest
+
+from libs.EvaluationJobQueue import EvaluationJobQueue
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / 'resume.txt'
+    path.write_text("Jane Doe", encoding='utf-8')
+    return path
+
+
+def open_queue(tmp_path, **kwargs):
+    return EvaluationJobQueue(str(tmp_path / 'queue.sqlite'), retry_seconds=0, **kwargs)
+
+
+def test_file_version_queued_once(tmp_path, document):
+    queue = open_queue(tmp_path)
+    assert queue.enqueue(document)
+    assert not queue.enqueue(document)
+    assert queue.counts() == {'queued': 1}
+
+
+def test_failed_job_dead_lettered_after_max_attempts(tmp_path, document):
+    queue = open_queue(tmp_path, max_attempts=2)
+    queue.enqueue(document)
+
+    job = queue.claim()
+    assert not queue.fail(job, "first")
+    job = queue.claim()
+    assert job.attempts == 2
+    assert queue.fail(job, "second")
+
+    assert queue.claim() is None
+    dead = queue.dead_letters()
+    assert [(d['attempts'], d['last_error']) for d in dead] == [(2, "second")]
+
+    assert queue.retry_dead(dead[0]['id']) == 1
+    assert queue.claim().attempts == 1
+
+
+def test_retry_waits_for_backoff(tmp_path, document):
+    queue = EvaluationJobQueue(str(tmp_path / 'queue.sqlite'), max_attempts=3, retry_seconds=60)
+    queue.enqueue(document)
+    queue.fail(queue.claim(), "boom")
+    assert queue.claim() is None
+    assert queue.counts() == {'queued': 1}
+
+
+def test_running_jobs_requeued_after_restart(tmp_path, document):
+    queue = open_queue(tmp_path, max_attempts=3)
+    queue.enqueue(document)
+    queue.claim()
+    queue.close()
+
+    restarted = open_queue(tmp_path, max_attempts=3)
+    assert restarted.requeue_running() == 1
+    assert restarted.claim().attempts == 2
+
+
+def test_job_that_keeps_killing_the_process_is_dead_lettered(tmp_path, document):
+    for _ in range(2):
+        queue = open_queue(tmp_path, max_attempts=2)
+        queue.requeue_running()
+        queue.enqueue(document)
+        assert queue.claim() is not None
+        # The process dies while evaluating the document
+        queue.close()
+
+    queue = open_queue(tmp_path, max_attempts=2)
+    assert queue.requeue_running() == 0
+    assert queue.claim() is None
+    assert [d['attempts'] for d in queue.dead_letters()] == [2]
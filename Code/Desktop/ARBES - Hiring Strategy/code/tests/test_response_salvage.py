@@ -0,0 +1,29 @@
+import uuid
+
+from llama_index.core.schema import Document
+
+from fakes import ScriptedLLM
+from lib.AI.FFAI_AzureOpenAI import FFAI_AzureOpenAI
+from libs.DocumentEvaluator import DocumentEvaluator
+
+# Cut off at the token limit after the first rule's result
+TRUNCATED = ('```json\n{"email_address": {"type": "Basic", "value": "jane@example.com", "eval": "ok"}, '
+             '"residence_state": {"type": "Basic", "val')
+
+
+def test_completed_rules_kept_from_truncated_response(tmp_path, rule_files):
+    evaluator = DocumentEvaluator(*rule_files, str(tmp_path))
+    evaluator._set_document('resume.txt', [Document(text="Jane Doe, jane@example.com, Austin, TX")])
+
+    client = ScriptedLLM(evaluator.evaluation_rules, [TRUNCATED])
+    client.model = 'gpt-4o'
+    evaluator.llm = FFAI_AzureOpenAI(client)
+
+    batch = [(name, evaluator.evaluation_rules[name]) for name in ('email_address', 'residence_state')]
+    results = evaluator._evaluate_batch(batch, f"test-{uuid.uuid4()}", llm=evaluator.llm)
+
+    # email_address is taken from the cut off response; only residence_state is asked again
+    assert results['email_address']['value'] == 'jane@example.com'
+    assert 'residence_state' in results
+    assert len(client.prompts) == 2
+    assert evaluator.llm.get_interaction_history()[0]['response'] == TRUNCATED
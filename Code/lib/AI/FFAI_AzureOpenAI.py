@@ -1,11 +1,13 @@
 # Copyright (c) 2024 Antonio Quinonez
 # Licensed under the MIT License. See LICENSE in the project root for license information.
 
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
 from datetime import datetime
 import logging
 import time
 import json
+import copy
+import threading
 
 from .OrderedPromptHistory import OrderedPromptHistory
 from .PermanentHistory import PermanentHistory
@@ -29,6 +31,9 @@ class FFAI_AzureOpenAI:
 
         self.named_prompt_ordered_history=OrderedPromptHistory()
 
+        # Shared with forks, which record into the same histories
+        self._history_lock = threading.RLock()
+
     def _clean_response(self, response: str) -> Any:
         """Process and validate the evaluation response"""
 
@@ -126,8 +131,9 @@ class FFAI_AzureOpenAI:
                          prompt_name: Optional[str] = None,
                          history: Optional[List[str]] = None,
                          dependencies: Optional[dict] = None,
+                         stream_callback: Optional[Callable[[str], None]] = None,
                          **kwargs ) -> str:
-        """Generate response using Azure OpenAI"""
+        """Generate response using Azure OpenAI; stream_callback receives the response text as it streams in"""
         logger.debug(f"\n===================================================================================")
         logger.info(f"Generating response for prompt: '{prompt}'")
         logger.debug(f"Prompt_name: '{prompt_name}'")
@@ -151,19 +157,41 @@ class FFAI_AzureOpenAI:
             # ==================================================================================
             # logger.debug(f"is_o1: {is_o1}")
 
-            response = self.client.generate_response(prompt=final_prompt, model=used_model)
+            if stream_callback is not None:
+                response = self.client.generate_response(prompt=final_prompt, model=used_model, stream_callback=stream_callback)
+            else:
+                response = self.client.generate_response(prompt=final_prompt, model=used_model)
             logger.debug(f"Generated response: {response}")
 
+            self._record_interaction(prompt, response, prompt_name, used_model, history)
+
+            return response
+            
+        except Exception as e:
+            logger.error(f"Problem with response generation: {str(e)}")
+            logger.error(f"Prompt: {prompt}")
+            logger.error(f"History: {history}")
+            raise
+
+    def _record_interaction(self, prompt: str, response: str, prompt_name: Optional[str], used_model: str, history: Optional[List[str]]) -> None:
+        """Record a prompt and its response in all histories"""
+        with self._history_lock:
             # turn response into a dict if a JSON responses.
-            cleaned_response = self._clean_response(response)
+            try:
+                cleaned_response = self._clean_response(response)
+            except json.JSONDecodeError:
+                # Cut off or malformed JSON: keep the raw text, so the caller gets the
+                # response back and can salvage what is complete in it
+                logger.warning(f"Recording unparseable response for {prompt_name} as raw text")
+                cleaned_response = response
             logger.debug(f"cleaned_response: {cleaned_response}")
-            
+        
             # ==================================================================================
             # ADD TO PERMANENT HISTORY
             # ==================================================================================
             # 1) Add user prompt to histories
             self.permanent_history.add_turn_user(prompt)
-        
+    
             # 2) Add response to histories
             self.permanent_history.add_turn_assistant(response)
 
@@ -177,7 +205,7 @@ class FFAI_AzureOpenAI:
                                 prompt_name: {prompt_name}
                                 history: {history}
             """)
-        
+    
 
             # SELF.HISTORY -- Store interaction to self.history ---------------------------------
             interaction = {
@@ -240,10 +268,37 @@ class FFAI_AzureOpenAI:
             )
             # ==================================================================================
 
+    async def generate_response_async(self,
+                         prompt: str,
+                         model: Optional[str] = None,
+                         prompt_name: Optional[str] = None,
+                         history: Optional[List[str]] = None,
+                         dependencies: Optional[dict] = None,
+                         stream_callback: Optional[Callable[[str], None]] = None,
+                         **kwargs ) -> str:
+        """Async version of generate_response; the wrapped client must provide generate_response_async"""
+        logger.info(f"Generating async response for prompt: '{prompt}'")
+        logger.debug(f"Prompt_name: '{prompt_name}'")
+
+        used_model = model if model else self.client.model
+
+        if dependencies:
+            dependencies = list(set(dependencies))
+
+        try:
+            final_prompt = self._build_prompt(prompt, history, dependencies)
+            if stream_callback is not None:
+                response = await self.client.generate_response_async(prompt=final_prompt, model=used_model, stream_callback=stream_callback)
+            else:
+                response = await self.client.generate_response_async(prompt=final_prompt, model=used_model)
+            logger.debug(f"Generated response: {response}")
+
+            self._record_interaction(prompt, response, prompt_name, used_model, history)
+
             return response
-            
+
         except Exception as e:
-            logger.error(f"Problem with response generation: {str(e)}")
+            logger.error(f"Problem with async response generation: {str(e)}")
             logger.error(f"Prompt: {prompt}")
             logger.error(f"History: {history}")
             raise
@@ -252,6 +307,36 @@ class FFAI_AzureOpenAI:
         """Clear conversation in client but retain history"""
         self.client.clear_conversation()
 
+    async def aclose(self) -> None:
+        """Close the wrapped client's connections"""
+        await self.client.aclose()
+
+    def fork(self) -> 'FFAI_AzureOpenAI':
+        """
+        Handle with its own client conversation that records into the same histories.
+
+        Use one fork per concurrent caller: conversations stay separate while
+        named results stay visible to every fork as history.
+        """
+        forked = copy.copy(self)
+        forked.client = self.client.fork()
+        return forked
+
+    def add_prompt_attr_interaction(self, prompt_name: str, response: Any, model: Optional[str] = None) -> None:
+        """Record a named response obtained outside of this client (e.g. from a cache) so later prompts can use it as history"""
+        attr_interaction = {
+            'prompt': prompt_name,
+            'response': response,
+            'prompt_name': prompt_name,
+            'timestamp': time.time(),
+            'model': model if model else self.client.model,
+            'history': None
+        }
+
+        with self._history_lock:
+            self.prompt_attr_history.append(attr_interaction)
+        logger.debug(f"Added external attr interaction to self.prompt_attr_history: {attr_interaction}")
+
     def get_interaction_history(self) -> List[Dict[str, Any]]:
         """Get complete history"""
         return self.history
@@ -316,6 +401,15 @@ class FFAI_AzureOpenAI:
             usage_stats[interaction.model] = usage_stats.get(interaction.model, 0) + 1
         return usage_stats
 
+    def get_token_usage_stats(self) -> Dict[str, int]:
+        """Get token totals reported by the client, including prompt tokens served from the provider's cache"""
+        usage_stats = getattr(self.client, 'usage_stats', None)
+        return usage_stats() if usage_stats else {}
+
+    def get_last_usage(self) -> Optional[Dict[str, int]]:
+        """Get the token usage the client reported for this conversation's latest call, if any"""
+        return getattr(self.client, 'last_usage', None)
+
     def get_prompt_name_usage_stats(self) -> Dict[str, int]:
         """Get statistics on prompt name usage"""
         return self.ordered_history.get_prompt_name_usage_stats()
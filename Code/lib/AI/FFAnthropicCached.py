@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import Optional, List, Dict, Any, Tuple
+import copy
 import logging
 import os
+import threading
 
 from .OrderedPromptHistory import OrderedPromptHistory
 from .ConversationHistory import ConversationHistory
@@ -20,6 +22,9 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 class FFAnthropicCached:
+    # Anthropic allows at most 4 cache breakpoints per request
+    MAX_CACHE_BREAKPOINTS = 4
+
     def __init__(self, config: Optional[dict] = None, **kwargs):
         logger.info("Initializing FFAnthropicCached")
 
@@ -46,6 +51,21 @@ class FFAnthropicCached:
         self.temperature = float(all_config.get('temperature', default_temperature)) if all_config else float(os.getenv('ANTHROPIC_TEMPERATURE', default_temperature))
 
         self.system_instructions = config.get('system_instructions', default_instructions) if config else os.getenv('ANTHROPIC_ASSISTANT_INSTRUCTIONS', default_instructions)
+
+        # Stable-first parts of the system prompt; each one ends in a cache breakpoint
+        segments = all_config.get('system_instruction_segments')
+        if segments:
+            self.system_instruction_segments = [segment for segment in segments if segment]
+            self.system_instructions = ''.join(self.system_instruction_segments)
+        else:
+            self.system_instruction_segments = [self.system_instructions]
+
+        # Shared with forks
+        self._usage = {'calls': 0, 'prompt_tokens': 0, 'cached_prompt_tokens': 0,
+                       'cache_write_tokens': 0, 'completion_tokens': 0}
+        self._usage_lock = threading.Lock()
+        # Usage of this handle's latest call
+        self.last_usage: Optional[Dict[str, int]] = None
         
         self.conversation_history = ConversationHistory()
         self.permanent_history = PermanentHistory()
@@ -68,6 +88,7 @@ class FFAnthropicCached:
         logger.debug(f"Generating response for prompt: {prompt}")
         used_model = model if model else self.model
         logger.debug(f"Using model: {used_model}")
+        self.last_usage = None
         try: 
             self.conversation_history.add_turn_user(prompt)
             self.permanent_history.add_turn_user(prompt)
@@ -81,14 +102,11 @@ class FFAnthropicCached:
                 model=used_model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
-                system=[{
-                    "type": "text",
-                    "text": self.system_instructions,
-                    "cache_control": {"type": "ephemeral"}
-                }],
+                system=self._system_blocks(),
                 messages=turns,
                 extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
             )
+            self._record_usage(response.usage)
 
             assistant_response = response.content[0].text
 
@@ -110,6 +128,51 @@ class FFAnthropicCached:
             
             raise RuntimeError(f"Error generating response from Claude: {str(e)}")
 
+    def _system_blocks(self) -> List[Dict[str, Any]]:
+        """System prompt blocks, with a cache breakpoint after each of the last MAX_CACHE_BREAKPOINTS segments"""
+        first_cached = max(0, len(self.system_instruction_segments) - self.MAX_CACHE_BREAKPOINTS)
+        blocks = []
+        for index, segment in enumerate(self.system_instruction_segments):
+            block = {"type": "text", "text": segment}
+            if index >= first_cached:
+                block["cache_control"] = {"type": "ephemeral"}
+            blocks.append(block)
+        return blocks
+
+    def _record_usage(self, usage) -> None:
+        """Add a response's token usage, including prompt cache reads and writes"""
+        if usage is None:
+            return
+
+        cache_read = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        cache_write = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+
+        self.last_usage = {
+            'prompt_tokens': (usage.input_tokens or 0) + cache_read + cache_write,
+            'cached_prompt_tokens': cache_read,
+            'cache_write_tokens': cache_write,
+            'completion_tokens': usage.output_tokens or 0
+        }
+
+        with self._usage_lock:
+            self._usage['calls'] += 1
+            for name, value in self.last_usage.items():
+                self._usage[name] += value
+
+        logger.debug(f"Usage: {usage.input_tokens} uncached input tokens, {cache_read} read from cache, "
+                     f"{cache_write} written to cache, {usage.output_tokens} output tokens")
+
+    def usage_stats(self) -> Dict[str, int]:
+        """Token usage totals of this client and its forks"""
+        with self._usage_lock:
+            return dict(self._usage)
+
+    def fork(self) -> 'FFAnthropicCached':
+        """Handle with its own, empty conversation that shares the client, histories and usage totals"""
+        forked = copy.copy(self)
+        forked.conversation_history = ConversationHistory()
+        return forked
+
     # OrderedPromptHistory interface methods
     def get_interaction_history(self) -> List[Dict[str, Any]]:
         """Get all interactions as a list of dictionaries"""
@@ -2,11 +2,13 @@
 # Licensed under the MIT License. See LICENSE in the project root for license information.
 
 import os
+import copy
 import time
 import logging
-from typing import Optional
+import threading
+from typing import Callable, Dict, Optional
 # from openai import OpenAI
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -50,6 +52,10 @@ class FFAzureOpenAI:
                     self.max_completion_tokens = int(value)
                 case 'system_instructions':
                     self.system_instructions = value
+                case 'system_instruction_segments' if value:
+                    # Stable-first parts of the system prompt; sent as one message,
+                    # which keeps the prefix byte-identical for automatic prompt caching
+                    self.system_instructions = ''.join(value)
 
         # Set default values if not set
         self.api_key = getattr(self, 'api_key', os.getenv('AZUREOPENAI_TOKEN'))
@@ -85,6 +91,16 @@ class FFAzureOpenAI:
 
         self.conversation_history = []
         self.client: AzureOpenAI = self._initialize_client()
+        # Held in a dict so forks share the async client (even if it is created
+        # after forking) and the token usage totals
+        self._shared: dict = {
+            'async_client': None,
+            'usage': {'calls': 0, 'prompt_tokens': 0, 'cached_prompt_tokens': 0, 'completion_tokens': 0},
+            'usage_lock': threading.Lock(),
+            'stream_usage': True
+        }
+        # Usage of this handle's latest call
+        self.last_usage: Optional[Dict[str, int]] = None
 
     def _initialize_client(self) -> AzureOpenAI:
         """Initialize and return the OpenAI client."""
@@ -101,17 +117,68 @@ class FFAzureOpenAI:
                             api_version = api_version
         )
 
+    @property
+    def async_client(self) -> AsyncAzureOpenAI:
+        """AsyncAzureOpenAI client with the same credentials, created on first use"""
+        if self._shared['async_client'] is None:
+            logger.info("Initializing async Azure OpenAI client")
+            self._shared['async_client'] = AsyncAzureOpenAI(
+                api_key=self.client.api_key,
+                azure_endpoint=os.getenv('AZUREOPENAI_BASE'),
+                api_version=os.getenv('AZURE_API_VERSION') or '2024-08-01-preview'
+            )
+        return self._shared['async_client']
 
-    from inspect import signature
+    def _record_usage(self, usage) -> None:
+        """Add a response's token usage, including prompt tokens served from the prompt cache"""
+        if usage is None:
+            return
 
-    def generate_response(self, prompt: str, model: Optional[str] = None, is_o1: Optional[bool] = None, infer_o1:Optional[bool] = None, prompt_name: Optional[str] = None) -> str:
-        logger.debug(f"Generating response for prompt: {prompt}")
-        logger.debug("Method args")
-        logger.debug(locals())
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = (getattr(details, 'cached_tokens', 0) or 0) if details else 0
+
+        self.last_usage = {
+            'prompt_tokens': usage.prompt_tokens or 0,
+            'cached_prompt_tokens': cached_tokens,
+            'completion_tokens': usage.completion_tokens or 0
+        }
+
+        with self._shared['usage_lock']:
+            totals = self._shared['usage']
+            totals['calls'] += 1
+            for name, value in self.last_usage.items():
+                totals[name] += value
+
+        logger.debug(f"Usage: {usage.prompt_tokens} prompt tokens ({cached_tokens} cached), "
+                     f"{usage.completion_tokens} completion tokens")
+
+    def usage_stats(self) -> Dict[str, int]:
+        """Token usage totals of this client and its forks"""
+        with self._shared['usage_lock']:
+            return dict(self._shared['usage'])
+
+    def _stream_params(self, params: dict) -> dict:
+        """Streaming arguments; asks for usage in the last chunk unless the deployment rejected that before"""
+        if self._shared['stream_usage']:
+            return {**params, 'stream': True, 'stream_options': {'include_usage': True}}
+        return {**params, 'stream': True}
+
+    def _is_stream_options_rejected(self, error: Exception) -> bool:
+        """Whether the API version in use does not accept stream_options; stop sending it if so"""
+        if self._shared['stream_usage'] and 'stream_options' in str(error):
+            logger.warning("Deployment does not accept stream_options; streamed calls will not report token usage")
+            self._shared['stream_usage'] = False
+            return True
+        return False
+
+
+    from inspect import signature
 
+    def _resolve_is_o1(self, model: Optional[str], is_o1: Optional[bool], infer_o1: Optional[bool]) -> bool:
+        """Work out whether a call uses an o1 type model"""
         method_is_o1 = is_o1
 
-        # are we using the model and is_o1 from init or the one passed with the generate_response method?
+        # are we using the model and is_o1 from init or the one passed with the method call?
         used_model = model if model else self.model
         logger.debug(f"Using model: {used_model}")
 
@@ -140,6 +207,94 @@ class FFAzureOpenAI:
             is_o1 = False
             logger.debug(f"DEFAULT for is_o1 = False")
 
+        return is_o1
+
+    def _completion_params(self, used_model: str, messages: list, is_o1: bool) -> dict:
+        """chat.completions.create arguments; o1 models take max_completion_tokens and no temperature"""
+        if is_o1 == True:
+            return {
+                'model': used_model,
+                'messages': messages,
+                'max_completion_tokens': getattr(self, 'max_completion_tokens', self._defaults['max_completion_tokens'])
+            }
+        return {
+            'model': used_model,
+            'messages': messages,
+            'max_tokens': getattr(self, 'max_tokens', self._defaults['max_tokens']),
+            'temperature': self.temperature
+        }
+
+    def _stream_completion(self, params: dict, stream_callback: Callable[[str], None]) -> str:
+        """Stream a completion, passing each piece of text to stream_callback, and return the full text"""
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(**self._stream_params(params))
+        except Exception as e:
+            if not self._is_stream_options_rejected(e):
+                raise
+            stream = self.client.chat.completions.create(**self._stream_params(params))
+
+        for chunk in stream:
+            # Usage comes in a last chunk without choices; Azure also sends content
+            # filter results as chunks without choices
+            if getattr(chunk, 'usage', None):
+                self._record_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                stream_callback(delta)
+
+            if chunk.choices[0].finish_reason == 'length':
+                logger.warning(f"Streamed response from {params['model']} was cut off at the token limit")
+
+        return ''.join(parts)
+
+    async def _stream_completion_async(self, params: dict, stream_callback: Callable[[str], None]) -> str:
+        """Async version of _stream_completion"""
+        parts = []
+        try:
+            stream = await self.async_client.chat.completions.create(**self._stream_params(params))
+        except Exception as e:
+            if not self._is_stream_options_rejected(e):
+                raise
+            stream = await self.async_client.chat.completions.create(**self._stream_params(params))
+
+        async for chunk in stream:
+            if getattr(chunk, 'usage', None):
+                self._record_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                stream_callback(delta)
+
+            if chunk.choices[0].finish_reason == 'length':
+                logger.warning(f"Streamed response from {params['model']} was cut off at the token limit")
+
+        return ''.join(parts)
+
+    def generate_response(self, prompt: str, model: Optional[str] = None, is_o1: Optional[bool] = None, infer_o1:Optional[bool] = None, prompt_name: Optional[str] = None,
+                          stream_callback: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Generate a response to a prompt in the current conversation.
+
+        If stream_callback is given, the response is streamed and each piece of
+        text is passed to it as it arrives. o1 models are not streamed; the
+        callback gets their whole response at once.
+        """
+        logger.debug(f"Generating response for prompt: {prompt}")
+        logger.debug("Method args")
+        logger.debug(locals())
+
+        used_model = model if model else self.model
+        is_o1 = self._resolve_is_o1(model, is_o1, infer_o1)
+        self.last_usage = None
+
         try:
             self.conversation_history.append({"role": "user", "content": prompt})
             
@@ -151,24 +306,16 @@ class FFAzureOpenAI:
                 *self.conversation_history
             ]
 
-            # DIFFERENT PROMPT COMPLETIONS DEPENDING ON IF o1 OR NOT
-            if is_o1 == True:
-                response = self.client.chat.completions.create(
-                    model=used_model,
-                    messages=messages,
-                    max_completion_tokens = getattr(self, 'max_completion_tokens', self._defaults['max_completion_tokens'])
-                )
+            params = self._completion_params(used_model, messages, is_o1)
+            if stream_callback is not None and is_o1 != True:
+                assistant_response = self._stream_completion(params, stream_callback)
             else:
-                response = self.client.chat.completions.create(
-                    model=used_model,
-                    messages=messages,
-                    max_tokens= getattr(self, 'max_tokens', self._defaults['max_tokens']),
-                    temperature=self.temperature
-                )
-            # ================================================================
+                response = self.client.chat.completions.create(**params)
+                self._record_usage(response.usage)
+                assistant_response = response.choices[0].message.content
+                if stream_callback is not None:
+                    stream_callback(assistant_response)
 
-            
-            assistant_response = response.choices[0].message.content
             self.conversation_history.append({"role": "assistant", "content": assistant_response})
             
             logger.info("Response generated successfully")
@@ -181,7 +328,74 @@ class FFAzureOpenAI:
             logger.error(f"  -- system: {self.system_instructions}")
             logger.error(f"  -- conversation history: {self.conversation_history}")
             
-            raise RuntimeError(f"Error generating response from Azure OpenAI: {str(e)}")
+            raise RuntimeError(f"Error generating response from Azure OpenAI: {str(e)}") from e
+
+    async def generate_response_async(self, prompt: str, model: Optional[str] = None, is_o1: Optional[bool] = None, infer_o1:Optional[bool] = None, prompt_name: Optional[str] = None,
+                                      stream_callback: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Async version of generate_response using AsyncAzureOpenAI.
+
+        The messages are taken from the conversation history when the call
+        starts, and the turn is only added to the history once the response
+        arrives, so concurrent calls never see each other's half-finished turns.
+        """
+        logger.debug(f"Generating async response for prompt: {prompt}")
+
+        used_model = model if model else self.model
+        is_o1 = self._resolve_is_o1(model, is_o1, infer_o1)
+        self.last_usage = None
+
+        user_turn = {"role": "user", "content": prompt}
+        messages = [
+            {
+                "role": "assistant" if is_o1 == True else "system",
+                "content": self.system_instructions,
+            },
+            *self.conversation_history,
+            user_turn
+        ]
+
+        try:
+            params = self._completion_params(used_model, messages, is_o1)
+            if stream_callback is not None and is_o1 != True:
+                assistant_response = await self._stream_completion_async(params, stream_callback)
+            else:
+                response = await self.async_client.chat.completions.create(**params)
+                self._record_usage(response.usage)
+                assistant_response = response.choices[0].message.content
+                if stream_callback is not None:
+                    stream_callback(assistant_response)
+
+            self.conversation_history.extend([user_turn, {"role": "assistant", "content": assistant_response}])
+
+            logger.info("Response generated successfully")
+            return assistant_response
+
+        except Exception as e:
+            logger.error("Problem with async response generation")
+            logger.error(f"  -- exception: {str(e)}")
+            logger.error(f"  -- model: {used_model}")
+
+            raise RuntimeError(f"Error generating response from Azure OpenAI: {str(e)}") from e
+
+    async def aclose(self) -> None:
+        """Close the HTTP connection pools shared by this client and its forks"""
+        async_client = self._shared['async_client']
+        self._shared['async_client'] = None
+        if async_client is not None:
+            await async_client.close()
+        self.client.close()
+
+    def fork(self) -> 'FFAzureOpenAI':
+        """
+        Lightweight handle with its own, empty conversation.
+
+        The fork shares this client's settings and HTTP clients, so concurrent
+        callers can each hold a conversation without racing on one history.
+        """
+        forked = copy.copy(self)
+        forked.conversation_history = []
+        return forked
 
     def clear_conversation(self):
         logger.info("Clearing conversation history")